@@ -0,0 +1,119 @@
+"""
+This is the array grid module. It contains the ArrayGrid class, a Grid whose state is stored in a numpy array.
+"""
+from functools import lru_cache
+from itertools import chain
+import numpy as np
+
+from grid import Grid
+
+
+@lru_cache(maxsize=None)
+def sorted_array(m, n):
+    """
+    Returns the (read-only) state of the sorted m x n grid as a numpy array, computed once per shape.
+    """
+    target = np.arange(1, m*n + 1, dtype=np.int64).reshape(m, n)
+    target.setflags(write=False)
+    return target
+
+
+class ArrayGrid(Grid):
+    """
+    A grid whose state is a contiguous numpy array of shape (m, n) instead of a list of lists. 
+    is_sorted is a single vectorised comparison and swap_seq validates a whole sequence of swaps at once, 
+    which makes it much faster than Grid for large grids and long sequences of swaps, such as the replay 
+    of the output of a solver.
+
+    Attributes: 
+    -----------
+    m: int
+        Number of lines in the grid
+    n: int
+        Number of columns in the grid
+    state: np.ndarray
+        The state of the grid, state[i, j] is the number in the cell (i, j).
+    """
+
+    def __init__(self, m, n, initial_state=None):
+        """
+        Initializes the grid from a list of lists or an array (sorted grid if initial_state is None or empty).
+        """
+        if initial_state is None or len(initial_state) == 0:
+            state = sorted_array(m, n).copy()
+        else:
+            state = np.ascontiguousarray(initial_state, dtype=np.int64)
+            if state.shape != (m, n):
+                raise Exception("Format incorrect")
+        self.m = m
+        self.n = n
+        self.state = state
+
+    def __repr__(self):
+        return f"<array_grid.ArrayGrid: m={self.m}, n={self.n}>"
+
+    @classmethod
+    def from_array(cls, m, n, state):
+        """
+        Creates a grid from a numpy array of shape (m, n), copied since it may be a read-only memory map.
+        """
+        return cls(m, n, np.array(state, dtype=np.int64))
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Returns an ArrayGrid with the same state as grid.
+        """
+        return cls(grid.m, grid.n, grid.state)
+
+    def to_grid(self):
+        """
+        Returns a Grid (state stored as a list of lists) with the same state.
+        """
+        return Grid(self.m, self.n, self.state.tolist())
+
+    def is_sorted(self):
+        """
+        Checks if the grid is sorted, by comparison with the cached sorted array of the shape.
+        """
+        return bool(np.array_equal(self.state, sorted_array(self.m, self.n)))
+
+    def swap(self, cell1, cell2):
+        """
+        Swaps two cells, see Grid.swap. Raises an exception if the swap is not allowed.
+        """
+        self.swap_seq([(cell1, cell2)])
+
+    def check_swaps(self, swaps):
+        """
+        Checks a whole sequence of swaps at once and returns it as an integer array of shape (k, 2, 2).
+        Raises an exception giving the index of the first swap that is not allowed.
+        """
+        if not isinstance(swaps, np.ndarray):
+            # much faster than np.asarray on a long list of nested tuples
+            swaps = np.fromiter(chain.from_iterable(chain.from_iterable(swaps)), dtype=np.int64, count=4*len(swaps))
+        swaps = swaps.astype(np.int64, copy=False).reshape(-1, 2, 2)
+        rows, cols = swaps[:, :, 0], swaps[:, :, 1]
+        inside = np.all((rows >= 0) & (rows < self.m) & (cols >= 0) & (cols < self.n), axis=1)
+        adjacent = np.abs(rows[:, 0] - rows[:, 1]) + np.abs(cols[:, 0] - cols[:, 1]) == 1
+        invalid = np.flatnonzero(~(inside & adjacent))
+        if len(invalid) > 0:
+            raise Exception(f"Sorry, the swap number {invalid[0]} is not allowed")
+        return swaps
+
+    def swap_seq(self, cell_pair_list):
+        """
+        Executes a sequence of swaps at the format [((i1, j1), (i2, j2)), ...] or as an integer array of 
+        shape (k, 2, 2). Nothing is applied if one of the swaps is not allowed.
+
+        The swaps are composed into a single permutation of the flat cells (a loop over plain integers), 
+        which is then applied to the state with one fancy indexing operation.
+        """
+        swaps = self.check_swaps(cell_pair_list)
+        if len(swaps) == 0:
+            return
+        flat = swaps[:, :, 0] * self.n + swaps[:, :, 1]
+        permutation = list(range(self.m * self.n))
+        for a, b in zip(flat[:, 0].tolist(), flat[:, 1].tolist()):
+            permutation[a], permutation[b] = permutation[b], permutation[a]
+        self.state = self.state.ravel()[permutation].reshape(self.m, self.n)
@@ -0,0 +1,164 @@
+"""
+This is the batch module. It solves many grid files in parallel over a pool of processes.
+
+Usage from the command line (one JSON result per line, in the order in which the solves finish):
+    python swap_puzzle/batch.py input/grid1.in input/grid2.in --solver astar --workers 4 --timeout 10
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from solver import Solver
+from states import swap_table, unflatten
+from heuristics import get_heuristic
+
+# name -> (method of Solver, whether it returns (swaps, stats), whether it takes a heuristic)
+SOLVERS = {
+    "greedy": ("get_solution", False, False),
+    "bfs": ("get_solution_bfs", False, False),
+    "bidirectional": ("get_solution_bidirectional", False, False),
+    "astar": ("get_solution_astar", True, True),
+    "idastar": ("get_solution_idastar", True, True),
+    "table": ("get_solution_table", False, False),
+    "anytime": ("get_solution_anytime", True, True),
+    "divide": ("get_solution_divide", True, False),
+}
+
+# per-process tables, filled once per worker: heuristics[(heuristic, m, n)]
+_heuristics = {}
+
+
+def read_shape(file_name):
+    """
+    Returns the shape (m, n) given by the first line of a grid file.
+    """
+    with open(file_name, "r") as file:
+        m, n = map(int, file.readline().split())
+    return m, n
+
+
+def init_worker(shapes, heuristic=None):
+    """
+    Initializes a worker process: builds once the swap tables (and the heuristic, e.g. a pattern database)
+    of every shape, so that they are shared by all the puzzles solved by the worker.
+    """
+    for m, n in shapes:
+        swap_table(m, n)
+        if heuristic is not None:
+            worker_heuristic(heuristic, m, n)
+
+
+def worker_heuristic(heuristic, m, n):
+    """
+    Returns the heuristic of the shape, built at most once per process.
+    """
+    if not isinstance(heuristic, str):
+        return heuristic
+    if (heuristic, m, n) not in _heuristics:
+        _heuristics[(heuristic, m, n)] = get_heuristic(heuristic, m, n)
+    return _heuristics[(heuristic, m, n)]
+
+
+def _timeout_handler(signum, frame):
+    raise TimeoutError()
+
+
+def solve_file(file_name, solver="astar", timeout=None, heuristic="manhattan", **options):
+    """
+    Solves the grid of a file and returns the result as a dictionnary with the keys "file", "m", "n", "swaps"
+    (None if unsolved), "length", "time" (in seconds), "stats" and "error" (None, "timeout" or the error message).
+    The timeout, in seconds, is enforced inside the process with a SIGALRM timer.
+    """
+    return _solve(lambda: Solver.grid_from_file(file_name), {"file": file_name}, solver, timeout, heuristic, options)
+
+
+def solve_state(m, n, flat, solver="astar", timeout=None, heuristic="manhattan", **options):
+    """
+    Solves the m x n grid of the flat state (its values in row-major order) and returns the result as solve_file,
+    without the key "file".
+    """
+    return _solve(lambda: Solver(m, n, unflatten(flat, m, n)), {}, solver, timeout, heuristic, options)
+
+
+def _solve(load, result, solver, timeout, heuristic, options):
+    method, with_stats, with_heuristic = SOLVERS[solver]
+    result.update({"swaps": None, "length": None, "stats": None, "error": None})
+    start = time.perf_counter()
+    if timeout is not None:
+        previous = signal.signal(signal.SIGALRM, _timeout_handler)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        grid = load()
+        result["m"], result["n"] = grid.m, grid.n
+        if with_heuristic:
+            options["heuristic"] = worker_heuristic(heuristic, grid.m, grid.n)
+        output = getattr(grid, method)(**options)
+        swaps, stats = output if with_stats else (output, None)
+        result["stats"] = stats
+        if swaps is not None:
+            result["swaps"] = swaps
+            result["length"] = len(swaps)
+    except TimeoutError:
+        result["error"] = "timeout"
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    finally:
+        if timeout is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    result["time"] = time.perf_counter() - start
+    return result
+
+
+def solve_many(paths, solver="astar", workers=None, timeout=None, heuristic="manhattan", **options):
+    """
+    Solves many grid files over a pool of worker processes and yields the results (see solve_file)
+    as soon as they are available, in the order in which they finish.
+
+    Parameters:
+    -----------
+    paths: list[str]
+        The grid files, at the format of Grid.grid_from_file.
+    solver: str
+        The name of the solver, a key of SOLVERS.
+    workers: int, optional
+        Number of worker processes (default: number of CPUs).
+    timeout: float, optional
+        Maximum time, in seconds, allowed for each puzzle.
+    heuristic: str
+        The heuristic of the A* and IDA* solvers, built once per worker and shape.
+    options:
+        Other keyword arguments passed to the solver method (max_nodes, ...).
+    """
+    if solver not in SOLVERS:
+        raise Exception(f"Unknown solver {solver!r}, expected one of {sorted(SOLVERS)}")
+    paths = list(paths)
+    shapes = sorted({read_shape(path) for path in paths})
+    warm = heuristic if SOLVERS[solver][2] else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(shapes, warm)) as executor:
+        futures = [executor.submit(solve_file, path, solver, timeout, heuristic, **options) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Solves swap puzzle grid files in parallel.")
+    parser.add_argument("paths", nargs="+", help="grid files")
+    parser.add_argument("--solver", default="astar", choices=sorted(SOLVERS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per puzzle")
+    parser.add_argument("--heuristic", default="manhattan")
+    parser.add_argument("--max-nodes", type=int, default=None)
+    args = parser.parse_args(arguments)
+    options = {} if args.max_nodes is None else {"max_nodes": args.max_nodes}
+    for result in solve_many(args.paths, args.solver, args.workers, args.timeout, args.heuristic, **options):
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+This is the benchmark module. It runs the solvers on reproducible corpora of puzzles and compares the results
+with a baseline.
+
+A corpus is a list of grids of a given shape at a given distance from the sorted grid, generated from a seed by
+random walks of swaps that never undo the previous swap. Up to 3x3 or 2x5, the distance is the exact optimal number of
+swaps (the walks are filtered with the distance table of the shape, see distance_table.DistanceTable); for larger
+shapes, it is the length of the walk, an upper bound of the optimal number of swaps.
+
+Usage from the command line:
+    python swap_puzzle/benchmark.py --shapes 3x3 4x4 --count 5 --output bench.json
+    python swap_puzzle/benchmark.py --shapes 3x3 4x4 --count 5 --baseline bench.json
+The second command exits with status 1 if a solver got slower or worse than in the baseline.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from solver import Solver
+from states import unflatten, neighbors
+from distance_table import DistanceTable
+from parallel_bfs import MAX_TABLE_CELLS
+from batch import SOLVERS
+from stats import SearchStats
+
+# shape -> distances of the default corpora
+DEFAULT_DISTANCES = {(2, 2): [2, 4], (2, 3): [4, 7], (3, 3): [6, 10, 14], (4, 4): [8, 14], (5, 5): [10, 16]}
+
+# solver -> largest number of cells on which it is run by default (the uninformed searches blow up)
+DEFAULT_SOLVERS = {"greedy": 25, "bfs": 9, "bidirectional": 16, "astar": 25, "idastar": 25, "divide": 100}
+
+# solvers that take a stats.SearchStats
+SEARCH_SOLVERS = {"bfs", "bidirectional", "astar", "idastar"}
+
+
+def make_corpus(m, n, distance, count, seed=0):
+    """
+    Returns count distinct flat states of the m x n grids at the given distance from the sorted grid (see the module
+    docstring), generated from seed. The same arguments always give the same corpus.
+    """
+    rng = random.Random(f"{m}x{n}/{distance}/{seed}")
+    table = DistanceTable.for_shape(m, n) if m*n <= MAX_TABLE_CELLS else None
+    if table is not None and distance > table.distances.max():
+        raise Exception(f"No {m}x{n} grid is at distance {distance}")
+    corpus = []
+    seen = set()
+    attempts = 0
+    while len(corpus) < count:
+        attempts += 1
+        if attempts > 1000 * count:
+            raise Exception(f"Could not generate {count} grids at distance {distance}")
+        state, previous = tuple(range(1, m*n + 1)), None
+        steps = 0
+        # a walk is extended until its end is at the exact distance (or has the length distance without a table)
+        while (table.distance(state) if table is not None else steps) < distance and steps < 4 * distance:
+            swaps = [(swap, child) for swap, child in neighbors(state, m, n) if swap != previous]
+            previous, state = rng.choice(swaps)
+            steps += 1
+        exact = table.distance(state) == distance if table is not None else steps == distance
+        if exact and state not in seen:
+            seen.add(state)
+            corpus.append(state)
+    return corpus
+
+
+def run_solver(flat, m, n, solver, max_nodes=None, memory=False):
+    """
+    Solves the flat state with a solver of batch.SOLVERS and returns a dictionnary with the keys "time" (seconds),
+    "length" (None if unsolved), "expanded" (None if the solver is not a search) and, if memory is True,
+    "peak_memory" (bytes allocated at the peak, measured with tracemalloc, which slows the solver down).
+    """
+    method, with_stats, _ = SOLVERS[solver]
+    grid = Solver(m, n, unflatten(flat, m, n))
+    options = {} if max_nodes is None or solver not in SEARCH_SOLVERS else {"max_nodes": max_nodes}
+    stats = SearchStats() if solver in SEARCH_SOLVERS else None
+    if stats is not None:
+        options["stats"] = stats
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        output = getattr(grid, method)(**options)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+        if memory:
+            tracemalloc.stop()
+    swaps = output[0] if with_stats else output
+    result = {"time": elapsed, "length": None if swaps is None else len(swaps),
+              "expanded": None if stats is None else stats.expanded}
+    if memory:
+        result["peak_memory"] = peak
+    return result
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+def benchmark(shapes=None, solvers=None, count=5, seed=0, max_nodes=200000, memory=True):
+    """
+    Runs the solvers on the corpora of the shapes and returns the list of the results, one dictionnary per shape,
+    distance and solver with the keys "shape" ("3x3"), "distance", "solver", "count", "solved", "time" (mean time of
+    the solved puzzles, in seconds), "expanded", "length" (means), and "peak_memory" (maximum, in bytes).
+
+    Parameters:
+    -----------
+    shapes: dict, optional
+        (m, n) -> list of distances (default: DEFAULT_DISTANCES).
+    solvers: list[str], optional
+        Names of solvers of batch.SOLVERS (default: the ones of DEFAULT_SOLVERS allowed for each shape).
+    count: int
+        Number of puzzles per shape and distance.
+    seed: int
+        Seed of the corpora.
+    max_nodes: int, optional
+        Budget of the searches, so that a hopeless solver fails instead of running out of memory.
+    memory: bool
+        If True, each puzzle is solved a second time under tracemalloc to measure the peak memory.
+    """
+    shapes = DEFAULT_DISTANCES if shapes is None else shapes
+    results = []
+    for (m, n), distances in shapes.items():
+        names = solvers if solvers is not None else [name for name, cells in DEFAULT_SOLVERS.items() if m*n <= cells]
+        for distance in distances:
+            corpus = make_corpus(m, n, distance, count, seed)
+            for name in names:
+                runs = []
+                for flat in corpus:
+                    run = run_solver(flat, m, n, name, max_nodes)
+                    if memory:
+                        run["peak_memory"] = run_solver(flat, m, n, name, max_nodes, memory=True)["peak_memory"]
+                    runs.append(run)
+                solved = [run for run in runs if run["length"] is not None]
+                results.append({
+                    "shape": f"{m}x{n}", "distance": distance, "solver": name, "count": len(runs),
+                    "solved": len(solved),
+                    "time": _mean([run["time"] for run in solved]),
+                    "expanded": _mean([run["expanded"] for run in solved]),
+                    "length": _mean([run["length"] for run in solved]),
+                    "peak_memory": max((run.get("peak_memory") or 0 for run in runs), default=0) if memory else None,
+                })
+    return results
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Compares results with baseline (two outputs of benchmark) and returns the list of the regressions as strings:
+    fewer puzzles solved, longer solutions, or a time, a number of expanded nodes or a peak memory larger than in
+    the baseline by more than the relative tolerance. Entries absent from the baseline are ignored.
+    """
+    reference = {(entry["shape"], entry["distance"], entry["solver"]): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        key = (entry["shape"], entry["distance"], entry["solver"])
+        if key not in reference:
+            continue
+        old = reference[key]
+        name = f"{entry['solver']} on {entry['shape']} at distance {entry['distance']}"
+        if entry["solved"] < old["solved"]:
+            regressions.append(f"{name}: solved {entry['solved']} < {old['solved']}")
+        if entry["length"] is not None and old["length"] is not None and entry["length"] > old["length"] + 1e-9:
+            regressions.append(f"{name}: length {entry['length']:.2f} > {old['length']:.2f}")
+        for field in ["time", "expanded", "peak_memory"]:
+            if entry.get(field) and old.get(field) and entry[field] > old[field] * (1 + tolerance):
+                regressions.append(f"{name}: {field} {entry[field]:.4g} > {old[field]:.4g}")
+    return regressions
+
+
+def _parse_shape(text):
+    m, n = text.lower().split("x")
+    return int(m), int(n)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the swap puzzle solvers on seeded corpora.")
+    parser.add_argument("--shapes", nargs="+", default=None, help="shapes such as 3x3 (default: 2x2 to 5x5)")
+    parser.add_argument("--distances", nargs="+", type=int, default=None, help="distances (default: per shape)")
+    parser.add_argument("--solvers", nargs="+", default=None, choices=sorted(SOLVERS))
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-nodes", type=int, default=200000)
+    parser.add_argument("--no-memory", action="store_true", help="do not measure the peak memory")
+    parser.add_argument("--output", default=None, help="JSON file where the results are written")
+    parser.add_argument("--baseline", default=None, help="JSON file of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(arguments)
+
+    shapes = None
+    if args.shapes is not None:
+        shapes = {}
+        for text in args.shapes:
+            shape = _parse_shape(text)
+            shapes[shape] = args.distances or DEFAULT_DISTANCES.get(shape, [2*sum(shape)])
+    results = benchmark(shapes, args.solvers, args.count, args.seed, args.max_nodes, not args.no_memory)
+    for entry in results:
+        print(json.dumps(entry))
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({"seed": args.seed, "count": args.count, "results": results}, file, indent=1)
+    if args.baseline is not None:
+        with open(args.baseline, "r") as file:
+            regressions = compare(results, json.load(file)["results"], args.tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
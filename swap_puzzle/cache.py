@@ -0,0 +1,198 @@
+"""
+This is the cache module. It contains the SolutionCache class, which stores the solutions of the Solver methods
+keyed by a canonical form of the grid under the symmetries of the puzzle.
+
+A symmetry of the m x n grid is a permutation sigma of the cells that preserves adjacency (the reflections, and for
+square grids the transpositions and rotations). Moving the value of each cell p to sigma(p) and relabelling each
+value v by sigma(v-1)+1 maps the sorted grid to itself and the swap (a, b) to the swap (sigma(a), sigma(b)): two
+grids related by such a transform need the same number of swaps, and the swaps of one give the swaps of the other.
+The canonical form of a grid is the smallest of its transforms (as a flat tuple). The solutions are stored for the
+canonical form and mapped back to the orientation of the caller on each hit.
+
+The cache keeps the most recently used solutions in memory (LRU) and, optionally, all of them in a SQLite database,
+shared between processes and runs.
+"""
+import functools
+import inspect
+import json
+import sqlite3
+from collections import OrderedDict
+
+from states import flatten
+
+
+@functools.lru_cache(maxsize=None)
+def symmetries(m, n):
+    """
+    Returns the symmetries of the m x n grid as tuples sigma of flat indices (sigma[p] is the image of the cell p),
+    identity first: the 4 reflections and rotations of a rectangle, and the 8 of a square.
+    """
+    maps = [lambda i, j: (i, j), lambda i, j: (m-1-i, j), lambda i, j: (i, n-1-j), lambda i, j: (m-1-i, n-1-j)]
+    if m == n:
+        maps += [lambda i, j: (j, i), lambda i, j: (n-1-j, m-1-i), lambda i, j: (j, m-1-i), lambda i, j: (n-1-j, i)]
+    result = []
+    for f in maps:
+        sigma = tuple(i2*n + j2 for i2, j2 in (f(p // n, p % n) for p in range(m*n)))
+        if sigma not in result:
+            result.append(sigma)
+    return tuple(result)
+
+
+def transform(flat, sigma):
+    """
+    Returns the flat state obtained by moving the value of each cell p to sigma[p] and relabelling each value v
+    by sigma[v-1]+1.
+    """
+    image = [0] * len(flat)
+    for p, value in enumerate(flat):
+        image[sigma[p]] = sigma[value - 1] + 1
+    return tuple(image)
+
+
+def canonical(flat, m, n):
+    """
+    Returns the canonical form of the flat state and the symmetry sigma that maps the state to it.
+    """
+    best, best_sigma = None, None
+    for sigma in symmetries(m, n):
+        image = transform(flat, sigma)
+        if best is None or image < best:
+            best, best_sigma = image, sigma
+    return best, best_sigma
+
+
+class SolutionCache:
+    """
+    A cache of solutions keyed by (name of the solver, shape, canonical form), see the module docstring.
+
+    Attributes:
+    -----------
+    capacity: int
+        Maximum number of solutions kept in memory.
+    path: str | None
+        The SQLite database where all the solutions are also stored (None: in memory only).
+    hits, misses: int
+        Numbers of lookups that found (or did not find) a solution.
+    """
+
+    def __init__(self, capacity=100000, path=None):
+        self.capacity = capacity
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._database = None
+        if path is not None:
+            self._database = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._database.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                   "(solver TEXT, shape TEXT, state BLOB, swaps TEXT, PRIMARY KEY (solver, shape, state))")
+
+    def __repr__(self):
+        return f"<cache.SolutionCache: size={len(self._memory)}, hits={self.hits}, misses={self.misses}>"
+
+    def __len__(self):
+        return len(self._memory)
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+
+    def _remember(self, key, swaps):
+        self._memory[key] = swaps
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get(self, solver, m, n, flat):
+        """
+        Returns the cached solution of the flat state for the solver (a name), as a list of swaps
+        [((i1, j1), (i2, j2)), ...] in the orientation of flat, or None if there is none.
+        """
+        state, sigma = canonical(flat, m, n)
+        key = (solver, m, n, state)
+        swaps = self._memory.get(key)
+        if swaps is not None:
+            self._memory.move_to_end(key)
+        elif self._database is not None:
+            row = self._database.execute("SELECT swaps FROM solutions WHERE solver = ? AND shape = ? AND state = ?",
+                                         (solver, f"{m}x{n}", bytes(state) if m*n < 256 else json.dumps(state))).fetchone()
+            if row is not None:
+                swaps = tuple(tuple(pair) for pair in json.loads(row[0]))
+                self._remember(key, swaps)
+        if swaps is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        inverse = [0] * (m*n)
+        for p, q in enumerate(sigma):
+            inverse[q] = p
+        return [((inverse[a] // n, inverse[a] % n), (inverse[b] // n, inverse[b] % n)) for a, b in swaps]
+
+    def put(self, solver, m, n, flat, swaps):
+        """
+        Stores the solution swaps (at the format [((i1, j1), (i2, j2)), ...]) of the flat state for the solver.
+        """
+        state, sigma = canonical(flat, m, n)
+        pairs = tuple((sigma[i1*n + j1], sigma[i2*n + j2]) for (i1, j1), (i2, j2) in swaps)
+        self._remember((solver, m, n, state), pairs)
+        if self._database is not None:
+            self._database.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)",
+                                   (solver, f"{m}x{n}", bytes(state) if m*n < 256 else json.dumps(state),
+                                    json.dumps(pairs)))
+
+
+def _plain(value):
+    return value is None or isinstance(value, (bool, int, float, str)) or \
+        (isinstance(value, tuple) and all(_plain(item) for item in value))
+
+
+def cached(with_stats=False, in_place=False, ignore=()):
+    """
+    Decorator of the Solver methods: if the solver has a cache (its attribute cache, a SolutionCache), the solution
+    is looked up before running the method and stored after it. On a hit, the methods that return (swaps, stats)
+    return the stats {"cached": True}, and the methods that sort the grid in place (in_place=True) apply the swaps.
+    Failures (None) are not cached.
+
+    The solutions are stored under the name of the method and its arguments that differ from their defaults,
+    except the ones of ignore (which do not change the solution, e.g. a number of workers). The cache is bypassed
+    when an argument is not a plain value (a function or an object, such as a callable heuristic, which has no
+    stable key), and when a stats.SearchStats is passed, since it could not be filled on a hit.
+    """
+    def decorate(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+            arguments = signature.bind(self, *args, **kwargs).arguments
+            arguments.pop("self", None)
+            if arguments.pop("stats", None) is not None:
+                return method(self, *args, **kwargs)
+            defaults = {name: parameter.default for name, parameter in signature.parameters.items()}
+            arguments = {name: tuple(value) if isinstance(value, list) else value
+                         for name, value in arguments.items() if name not in ignore}
+            if not all(_plain(value) for value in arguments.values()):
+                return method(self, *args, **kwargs)
+            arguments = {name: value for name, value in arguments.items() if value != defaults[name]}
+            name = method.__name__
+            if arguments:
+                name += "(" + ", ".join(f"{key}={value!r}" for key, value in sorted(arguments.items())) + ")"
+            flat = flatten(self.state)
+            swaps = cache.get(name, self.m, self.n, flat)
+            if swaps is not None:
+                if in_place:
+                    self.swap_seq(swaps)
+                return (swaps, {"cached": True}) if with_stats else swaps
+            result = method(self, *args, **kwargs)
+            swaps = result[0] if with_stats else result
+            if swaps is not None:
+                cache.put(name, self.m, self.n, flat, swaps)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,112 @@
+"""
+This is the distance table module. It contains the DistanceTable class, the exact number of swaps needed to sort
+every grid of a small shape (up to 3x3 or 2x5, whose (mn)! states fit in memory).
+
+The table is a numpy.uint8 array indexed by the rank of the state (see states.rank), computed once by a BFS from
+the sorted grid (see parallel_bfs.bfs_distances), saved as a .npy file and memory-mapped when loaded. The optimal
+number of swaps of a grid is then a single lookup, and an optimal sequence of swaps is rebuilt by descending the
+table from the grid to the sorted grid.
+"""
+import os
+import numpy as np
+
+from states import flatten, rank, swaps_from_path, FACTORIALS
+from parallel_bfs import bfs_distances, descent_path, check_shape
+
+_tables = {}
+
+
+class DistanceTable:
+    """
+    The distances to the sorted grid of all the m x n grids.
+
+    Attributes:
+    -----------
+    m, n: int
+        Shape of the grids.
+    distances: np.ndarray
+        A numpy.uint8 array of length (mn)! such that distances[r] is the number of swaps needed to sort 
+        the grid of rank r.
+    """
+
+    def __init__(self, m, n, distances):
+        if len(distances) != FACTORIALS[m*n]:
+            raise Exception(f"A distance table of the {m}x{n} grids must have {FACTORIALS[m*n]} entries")
+        self.m = m
+        self.n = n
+        self.distances = distances
+
+    def __repr__(self):
+        return f"<distance_table.DistanceTable: m={self.m}, n={self.n}>"
+
+    @classmethod
+    def build(cls, m, n, workers=1):
+        """
+        Builds the distance table of the m x n grids by a BFS from the sorted grid over workers processes.
+        """
+        return cls(m, n, bfs_distances(m, n, workers=workers))
+
+    @staticmethod
+    def file_name(directory, m, n):
+        """
+        Returns the name of the .npy file of the distance table of the m x n grids.
+        """
+        return os.path.join(directory, f"distances_{m}x{n}.npy")
+
+    def save(self, directory):
+        """
+        Saves the table as a .npy file in directory (created if needed).
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(self.file_name(directory, self.m, self.n), self.distances)
+
+    @classmethod
+    def load(cls, directory, m, n):
+        """
+        Loads the table saved in directory, memory-mapping it. Raises an exception if it is missing.
+        """
+        name = cls.file_name(directory, m, n)
+        if not os.path.exists(name):
+            raise Exception(f"Missing distance table {name}")
+        return cls(m, n, np.load(name, mmap_mode="r"))
+
+    @classmethod
+    def load_or_build(cls, directory, m, n, workers=1):
+        """
+        Loads the table saved in directory, or builds and saves it if it does not exist yet.
+        """
+        try:
+            return cls.load(directory, m, n)
+        except Exception:
+            cls.build(m, n, workers).save(directory)
+            return cls.load(directory, m, n)
+
+    @classmethod
+    def for_shape(cls, m, n, directory=None):
+        """
+        Returns the distance table of the m x n grids, loaded from (or saved to) directory if it is given, 
+        built at the first call and then kept in memory. Raises a ValueError above parallel_bfs.MAX_TABLE_CELLS cells.
+        """
+        check_shape(m, n)
+        if (m, n) not in _tables:
+            _tables[(m, n)] = cls.build(m, n) if directory is None else cls.load_or_build(directory, m, n)
+        return _tables[(m, n)]
+
+    def distance(self, flat):
+        """
+        Returns the optimal number of swaps needed to sort the flat state flat (a tuple of the values in row-major order).
+        """
+        return int(self.distances[rank(flat)])
+
+    def path(self, flat):
+        """
+        Returns a shortest sequence of flat states from flat to the sorted grid (see parallel_bfs.descent_path).
+        """
+        return descent_path(self.distances, tuple(flat), self.m, self.n)
+
+    def solve(self, grid):
+        """
+        Returns an optimal sequence of swaps sorting grid, at the format [((i1, j1), (i2, j2)), ...].
+        The grid is not modified.
+        """
+        return swaps_from_path(self.path(flatten(grid.state)), self.n)
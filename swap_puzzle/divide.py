@@ -0,0 +1,198 @@
+"""
+This is the divide module. It solves large grids by divide and conquer: the outer rows and columns are placed one
+after the other, which shrinks the problem to the remaining subgrid, and the last block (3x3 by default) is solved
+optimally. An 8x8 grid is solved in a few milliseconds once the table of the block is built.
+
+At each stage, the side of the subgrid to place (top or bottom row, left or right column) is chosen by trying all
+of them (see divide_solve). The values of a row (or column) are placed one after the other, each along a shortest path to its cell that avoids
+the cells already placed. Each step of the path moves the value it displaces by one cell: among the shortest paths,
+the one that moves the most displaced values closer to their own cells is chosen by dynamic programming over the
+rectangle between the value and its cell, so that the placement of a row also prepares the next ones.
+Once the remaining subgrid has the shape of the block, it only contains the values of its own cells: they are
+relabelled 1, ..., kl and solved with the distance table of the shape (see distance_table.DistanceTable, built once
+per shape and kept in memory), or by IDA* for blocks too large for a table.
+"""
+import time
+
+from states import swaps_from_path, unflatten
+from distance_table import DistanceTable
+from parallel_bfs import MAX_TABLE_CELLS
+
+
+def best_path(flat, n, source, target, fixed):
+    """
+    Returns the flat indices of a shortest path from the cell source to the cell target that avoids the fixed cells,
+    chosen to maximise the number of values it displaces that get closer to their own cells (a step from p to q
+    moves the value of q to p), or None if every shortest path goes through a fixed cell.
+    """
+    k, l = divmod(source, n)
+    i, j = divmod(target, n)
+    di = 1 if i >= k else -1
+    dj = 1 if j >= l else -1
+    rows, cols = abs(i - k) + 1, abs(j - l) + 1
+    score = [[None] * cols for _ in range(rows)]
+    score[0][0] = 0
+    for a in range(rows):
+        for b in range(cols):
+            if a == b == 0:
+                continue
+            r, c = k + a*di, l + b*dj
+            if fixed[r*n + c]:
+                continue
+            ty, tx = divmod(flat[r*n + c] - 1, n)
+            best = None
+            # the value of (r, c) goes back to the previous cell of the path, in the same column (resp. line)
+            if a > 0 and score[a-1][b] is not None:
+                best = score[a-1][b] + (1 if abs(r - di - ty) < abs(r - ty) else -1)
+            if b > 0 and score[a][b-1] is not None:
+                gain = score[a][b-1] + (1 if abs(c - dj - tx) < abs(c - tx) else -1)
+                if best is None or gain > best:
+                    best = gain
+            score[a][b] = best
+    if score[rows-1][cols-1] is None:
+        return None
+    path = []
+    a, b = rows - 1, cols - 1
+    while True:
+        r, c = k + a*di, l + b*dj
+        path.append(r*n + c)
+        if a == b == 0:
+            break
+        ty, tx = divmod(flat[r*n + c] - 1, n)
+        up = None if a == 0 or score[a-1][b] is None else score[a-1][b] + (1 if abs(r - di - ty) < abs(r - ty) else -1)
+        if up is not None and up == score[a][b]:
+            a -= 1
+        else:
+            b -= 1
+    path.reverse()
+    return path
+
+
+def _distance(value, cell, n):
+    i, j = divmod(value - 1, n)
+    k, l = divmod(cell, n)
+    return abs(i - k) + abs(j - l)
+
+
+def place_strip(flat, position, fixed, n, cells):
+    """
+    Places the values of the cells (a row or a column, in order) along the paths of best_path, updating flat,
+    position (value -> flat index) and fixed in place, and returns the swaps [((i1, j1), (i2, j2)), ...].
+    The cells are placed from both ends of the strip: at each step, the end whose path moves the fewest displaced
+    values away from their cells goes first (the cells left then stay contiguous, so that a shortest path to them
+    always exists).
+    """
+    swaps = []
+    low, high = 0, len(cells) - 1
+    while low <= high:
+        best = None
+        for index in (low, high) if low < high else (low,):
+            path = best_path(flat, n, position[cells[index] + 1], cells[index], fixed)
+            waste = sum(_distance(flat[q], p, n) > _distance(flat[q], q, n) for p, q in zip(path, path[1:]))
+            if best is None or waste < best[0]:
+                best = (waste, index, path)
+        _, index, path = best
+        cell = cells[index]
+        value = cell + 1
+        for p, q in zip(path, path[1:]):
+            other = flat[q]
+            flat[p], flat[q] = other, value
+            position[other] = p
+            swaps.append(((p // n, p % n), (q // n, q % n)))
+        position[value] = cell
+        fixed[cell] = True
+        if index == low:
+            low += 1
+        else:
+            high -= 1
+    return swaps
+
+
+def potential(flat, n, region):
+    """
+    Returns the sum of the Manhattan distances of the values of the region (r0, r1, c0, c1) (the cells (i, j) with
+    r0 <= i < r1 and c0 <= j < c1) to their cells: a swap reduces it by at most 2.
+    """
+    r0, r1, c0, c1 = region
+    return sum(_distance(flat[i*n + j], i*n + j, n) for i in range(r0, r1) for j in range(c0, c1))
+
+
+def solve_block(flat, k, l, directory=None, heuristic="pdb"):
+    """
+    Returns an optimal sequence of swaps [((i1, j1), (i2, j2)), ...] sorting the flat state of the k x l grids,
+    read from the distance table of the shape (loaded from or saved to directory if it is given) up to
+    parallel_bfs.MAX_TABLE_CELLS cells, computed by IDA* with the heuristic otherwise.
+    """
+    if k*l == 1:
+        return []
+    if k*l <= MAX_TABLE_CELLS:
+        return swaps_from_path(DistanceTable.for_shape(k, l, directory).path(flat), l)
+    from solver import Solver
+    swaps, _ = Solver(k, l, unflatten(flat, k, l)).get_solution_idastar(heuristic=heuristic)
+    return swaps
+
+
+def divide_solve(flat, m, n, block=(3, 3), directory=None, heuristic="pdb"):
+    """
+    Solves the flat state of the m x n grids by divide and conquer (see the module docstring).
+
+    At each stage, the four sides of the remaining subgrid (top and bottom rows, left and right columns) that can be
+    removed without going below the shape of the block are tried, and the one that minimises twice its number of
+    swaps plus the potential of the subgrid left (see potential) is kept.
+
+    Parameters:
+    -----------
+    flat: tuple[int]
+        The values of the grid in row-major order.
+    m, n: int
+        Shape of the grid.
+    block: tuple[int]
+        Shape (k, l) of the last block, solved optimally (reduced to (min(k, m), min(l, n))).
+    directory: str, optional
+        Directory where the distance tables of the blocks are saved, see distance_table.DistanceTable.for_shape.
+    heuristic: str
+        Heuristic of the IDA* search of the blocks larger than parallel_bfs.MAX_TABLE_CELLS cells.
+
+    Output:
+    -------
+    swaps, stages: list[tuple[tuple[int]]], list[dict]
+        The sequence of swaps at the format [((i1, j1), (i2, j2)), ...] and, for each stage ("row 0", "column 7",
+        ..., "block 3x3"), a dictionnary with its "stage", its number of "swaps" and its "time" (seconds).
+    """
+    flat = list(flat)
+    position = [0] * (m*n + 1)
+    for p, value in enumerate(flat):
+        position[value] = p
+    fixed = [False] * (m*n)
+    k, l = min(block[0], m), min(block[1], n)
+    swaps = []
+    stages = []
+    r0, r1, c0, c1 = 0, m, 0, n
+    while r1 - r0 > k or c1 - c0 > l:
+        start = time.perf_counter()
+        sides = []
+        if r1 - r0 > k:
+            sides += [(f"row {i}", [i*n + j for j in range(c0, c1)], region)
+                      for i, region in [(r0, (r0 + 1, r1, c0, c1)), (r1 - 1, (r0, r1 - 1, c0, c1))]]
+        if c1 - c0 > l:
+            sides += [(f"column {j}", [i*n + j for i in range(r0, r1)], region)
+                      for j, region in [(c0, (r0, r1, c0 + 1, c1)), (c1 - 1, (r0, r1, c0, c1 - 1))]]
+        best = None
+        for name, cells, region in sides:
+            state = (flat[:], position[:], fixed[:])
+            strip = place_strip(*state, n, cells)
+            score = 2 * len(strip) + potential(state[0], n, region)
+            if best is None or score < best[0]:
+                best = (score, name, region, state, strip)
+        _, name, (r0, r1, c0, c1), (flat, position, fixed), strip = best
+        swaps += strip
+        stages.append({"stage": name, "swaps": len(strip), "time": time.perf_counter() - start})
+    start = time.perf_counter()
+    # the values of the block, relabelled 1, ..., kl in the order of their cells in the block
+    sub = tuple(((value - 1) // n - r0) * l + (value - 1) % n - c0 + 1
+                for value in (flat[i*n + j] for i in range(r0, r1) for j in range(c0, c1)))
+    block_swaps = [((i1 + r0, j1 + c0), (i2 + r0, j2 + c0))
+                   for (i1, j1), (i2, j2) in solve_block(sub, k, l, directory, heuristic)]
+    swaps += block_swaps
+    stages.append({"stage": f"block {k}x{l}", "swaps": len(block_swaps), "time": time.perf_counter() - start})
+    return swaps, stages
@@ -0,0 +1,79 @@
+"""
+This is the enumeration module. It enumerates the states of the m x n grids (the permutations of 1, ..., mn) in
+lexicographic order, i.e., by increasing rank (see states.rank), in constant memory.
+
+The enumeration can be restricted to the ranks in [start_rank, stop_rank), so that a job over the whole state space
+can be split into ranges processed by different processes, or resumed from the last rank processed. It yields either
+one flat state at a time (iter_states) or blocks of states as numpy arrays (iter_chunks) for vectorised processing.
+"""
+import numpy as np
+
+from states import FACTORIALS, unrank, unrank_array
+
+# the ranks of iter_chunks are int64
+MAX_CHUNK_SIZE = 20
+
+
+def next_permutation(values):
+    """
+    Replaces the list values by the next permutation in lexicographic order, in place, in amortised O(1).
+    Returns False (and leaves values unchanged) if it is the last permutation.
+    """
+    i = len(values) - 2
+    while i >= 0 and values[i] >= values[i+1]:
+        i -= 1
+    if i < 0:
+        return False
+    j = len(values) - 1
+    while values[j] <= values[i]:
+        j -= 1
+    values[i], values[j] = values[j], values[i]
+    values[i+1:] = reversed(values[i+1:])
+    return True
+
+
+def _range(size, start_rank, stop_rank):
+    total = FACTORIALS[size]
+    stop_rank = total if stop_rank is None else min(stop_rank, total)
+    if not 0 <= start_rank:
+        raise Exception("start_rank must be nonnegative")
+    return start_rank, stop_rank
+
+
+def iter_states(size, start_rank=0, stop_rank=None):
+    """
+    Generates the flat states (tuples) of size values of ranks start_rank, ..., stop_rank-1 (default: up to the
+    last one), in lexicographic order.
+    """
+    start_rank, stop_rank = _range(size, start_rank, stop_rank)
+    if start_rank >= stop_rank:
+        return
+    values = list(unrank(start_rank, size))
+    for _ in range(stop_rank - start_rank):
+        yield tuple(values)
+        next_permutation(values)
+
+
+def iter_chunks(size, chunk_size=65536, start_rank=0, stop_rank=None):
+    """
+    Generates the flat states of size values of ranks start_rank, ..., stop_rank-1 by blocks: numpy.uint8 arrays
+    of shape (chunk_size, size) (the last one can be shorter), one state per line, computed with states.unrank_array.
+    Limited to size <= MAX_CHUNK_SIZE.
+    """
+    if size > MAX_CHUNK_SIZE:
+        raise Exception(f"iter_chunks supports at most {MAX_CHUNK_SIZE} values")
+    start_rank, stop_rank = _range(size, start_rank, stop_rank)
+    for start in range(start_rank, stop_rank, chunk_size):
+        ranks = np.arange(start, min(start + chunk_size, stop_rank), dtype=np.int64)
+        yield (unrank_array(ranks, size, size) + 1).astype(np.uint8)
+
+
+def split_ranges(size, parts, start_rank=0, stop_rank=None):
+    """
+    Splits the ranks [start_rank, stop_rank) of the states of size values into parts consecutive ranges
+    (start, stop) of balanced lengths, to distribute an enumeration over processes.
+    """
+    start_rank, stop_rank = _range(size, start_rank, stop_rank)
+    length = max(stop_rank - start_rank, 0)
+    bounds = [start_rank + length * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i+1]) for i in range(parts)]
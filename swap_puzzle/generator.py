@@ -0,0 +1,236 @@
+"""
+This is the generator module. It generates puzzles of controlled difficulty from exact inversion counts.
+
+The difficulty of a grid is measured by the number of inversions of its flat state (its Kendall-Tau distance to
+the sorted grid, see heuristics.kendall_tau), between 0 and dmax = N(N-1)/2 for N = mn cells. A permutation with
+exactly k inversions is built from its inversion vector (Lehmer code): c[i], the number of values after the
+position i that are smaller than the value at i, with 0 <= c[i] <= N-1-i and sum(c) = k. Both the construction
+and the inversion count use a Fenwick tree, in O(N log N).
+
+Usage from the command line (writes a file of several grids, see parsing.iter_grids):
+    python swap_puzzle/generator.py 4 4 --difficulty 2 --count 100 --seed 0 --output puzzles.in
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+DIFFICULTIES = {1: "EASY", 2: "INTERMEDIATE", 3: "DIFFICULT", 4: "HARDCORE"}
+
+
+class Fenwick:
+    """
+    A Fenwick (binary indexed) tree over the positions 0, ..., size-1, with prefix sums and order statistics
+    in O(log size).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        # largest power of 2 not above size
+        self.top = 1 << (size.bit_length() - 1) if size else 0
+
+    def add(self, position, value):
+        """
+        Adds value at position.
+        """
+        i = position + 1
+        while i <= self.size:
+            self.tree[i] += value
+            i += i & -i
+
+    def prefix_sum(self, position):
+        """
+        Returns the sum of the values at the positions 0, ..., position-1.
+        """
+        s = 0
+        i = position
+        while i > 0:
+            s += self.tree[i]
+            i -= i & -i
+        return s
+
+    def find(self, k):
+        """
+        Returns the smallest position p such that the sum of the values at 0, ..., p is larger than k
+        (with values 0 or 1, the position of the (k+1)-th 1).
+        """
+        position = 0
+        step = self.top
+        while step:
+            if position + step <= self.size and self.tree[position + step] <= k:
+                position += step
+                k -= self.tree[position]
+            step >>= 1
+        return position
+
+
+def count_inversions(flat):
+    """
+    Returns the number of inversions of the sequence flat of distinct values 1, ..., len(flat), in O(N log N):
+    the values are scanned from right to left, and a Fenwick tree counts the smaller values already seen.
+    """
+    tree = Fenwick(len(flat))
+    inversions = 0
+    for value in reversed(flat):
+        inversions += tree.prefix_sum(value - 1)
+        tree.add(value - 1, 1)
+    return inversions
+
+
+def max_inversions(m, n):
+    """
+    Returns dmax = N(N-1)/2, the number of inversions of the reversed m x n grid.
+    """
+    size = m*n
+    return size * (size - 1) // 2
+
+
+def random_inversion_vector(size, k, rng=random):
+    """
+    Returns a random inversion vector c of length size with sum(c) = k and 0 <= c[i] <= size-1-i: each c[i] is drawn
+    uniformly among the values that still allow the remaining positions to reach k.
+    """
+    if not 0 <= k <= size * (size - 1) // 2:
+        raise Exception(f"A permutation of {size} values has between 0 and {size * (size - 1) // 2} inversions")
+    vector = []
+    for i in range(size):
+        cap = size - 1 - i
+        rest = cap * (cap - 1) // 2
+        c = rng.randint(max(0, k - rest), min(cap, k))
+        vector.append(c)
+        k -= c
+    return vector
+
+
+def permutation_from_inversions(vector):
+    """
+    Returns the flat state (a tuple of 1, ..., N) whose inversion vector is vector: the value at the position i is
+    the (vector[i]+1)-th smallest of the values not used yet, found in the Fenwick tree in O(log N).
+    """
+    size = len(vector)
+    tree = Fenwick(size)
+    for position in range(size):
+        tree.add(position, 1)
+    flat = []
+    for c in vector:
+        value = tree.find(c)
+        tree.add(value, -1)
+        flat.append(value + 1)
+    return tuple(flat)
+
+
+def permutation_with_inversions(size, k, rng=random):
+    """
+    Returns a random flat state of size values with exactly k inversions, in O(size log size).
+    """
+    return permutation_from_inversions(random_inversion_vector(size, k, rng))
+
+
+def difficulty_band(m, n, difficulty):
+    """
+    Returns the range (low, high) of the numbers of inversions of the difficulty (1 to 4, see DIFFICULTIES):
+    the difficulty d covers the inversion counts in ](d-1) dmax/4, d dmax/4], from 1 for the difficulty 1.
+    """
+    if difficulty not in DIFFICULTIES:
+        raise Exception(f"Unknown difficulty {difficulty!r}, expected one of {sorted(DIFFICULTIES)}")
+    dmax = max_inversions(m, n)
+    if dmax == 0:
+        return 0, 0
+    low = (difficulty - 1) * dmax // 4 + 1
+    high = difficulty * dmax // 4
+    return low, max(low, high)
+
+
+def generate_puzzles(m, n, difficulty, count, seed=0, distance=None, distance_of=None, max_attempts=None):
+    """
+    Generates count seeded puzzles of the m x n grids of the difficulty, as flat states (the same arguments always
+    give the same puzzles).
+
+    Parameters:
+    -----------
+    m, n: int
+        Shape of the grids.
+    difficulty: int
+        The difficulty band, see difficulty_band.
+    count: int
+        Number of puzzles.
+    seed: int
+        Seed of the generation.
+    distance: int | tuple[int], optional
+        If given, only the puzzles whose optimal number of swaps is distance (or within the range (low, high))
+        are kept.
+    distance_of: function, optional
+        distance_of(flat) returns the optimal number of swaps of the flat state. Default: the distance table of the
+        shape (see distance_table.DistanceTable) up to 3x3 or 2x5, the IDA* solver with the pattern database otherwise.
+    max_attempts: int, optional
+        Maximum number of puzzles drawn before giving up with an exception (default: 1000 * count).
+    """
+    rng = random.Random(f"{m}x{n}/{difficulty}/{seed}")
+    low, high = difficulty_band(m, n, difficulty)
+    if distance is not None:
+        if isinstance(distance, int):
+            distance = (distance, distance)
+        if distance_of is None:
+            distance_of = default_distance(m, n)
+    max_attempts = 1000 * count if max_attempts is None else max_attempts
+    attempts = 0
+    produced = 0
+    while produced < count:
+        attempts += 1
+        if attempts > max_attempts:
+            raise Exception(f"Could not generate {count} puzzles of difficulty {difficulty} at distance {distance}")
+        flat = permutation_with_inversions(m*n, rng.randint(low, high), rng)
+        if distance is not None and not distance[0] <= distance_of(flat) <= distance[1]:
+            continue
+        produced += 1
+        yield flat
+
+
+def default_distance(m, n):
+    """
+    Returns the default function distance_of of generate_puzzles for the m x n grids.
+    """
+    from parallel_bfs import MAX_TABLE_CELLS
+    if m*n <= MAX_TABLE_CELLS:
+        from distance_table import DistanceTable
+        return DistanceTable.for_shape(m, n).distance
+    from solver import Solver
+    from states import unflatten
+
+    def distance_of(flat):
+        swaps, _ = Solver(m, n, unflatten(flat, m, n)).get_solution_idastar(heuristic="pdb")
+        return len(swaps)
+    return distance_of
+
+
+def write_grids(file_name, states, m, n):
+    """
+    Writes flat states of the m x n grids in a file of several grids, readable by parsing.iter_grids.
+    """
+    with open(file_name, "w") as file:
+        for flat in states:
+            file.write(f"{m} {n}\n")
+            for i in range(m):
+                file.write(" ".join(map(str, flat[i*n:(i+1)*n])) + "\n")
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Generates swap puzzles of a given difficulty.")
+    parser.add_argument("m", type=int)
+    parser.add_argument("n", type=int)
+    parser.add_argument("--difficulty", type=int, default=1, choices=sorted(DIFFICULTIES))
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--distance", type=int, nargs="+", default=None, help="exact optimal distance or range")
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args(arguments)
+    distance = None if args.distance is None else tuple(args.distance) if len(args.distance) == 2 else args.distance[0]
+    puzzles = generate_puzzles(args.m, args.n, args.difficulty, args.count, args.seed, distance)
+    write_grids(args.output, puzzles, args.m, args.n)
+
+
+if __name__ == "__main__":
+    main()
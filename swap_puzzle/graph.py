@@ -1,6 +1,13 @@
 """
-This is the graph module. It contains a minimalistic Graph class.
+This is the graph module. It contains a minimalistic Graph class and CSRGraph, a compact array-based variant 
+for large graphs of integer nodes.
 """
+import sys
+from collections import OrderedDict
+import numpy as np
+
+import search
+from parsing import read_graph
 
 class Graph:
     """
@@ -20,22 +27,29 @@ class Graph:
         The number of edges. 
     edges: list[tuple[NodeType, NodeType]]
         The list of all edges
+    tree_cache_bytes: int
+        The memory cap, in bytes, of the cache of BFS trees used by shortest_path.
     """
 
-    def __init__(self, nodes=[]):
+    def __init__(self, nodes=(), tree_cache_bytes=64 * 2**20):
         """
         Initializes the graph with a set of nodes, and no edges. 
 
         Parameters: 
         -----------
-        nodes: list, optional
-            A list of nodes. Default is empty.
+        nodes: iterable, optional
+            The nodes. Default is empty. They are copied into a new list, so the graph never modifies 
+            the caller's list when nodes are added.
         """
-        self.nodes = nodes 
-        self.graph = dict([(n, []) for n in nodes])
-        self.nb_nodes = len(nodes)
+        self.nodes = list(nodes)
+        self.graph = dict([(n, []) for n in self.nodes])
+        self.nb_nodes = len(self.nodes)
         self.nb_edges = 0
         self.edges = []
+        self.tree_cache_bytes = tree_cache_bytes
+        # source -> (parent map, its size in bytes), least recently used first
+        self._trees = OrderedDict()
+        self._trees_bytes = 0
   
     def __str__(self):
         """
@@ -80,10 +94,15 @@ class Graph:
         self.graph[node2].append(node1)
         self.nb_edges += 1
         self.edges.append((node1, node2))
+        if self._trees:
+            self._trees.clear()
+            self._trees_bytes = 0
 
-    def bfs(self, src, dst):  # Question 5
+    def bfs(self, src, dst, max_depth=None, max_nodes=None, stats=None):  # Question 5
         """
         Finds a shortest path from src to dst by BFS.  
+        The frontier is a deque and each visited node only stores its parent, the path is rebuilt once dst is reached, 
+        so the search is linear in the number of nodes and edges explored.
 
         Parameters: 
         -----------
@@ -91,36 +110,83 @@ class Graph:
             The source node.
         dst: NodeType
             The destination node.
+        max_depth: int, optional
+            If given, only paths with at most max_depth edges are considered.
+        max_nodes: int, optional
+            If given, the search gives up once more than max_nodes nodes have been visited.
+        stats: stats.SearchStats, optional
+            If given, it is filled with the statistics of the search.
 
         Output: 
         -------
-        path: list[NodeType] | None
-            The shortest path from src to dst. Returns None if dst is not reachable from src
+        length, path: int, list[NodeType] | None
+            The length (number of edges) and a shortest path from src to dst. 
+            Returns None if dst is not reachable from src (within the budget)
         """ 
-        liste_chemins=[[src]]
-        aparcourir=[src]
-        parcourus=[src]
-        while aparcourir!=[]:
-            s=aparcourir[0]
-            aparcourir=aparcourir[1:]
-            "on complète les chemins en récupérant le chemin finissant par s"
-            for chemin in liste_chemins :
-                if chemin[len(chemin)-1]==s:
-                    chemin_a_completer=chemin
-                    liste_chemins.remove(chemin)
-            "on parcourt tous les voisins s'ils n'ont pas déjà été parcourus"
-            for voisin in self.graph[s]:
-                if not (voisin in parcourus):
-                    liste_chemins.append(chemin_a_completer+[voisin])
-                    aparcourir.append(voisin)
-                    parcourus.append(voisin)
-                if voisin==dst:
-                    return (len(chemin_a_completer), chemin_a_completer+[voisin])
-        return None
+        path = search.bfs(src, dst, self.graph.__getitem__, max_depth, max_nodes, stats)
+        if path is None:
+            return None
+        return (len(path)-1, path)
+
+
+    def bfs_tree(self, src):
+        """
+        Returns the BFS tree of src (its parent map, see search.bfs_tree), computed once and kept in an LRU cache 
+        keyed by source. The least recently used trees are evicted when the cache exceeds tree_cache_bytes, 
+        and the cache is emptied when an edge is added.
+        """
+        if src in self._trees:
+            self._trees.move_to_end(src)
+            return self._trees[src][0]
+        if src not in self.graph:
+            raise Exception(f"Unknown node {src}")
+        parents = search.bfs_tree(src, self.graph.__getitem__)
+        size = sys.getsizeof(parents)
+        self._trees[src] = (parents, size)
+        self._trees_bytes += size
+        while self._trees_bytes > self.tree_cache_bytes and len(self._trees) > 1:
+            _, (_, evicted) = self._trees.popitem(last=False)
+            self._trees_bytes -= evicted
+        return parents
+
+    def shortest_path(self, src, dst):  # Question 5
+        """
+        Finds a shortest path from src to dst with the contract of bfs, from the cached BFS tree of src (see bfs_tree): 
+        the first query of a source costs a full traversal, the next ones with the same source only rebuild the path, 
+        in O(length of the path). Suited to many queries on the same graph, such as the ones of the .path.out files.
 
+        Output: 
+        -------
+        length, path: int, list[NodeType] | None
+            The length (number of edges) and a shortest path from src to dst. Returns None if dst is not reachable.
+        """
+        parents = self.bfs_tree(src)
+        if dst not in parents:
+            return None
+        path = search.rebuild_path(parents, dst)
+        return (len(path)-1, path)
+
+    def all_pairs_bfs(self):
+        """
+        Computes the distances between all the pairs of nodes by one BFS per source on the CSR form of the graph 
+        (see CSRGraph.distances).
+
+        Output: 
+        -------
+        distances: np.ndarray
+            A numpy.int32 array of shape (nb_nodes, nb_nodes) such that distances[i, j] is the number of edges of 
+            a shortest path from self.nodes[i] to self.nodes[j] (-1 if there is none).
+        """
+        index = {node: i + 1 for i, node in enumerate(self.nodes)}
+        edges = np.array([(index[node1], index[node2]) for node1, node2 in self.edges], dtype=np.int64)
+        csr = CSRGraph.from_edges(self.nb_nodes, edges)
+        distances = np.empty((self.nb_nodes, self.nb_nodes), dtype=np.int32)
+        for i in range(self.nb_nodes):
+            distances[i] = csr.distances(i + 1)[1:]
+        return distances
 
     @classmethod
-    def graph_from_file(cls, file_name):
+    def graph_from_file(cls, file_name, cache=False):
         """
         Reads a text file and returns the graph as an object of the Graph class.
 
@@ -133,21 +199,161 @@ class Graph:
         -----------
         file_name: str
             The name of the file
+        cache: bool, optional
+            If True, the parsed edges are kept in a binary sidecar file, memory-mapped by the next loads 
+            (see parsing.read_graph).
 
         Outputs: 
         -----------
         graph: Graph
             An object of the class Graph with the graph from file_name.
         """
-        with open(file_name, "r") as file:
-            n, m = map(int, file.readline().split())
-            graph = Graph(range(1, n+1))
-            for _ in range(m):
-                edge = list(map(int, file.readline().split()))
-                if len(edge) == 2:
-                    node1, node2 = edge
-                    graph.add_edge(node1, node2) # will add dist=1 by default
-                else:
-                    raise Exception("Format incorrect")
+        n, edges = read_graph(file_name, cache)
+        graph = Graph(range(1, n+1))
+        for node1, node2 in edges.tolist():
+            graph.add_edge(node1, node2) # will add dist=1 by default
         return graph
 
+
+class CSRGraph:
+    """
+    A class representing undirected graphs whose nodes are the integers 1, ..., nb_nodes in the compressed sparse 
+    row (CSR) format: the neighbors of the node v are indices[indptr[v]:indptr[v+1]]. The two numpy arrays take 
+    4 bytes per edge end and 8 bytes per node, against a Python list entry, a boxed integer and a dict slot for 
+    Graph, and a BFS reads them contiguously.
+
+    Attributes: 
+    -----------
+    nb_nodes: int
+        The number of nodes.
+    nb_edges: int
+        The number of edges.
+    indptr: np.ndarray
+        A numpy.int64 array of length nb_nodes + 2 (the row 0 is empty).
+    indices: np.ndarray
+        A numpy.int32 array of length 2 * nb_edges, the concatenated neighbor lists.
+    """
+
+    def __init__(self, nb_nodes, indptr, indices):
+        self.nb_nodes = nb_nodes
+        self.nb_edges = len(indices) // 2
+        self.indptr = indptr
+        self.indices = indices
+
+    def __repr__(self): 
+        return f"<graph.CSRGraph: nb_nodes={self.nb_nodes}, nb_edges={self.nb_edges}>"
+
+    @classmethod
+    def from_edges(cls, nb_nodes, edges):
+        """
+        Builds the graph from an array of edges in a single pass: both orientations of the edges are grouped 
+        by their first end with a stable sort, so each neighbor list keeps the order of the edges.
+
+        Parameters: 
+        -----------
+        nb_nodes: int
+            The number of nodes, named 1..nb_nodes.
+        edges: np.ndarray
+            An integer array of shape (nb_edges, 2), one edge (node1, node2) per line.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if len(edges) and (edges.min() < 1 or edges.max() > nb_nodes):
+            raise Exception(f"The nodes must be named 1..{nb_nodes}")
+        ends = edges.reshape(-1)
+        others = edges[:, ::-1].reshape(-1)
+        order = np.argsort(ends, kind="stable")
+        indptr = np.zeros(nb_nodes + 2, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=nb_nodes + 1), out=indptr[1:])
+        return cls(nb_nodes, indptr, others[order].astype(np.int32))
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Converts a Graph whose nodes are the integers 1..nb_nodes.
+        """
+        return cls.from_edges(graph.nb_nodes, graph.edges)
+
+    def neighbors(self, node):
+        """
+        Returns the array of the neighbors of node.
+        """
+        return self.indices[self.indptr[node]:self.indptr[node+1]]
+
+    def _expand(self, frontier):
+        """
+        Returns the concatenated neighbor lists of the nodes of frontier and, for each neighbor, 
+        the node of frontier it comes from.
+        """
+        starts, stops = self.indptr[frontier], self.indptr[frontier + 1]
+        lengths = stops - starts
+        total = int(lengths.sum())
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return self.indices[np.arange(total) + offsets], np.repeat(frontier, lengths)
+
+    def bfs(self, src, dst, max_depth=None, max_nodes=None):  # Question 5
+        """
+        Finds a shortest path from src to dst by BFS, with the contract of Graph.bfs. The search is level-synchronous: 
+        each layer is expanded at once with array operations, and the distances and parents are numpy vectors 
+        indexed by node. The budget max_nodes is checked after each layer.
+
+        Output: 
+        -------
+        length, path: int, list[int] | None
+            The length (number of edges) and a shortest path from src to dst. 
+            Returns None if dst is not reachable from src (within the budget)
+        """
+        for node in (src, dst):
+            if not 1 <= node <= self.nb_nodes:
+                raise Exception(f"Unknown node {node}")
+        if src == dst:
+            return (0, [src])
+        parents = np.full(self.nb_nodes + 1, -1, dtype=np.int32)
+        parents[src] = src
+        frontier = np.array([src], dtype=np.int64)
+        visited = 1
+        depth = 0
+        while len(frontier) > 0:
+            if max_depth is not None and depth >= max_depth:
+                return None
+            depth += 1
+            children, origins = self._expand(frontier)
+            new = parents[children] == -1
+            # the first occurrence of each new node gives its parent
+            frontier, first = np.unique(children[new], return_index=True)
+            parents[frontier] = origins[new][first]
+            visited += len(frontier)
+            if parents[dst] != -1:
+                path = [dst]
+                while path[-1] != src:
+                    path.append(int(parents[path[-1]]))
+                path.reverse()
+                return (depth, path)
+            if max_nodes is not None and visited > max_nodes:
+                return None
+        return None
+
+    def distances(self, src):
+        """
+        Returns the numpy.int32 array of the distances from src to every node (indexed by node, the entry 0 is unused), 
+        -1 for the nodes that are not reachable, computed by a level-synchronous BFS.
+        """
+        distances = np.full(self.nb_nodes + 1, -1, dtype=np.int32)
+        distances[src] = 0
+        frontier = np.array([src], dtype=np.int64)
+        depth = 0
+        while len(frontier) > 0:
+            depth += 1
+            children, _ = self._expand(frontier)
+            frontier = np.unique(children[distances[children] == -1])
+            distances[frontier] = depth
+        distances[0] = -1
+        return distances
+
+    @classmethod
+    def graph_from_file(cls, file_name, cache=False):
+        """
+        Reads a text file at the format of Graph.graph_from_file and returns the graph as a CSRGraph. 
+        The edges are parsed at once into an array (see parsing.read_graph).
+        """
+        n, edges = read_graph(file_name, cache)
+        return cls.from_edges(n, edges)
@@ -3,14 +3,31 @@ This is the grid module. It contains the Grid class and its associated methods.
 """
 import numpy as np
 import random
-import heapq as hq
+from functools import lru_cache
 
 import sys 
 sys.path.append("swap_puzzle/")
 from graph import Graph
+from states import flatten, unflatten, encode, decode, neighbors, swap_table, rank_array, unrank_array, FACTORIALS
+from distance_table import DistanceTable
+from parallel_bfs import check_shape
+from parsing import read_grid, iter_grids
+from generator import count_inversions, difficulty_band, permutation_with_inversions
+from enumeration import iter_states
+from heuristics import get_heuristic
+import search
 
 import matplotlib.pyplot as plt
 
+
+@lru_cache(maxsize=None)
+def sorted_state(m, n):
+    """
+    Returns the state of the sorted m x n grid, computed once per shape. It must not be modified.
+    """
+    return [list(range(i*n+1, (i+1)*n+1)) for i in range(m)]
+
+
 class Grid():
     """
     A class representing the grid from the swap puzzle. It supports rectangular grids. 
@@ -64,9 +81,7 @@ class Grid():
         """
         Checks is the current state of the grid is sorted and returns the answer as a boolean.
         """
-        n = self.n
-        m = self.m
-        return self.state == [list(range(i*n+1, (i+1)*n+1)) for i in range(m)]
+        return self.state == sorted_state(self.m, self.n)
 
     def swap(self, cell1, cell2):  # Question 2
         """
@@ -79,7 +94,8 @@ class Grid():
         """
         i1, j1 = cell1
         i2, j2 = cell2
-        if i1 == i2 and abs(j1-j2) == 1 or j1 == j2 and abs(i1-i2):
+        inside = 0 <= i1 < self.m and 0 <= i2 < self.m and 0 <= j1 < self.n and 0 <= j2 < self.n
+        if inside and (i1 == i2 and abs(j1-j2) == 1 or j1 == j2 and abs(i1-i2) == 1):
             self.state[i1][j1], self.state[i2][j2] = self.state[i2][j2], self.state[i1][j1]
         else:
             raise Exception("Sorry, this swap is not allowed")
@@ -97,8 +113,35 @@ class Grid():
         for (cell1, cell2) in cell_pair_list:
             self.swap(cell1, cell2)
 
+    def key(self):
+        """
+        Returns a compact hashable key of the state of the grid: the rank of the state as a permutation 
+        (an integer) for grids up to 4x4, a packed bytes/tuple key for larger grids (see the states module).
+        Two grids of the same shape have the same key if and only if they have the same state.
+        """
+        return encode(flatten(self.state))
+
+    @classmethod
+    def from_key(cls, m, n, key):
+        """
+        Creates a grid of m lines and n columns from a key returned by Grid.key.
+
+        Parameters: 
+        -----------
+        m, n: int
+            Number of lines and columns of the grid
+        key: int | bytes | tuple[int]
+            The key of the state
+
+        Output: 
+        -------
+        grid: Grid
+            The grid
+        """
+        return cls(m, n, unflatten(decode(key, m*n), m, n))
+
     @classmethod
-    def grid_from_file(cls, file_name): 
+    def grid_from_file(cls, file_name, cache=False): 
         """
         Creates a grid object from class Grid, initialized with the information from the file file_name.
     
@@ -108,22 +151,33 @@ class Grid():
             Name of the file to load. The file must be of the format: 
             - first line contains "m n" 
             - next m lines contain n integers that represent the state of the corresponding cell
+        cache: bool, optional
+            If True, the parsed state is kept in a binary sidecar file, memory-mapped by the next loads 
+            (see parsing.read_grid).
 
         Output: 
         -------
         grid: Grid
             The grid
         """
-        with open(file_name, "r") as file:
-            m, n = map(int, file.readline().split())
-            initial_state = [[] for i_line in range(m)]
-            for i_line in range(m):
-                line_state = list(map(int, file.readline().split()))
-                if len(line_state) != n: 
-                    raise Exception("Format incorrect")
-                initial_state[i_line] = line_state
-            grid = Grid(m, n, initial_state)
-        return grid
+        state = read_grid(file_name, cache)
+        return cls.from_array(*state.shape, state)
+
+    @classmethod
+    def grids_from_file(cls, file_name):
+        """
+        Generates the grids of a file containing several grids at the format of grid_from_file, one after the other. 
+        The grids are read one at a time (see parsing.iter_grids).
+        """
+        for state in iter_grids(file_name):
+            yield cls.from_array(*state.shape, state)
+
+    @classmethod
+    def from_array(cls, m, n, state):
+        """
+        Creates a grid from a numpy array of shape (m, n), see parsing.
+        """
+        return cls(m, n, state.tolist())
 
     def display(self):
         n=self.n
@@ -134,45 +188,28 @@ class Grid():
         table=plt.table(cellText=cases, rowLabels=lignes, colLabels=colonnes, rowColours=["blue"]*m, colColours=["blue"]*n)
         plt.show()
 
-    def permutation(self, lst):  # Question 6
-        if len(lst) == 0:
-            return []
-        if len(lst) == 1:
-            return [lst]
-        l = []
+    def permutation(self, lst, start_rank=0, stop_rank=None):  # Question 6
         """
-        c'est une fonction récursive : pour toutes les permutations d'un ensemble à n éléments, on considère 
-        toutes les permutations de tous les sous-ensembles à n-1 éléments en ajoutant au début de toutes ces 
-        permutations l'élément qu'on n'a pas considéré
+        cette fonction génère, une par une, toutes les permutations de la liste lst (sous forme de listes), dans
+        l'ordre lexicographique des positions des éléments de lst (l'ordre lexicographique tout court si lst est
+        triée). Au lieu de construire récursivement la liste de toutes les permutations, on passe de chaque
+        permutation à la suivante en place (voir enumeration.next_permutation) : la mémoire utilisée ne dépend
+        pas du nombre de permutations. On peut se restreindre aux rangs start_rank, ..., stop_rank - 1 pour
+        découper l'énumération entre plusieurs processus ou la reprendre là où elle s'est arrêtée.
         """
-        for i in range(len(lst)):
-            m = lst[i]
-            sous_lst = lst[:i] + lst[i+1:]
-        for p in self.permutation(sous_lst):
-            l.append([m] + p)
-        return l
+        if len(lst) == 0:
+            return
+        for indices in iter_states(len(lst), start_rank, stop_rank):
+            yield [lst[i-1] for i in indices]
 
-    def gridlist_from_permlist(self):  # Question 6    
+    def gridlist_from_permlist(self, start_rank=0, stop_rank=None):  # Question 6
         """
-        cette fonction permet de construire la liste des grilles à partir de la liste des permutations
+        cette fonction génère, une par une, les grilles (listes de listes) de toutes les permutations
+        de {1, ..., mn}, par rang croissant (voir permutation)
         """
         n, m = self.n, self.m
-        permlist = self.permutation([i for i in range(1,n*m +1)])
-        liste_grilles = []
-
-        def grid_from_perm(s):
-            grille = []    
-            for i in range(m):
-                ligne_i = []
-                for j in range(n):
-                    ligne_i.append(s[n*i + j])
-                grille.append(ligne_i)
-            return grille
-
-        for s in permlist:
-            liste_grilles.append(grid_from_perm(s))
-   
-        return liste_grilles
+        for s in iter_states(n*m, start_rank, stop_rank):
+            yield unflatten(s, m, n)
 
     def all_swaps_possible(self):  # Question 6
         list_swaps = []
@@ -191,184 +228,226 @@ class Grid():
 
     def grilles_voisines(self):  # Question 6
         """
-        cette fonction renvoie la liste de toutes les grilles voisines d'une grille, au sens où elles sont accessibles en un seul swap
+        cette fonction renvoie la liste de toutes les grilles voisines d'une grille, au sens où elles sont accessibles en un seul swap.
+        chaque swap de la table states.swap_table (calculée une seule fois par forme de grille) n'est considéré qu'une fois, 
+        et on permute directement l'état aplati au lieu de copier toute la grille
         """
-        L = []
-        S = self.all_swaps_possible()
-        for k in range(len(S)):
-            g_temp=Grid(self.m,self.n,copy.deepcopy(self.state))
-            g_temp.swap(S[k][0], S[k][1])
-            L.append(g_temp.state)
-        return L
+        m, n = self.m, self.n
+        return [unflatten(child, m, n) for _, child in neighbors(flatten(self.state), m, n)]
 
     def construct_graph(self):  # Question 7
         """ 
-        on considère la liste de toutes les grilles de taille n*m à partir de la fonction qui génère toutes les
-        permutations de l'ensemble {1,2,...,n*m} sans considérer la grille objectif car on initialisera le graphe 
-        avec celle-ci
-        """
-        n, m = self.n, self.m
-        gl = self.gridlist_from_permlist()[1:]
+        cette fonction construit le graphe explicite de toutes les grilles de taille m*n. Chaque grille est 
+        représentée par son rang (states.rank) : les noeuds sont les entiers 0, ..., (mn)! - 1, le noeud 0 étant 
+        la grille triée. Au lieu de tester, pour chaque grille, si elle est voisine de chacun des noeuds déjà 
+        ajoutés (ce qui est quadratique), on calcule en une fois, pour chaque swap de la table states.swap_table, 
+        les rangs de toutes les grilles obtenues par ce swap, et on ajoute chaque arête une seule fois.
+        Ce graphe n'est utilisable que pour les petites formes ; pour résoudre une grille, DistanceTable suffit.
         """
-        Création du graphe gr, initialisé avec le noeud objectif, qui est la grille triée
-        """
-        gr = Graph([Grid(m, n)])
-
-        """ 
-        on cherche à vider la liste de toutes les grilles possibles: on la parcourt tant qu'elle est non vide
-        """
-        while gl != []:
-            traitees = []
-            for i in range(len(gl)):
-                """
-                pour chaque grille à ajouter dans le graphe, on parcourt tous les noeuds (grilles) du graphe 
-                en cours de construction ; quand un noeud du graphe est voisin de la grille que l'on parcourt 
-                (ce que l'on teste avec la fonction grilles_voisines), on associe les deux grilles en ajoutant 
-                l'arête voulue
-                """
-                for j in range(len(gr.nodes)):
-                    if gl[i] in (gr.nodes[j]).grilles_voisines():
-                        traitees.append(i)
-                        gr.nodes.append(gl[i])
-                        gr.add_edge(gl[i], gr.nodes[j])
-                        break
-            """ 
-            on supprime toutes les grilles qu'on a pu rajouter au graphe
-            """            
-            for v in range(len(traitees)):
-                del (gl[v])
+        m, n = self.m, self.n
+        check_shape(m, n)
+        size = m*n
+        ranks = np.arange(FACTORIALS[size])
+        states = unrank_array(ranks, size, size)
+        gr = Graph(range(FACTORIALS[size]))
+        for a, b in swap_table(m, n):
+            children = states.copy()
+            children[:, [a, b]] = children[:, [b, a]]
+            child_ranks = rank_array(children, size)
+            keep = ranks < child_ranks
+            for node1, node2 in zip(ranks[keep].tolist(), child_ranks[keep].tolist()):
+                gr.add_edge(node1, node2)
         return gr
 
     def bfs_swap(self):  # Question 7
         """
-        cette fonction a pour but de reproduire la séquence de swaps qui permet de passer d'une grille quelconque à la grille triée
+        cette fonction trie la grille par une séquence optimale de swaps et renvoie cette séquence. Au lieu de 
+        construire le graphe de toutes les grilles et d'y appliquer un bfs, on utilise la table des distances 
+        de la forme (DistanceTable, calculée une seule fois puis gardée en mémoire) : la distance d'une grille 
+        est lue directement, et le chemin descend la table d'un voisin à l'autre jusqu'à la grille triée.
         """
-        def find_perm(g1, g2):
-            """
-            cette fonction permet de trouver le swap qui a permis de passer d'une grille à une autre étant données ces deux grilles
-            """
-            e1, e2 = None, None
-            for i in range(self.m):
-                for j in range(self.n):
-                    if g1[i][j] != g2[i][j]:
-                        e1 = g1[i][j]
-                        e2 = g2[i][j]
-                        break
-                if e1 is not None and e2 is not None:
-                    break
-            return e1, e2
+        swaps = DistanceTable.for_shape(self.m, self.n).solve(self)
+        self.swap_seq(swaps)
+        return swaps
 
+    def bfs_path(self, dst, max_depth=None, max_nodes=None, compact=False, stats=None):  # Question 8
         """
-        on construit le graphe des grilles et on applique le bfs
+        Finds a shortest sequence of states from the grid to the grid dst by BFS on the implicit graph of the grids: 
+        the neighbors of a state are generated on the fly from the swap table of the shape and only the visited states 
+        are stored, so the memory used grows with the explored states and not with (mn)!.
+
+        Parameters: 
+        -----------
+        dst: Grid
+            The destination grid, of the same shape.
+        max_depth, max_nodes: int, optional
+            Search budget, see search.bfs.
+        compact: bool, optional
+            If False (default), the visited states are stored as flat tuples, which are the fastest to expand. 
+            If True, they are stored as the keys of Grid.key (one integer per state up to 4x4), which uses 
+            several times less memory but requires encoding each generated state.
+        stats: stats.SearchStats, optional
+            If given, it is filled with the statistics of the search.
+
+        Output: 
+        -------
+        path: list[tuple[int]] | None
+            The flat states from the grid to dst. Returns None if dst is not reached within the budget.
         """
-        gr = self.construct_graph()
-        source = self.state
-        but = [[i*j for j in range(1, self.n + 1)] for i in range(1, self.m + 1)]
-        longueur_chemin, chemin = gr.bfs(source, but)
+        m, n = self.m, self.n
+        if compact:
+            path = search.bfs(self.key(), dst.key(), self._key_children, max_depth, max_nodes, stats)
+            if path is None:
+                return None
+            return [decode(key, m*n) for key in path]
+
+        def children(node):
+            for _, child in neighbors(node, m, n):
+                yield child
+
+        return search.bfs(flatten(self.state), flatten(dst.state), children, max_depth, max_nodes, stats)
+
+    def _key_children(self, key):
         """
-        on effectue la séquence de swaps du chemin trouvé par bfs
+        Generates the keys (see Grid.key) of the states that are one swap away from the state of key.
         """
-        for k in range(len(chemin)-1):
-            g1, g2 = chemin[k], chemin[k+1]
-            self.swap(find_perm(g1, g2))
+        m, n = self.m, self.n
+        for _, child in neighbors(decode(key, m*n), m, n):
+            yield encode(child)
+
+    def bidirectional_path(self, dst, max_nodes=None, stats=None):  # Question 8
+        """
+        Finds a shortest sequence of flat states from the grid to the grid dst by a bidirectional BFS 
+        (see search.bidirectional_bfs): swaps are reversible, so a BFS from dst can meet the BFS from the grid, 
+        each one exploring about half the depth. Returns None if no path is found within the budget.
+        stats (a stats.SearchStats) is filled with the statistics of the search if it is given.
+        """
+        m, n = self.m, self.n
+
+        def children(node):
+            for _, child in neighbors(node, m, n):
+                yield child
+
+        return search.bidirectional_bfs(flatten(self.state), flatten(dst.state), children, max_nodes, stats)
 
     def final_bfs(self, dst):  # Question 8
         """
-        il faut associer une clé unique à chaque grille
-        """
-        src = self
-        liste_grilles = Grid(self.m, self.n).gridlist_from_permlist()
-        cle_src = liste_grilles.index(src.state)
-        g = Graph([cle_src])
-        liste_chemins = [[src]]
-        aparcourir = [src]
-        parcourus = [src]
-        while aparcourir != []:
-            s = aparcourir[0]
-            aparcourir.remove(0)
-            cle_s = liste_grilles.index(s.state)
-            print(cle_s)
-            """
-            on complète les chemins en récupérant le chemin finissant par s
-            """
-            for chemin in liste_chemins:
-                if chemin[len(chemin)-1] == s:
-                    chemin_a_completer = chemin
-                    liste_chemins.remove(chemin)
-            """
-            on crée la liste de toutes les grilles voisines de s
-            """
-            V_tmp = s.grilles_voisines()
-            V = []
-            for i in range(len(V_tmp)):
-                v = Grid(self.m, self.n)
-                v.state = V_tmp[i]
-                V.append(v)
-            """
-            on rajoute au graphe les voisins de s qui ne sont pas déjà parcourus ni à parcourir
-            """
-            for voisin_possible in V:
-                if (voisin_possible not in aparcourir) and (voisin_possible not in parcourus):
-                    try:
-                        g.graph[cle_s].append(voisin_possible)
-                    except KeyError:
-                        g.graph[cle_s] = [voisin_possible]
-                    liste_chemins.append(chemin_a_completer+[voisin_possible])
-                    aparcourir.append(voisin_possible)
-                    parcourus.append(voisin_possible)
-                if voisin_possible == dst:
-                    return (len(chemin_a_completer), chemin_a_completer+[voisin_possible])
-        return None
+        Finds a shortest path from the grid to the grid dst, without building the graph of all the grids.
+
+        Output: 
+        -------
+        length, path: int, list[Grid] | None
+            The number of swaps and the list of grids from the grid to dst. Returns None if dst is not reachable.
+        """
+        path = self.bfs_path(dst, compact=True)
+        if path is None:
+            return None
+        return (len(path)-1, [Grid(self.m, self.n, unflatten(flat, self.m, self.n)) for flat in path])
     
-    def astar(self, dst):  # Question 1 ; Séances 3 et 4
+    def astar_path(self, dst, heuristic="manhattan", closed=True, max_nodes=None, compact=False, stats=None):  # Question 1 ; Séances 3 et 4
+        """
+        Finds a sequence of states from the grid to the grid dst with the A* algorithm of the search module.
 
-        '''
-        Comme la fonction heuristique est utilisée comme une key function pour ordonner 
-        la file, sa présence dans la fonction astar, bien que peu élégante, est nécessaire.
-        L'heuristique choisie donne la somme des distances de Manhattan (norme 1) 
-        pour chaque élément de la grille, notées (i,j) (correspondant à la ligne i et colonne j 
-        où se trouve l'élément), et l'emplacement (itarget, jtarget) où il serait si la grille était
-        triée. C'est en quelque sorte sa distance à la grille objectif.
-        '''
+        Parameters: 
+        -----------
+        dst: Grid
+            The destination grid, of the same shape.
+        heuristic: str | function
+            The heuristic, given by its name in heuristics.HEURISTICS ("manhattan", "kendall"), as a function 
+            h(flat, m, n) estimating the number of swaps needed to sort the flat state, or as a heuristics.Heuristic. 
+            The heuristic value of a child is computed from the one of its parent with Heuristic.delta.
+        closed, max_nodes: 
+            See search.astar.
+        compact: bool, optional
+            If True, the states are stored as the keys of Grid.key instead of flat tuples, see Grid.bfs_path.
+        stats: stats.SearchStats, optional
+            If given, it is filled with the detailed statistics of the search, heuristic evaluation time included.
 
-        m=self.m
-        n=self.n
-        def heuristique(grille,m,n): 
-            s = 0
-            for i in range(m):
-                for j in range(n):
-                    k = grille[i][j]
-                    itarget = k // n - 1
-                    jtarget = k%n
-                    s += abs(i - itarget) + abs(j - jtarget)
-                    return s
-
-        traites = []
-        liste_chemins = [[self]]
-        openList = self.gridlist_from_permlist()
-        hq.merge(openList,key=heuristique)
-        hq.heappush(openList,self.state)
-        while openList != [] :
-            u = hq.heappop(openList)
-            for chemin in liste_chemins:
-                if chemin[len(chemin)-1].state == u:
-                    chemin_a_completer = chemin
-                    liste_chemins.remove(chemin)
-                    if u == dst.state:  
-                        return chemin_a_completer
-            
-            """
-            on introduit la liste de toutes les grilles voisines de s
-            """
-            grid_u=Grid(m,n,u)
-            liste_voisins = grid_u.grilles_voisines()
-            for v in liste_voisins:
-                grid_v=Grid(m,n,v)
-                if not (v in traites or (v in openList and heuristique(v,m,n) < heuristique(u,m,n) + 1)):
-                    hq.heappush(openList,v)
-                    liste_chemins.append(chemin_a_completer + [grid_v])
-            traites.append(u)
-        raise Exception("Error")
+        Output: 
+        -------
+        path, stats: list[tuple[int]] | None, dict
+            The flat states from the grid to dst (None if dst was not reached) and the statistics of the search.
+        """
+        def run(src, goal, successors, h_src):
+            return search.astar(src, goal, successors, h_src, closed, max_nodes, stats)
+
+        return self._informed_path(dst, heuristic, run, compact, stats)
+
+    def _informed_path(self, dst, heuristic, run, compact=False, stats=None):
+        """
+        Runs an informed search of the search module, run(src, goal, successors, h_src) -> (path, stats), from 
+        the grid to the grid dst, and returns its path as flat states (None if dst was not reached) and its 
+        statistics. The successors yield the pairs (child, h(child)), see search.astar. The heuristic, compact and 
+        stats are those of astar_path.
+        """
+        m, n = self.m, self.n
+        h = get_heuristic(heuristic, m, n)
+        if stats is not None:
+            h = stats.wrap_heuristic(h)
+        src, goal = flatten(self.state), flatten(dst.state)
+        """
+        les heuristiques estiment la distance à la grille triée : si dst n'est pas triée, on renumérote 
+        les valeurs de sorte que dst devienne la grille triée, ce qui ne change pas les swaps à effectuer
+        """
+        relabel = None
+        if goal != tuple(range(1, m*n + 1)):
+            relabel = {value: p + 1 for p, value in enumerate(goal)}
+            src = tuple(relabel[value] for value in src)
+            goal = tuple(range(1, m*n + 1))
+
+        if compact:
+            def successors(key, h_node):
+                flat = decode(key, m*n)
+                for (a, b), child in neighbors(flat, m, n):
+                    yield encode(child), h.delta(flat, h_node, a, b)
+
+            path, summary = run(encode(src), encode(goal), successors, h(src))
+            if path is not None:
+                path = [decode(key, m*n) for key in path]
+        else:
+            def successors(node, h_node):
+                for (a, b), child in neighbors(node, m, n):
+                    yield child, h.delta(node, h_node, a, b)
+
+            path, summary = run(src, goal, successors, h(src))
+        if path is not None and relabel is not None:
+            inverse = {p: value for value, p in relabel.items()}
+            path = [tuple(inverse[p] for p in node) for node in path]
+        return path, summary
+
+    def idastar_path(self, dst, heuristic="manhattan", tt_size=1000000, max_nodes=None, stats=None):  # Séances 3 et 4
+        """
+        Finds a sequence of flat states from the grid to the grid dst with the IDA* algorithm of the search module, 
+        whose memory is proportional to the length of the solution (plus the bounded transposition table).
+        The parameters and the output are those of astar_path, see also search.idastar.
+        """
+        def run(src, goal, successors, h_src):
+            return search.idastar(src, goal, successors, h_src, tt_size, max_nodes, stats)
+
+        return self._informed_path(dst, heuristic, run, stats=stats)
+
+    def anytime_path(self, dst, heuristic="manhattan", weights=(3, 2, 1.5, 1.25, 1), time_budget=None, max_nodes=None,
+                     stats=None):  # Séances 3 et 4
+        """
+        Finds a sequence of flat states from the grid to the grid dst with the anytime ARA* algorithm of the search
+        module: a first solution is found quickly with a large heuristic weight, then improved with smaller weights
+        until the budget (time_budget seconds, max_nodes expansions) is exhausted. The output is that of astar_path,
+        the statistics include the suboptimality "bound" of the path, see search.ara_star.
+        """
+        def run(src, goal, successors, h_src):
+            return search.ara_star(src, goal, successors, h_src, weights, time_budget, max_nodes, stats)
+
+        return self._informed_path(dst, heuristic, run, stats=stats)
+
+    def astar(self, dst, heuristic="manhattan"):  # Question 1 ; Séances 3 et 4
+        """
+        Finds a path from the grid to the grid dst with the A* algorithm (see astar_path) and returns it as a list of grids.
+        Raises an exception if dst cannot be reached.
+        """
+        path, _ = self.astar_path(dst, heuristic)
+        if path is None:
+            raise Exception("Error")
+        return [Grid(self.m, self.n, unflatten(flat, self.m, self.n)) for flat in path]
 
     '''
     Question 2 : voici un autre exemple d'heuristique possible dans notre
@@ -397,10 +476,10 @@ class Grid():
 
     def kendall_tau_naif(self):  # Question 2 ; Séances 3 et 4
         s = 0
-        n, m = self.m, self.n
+        n, m = self.n, self.m
         for a in range(m*n):
             for b in range(m*n):
-                if a < b and self.state[a//n - 1][a%n] > self.state[b//n - 1][b%n]:
+                if a < b and self.state[a//n][a%n] > self.state[b//n][b%n]:
                     s += 1
         return s
     
@@ -414,36 +493,39 @@ class Grid():
     que ce changement a été effectué (ce qui revient à remplacer les
     lignes 336 à 343 par les lignes 395 à 401).
 
-    On choisit 4 niveaux de difficultés. Soit g une grille.
-    En notant dmax = mn (qui est la valeur maximale pour dKT(g, Id) 
-    comme on l'a vu précédemment), on a :
+    On choisit 4 niveaux de difficultés. Soit g une grille de N = mn cases.
+    En notant dmax = N(N-1)/2 (qui est la valeur maximale pour dKT(g, Id),
+    atteinte par la grille renversée), on a :
     - La difficulté du jeu est EASY:= 1 ssi         1 <= dKT(g, ID) <= dmax//4
     - La difficulté du jeu est INTERMEDIATE:= 2 ssi dmax//4 < dKT(g, ID) <= dmax//2
     - La difficulté du jeu est DIFFICULT := 3 ssi   dmax//2 < dKT(g, ID) <= 3dmax//4
     - La difficulté du jeu est HARDCORE := 4 ssi    3dmax//4 < dKT(g, ID) <= dmax
     '''
 
-    def level_starter(self, difficulty):  # Question 4 ; Séances 3 et 4
-        n, m = self.m, self.n
-        dmax = m*n
-        if difficulty == 1:
-            k = random.randint(1, dmax//4)
-        elif difficulty == 2:
-            k = random.randint(dmax//4 + 1, dmax//2)
-        elif difficulty == 3:
-            k = random.randint(dmax//2 + 1, 3*dmax//4)
-        elif difficulty == 4:
-            k = random.randint(3*dmax//4 + 1, dmax)
-
-        inversions = random.sample([a for a in range(m*n)], k)
-        starter = Grid(m, n)
-
-        for a in range(k-1):
-            i1, i2 = inversions[a]//n, inversions[a+1]//n
-            j1, j2 = a%n, (a+1)%n
-            starter.state[i1][j1], starter.state[i2][j2] = starter.state[i2][j2], starter.state[i1][j1]
-
-        return starter
+    def kendall_tau(self):  # Question 2 ; Séances 3 et 4
+        """
+        Returns the number of inversions of the grid (see kendall_tau_naif) in O(mn log(mn)) with a Fenwick tree
+        (see generator.count_inversions).
+        """
+        return count_inversions(flatten(self.state))
+
+    def level_starter(self, difficulty, rng=random):  # Question 4 ; Séances 3 et 4
+        """
+        Returns a new grid of the same shape whose number of inversions is drawn uniformly in the band of the
+        difficulty (see above and generator.difficulty_band). The grid is built from a random inversion vector
+        with exactly this number of inversions (see generator.permutation_with_inversions).
+
+        Parameters:
+        -----------
+        difficulty: int
+            1 (EASY), 2 (INTERMEDIATE), 3 (DIFFICULT) or 4 (HARDCORE).
+        rng: random.Random, optional
+            The source of randomness (default: the random module), to generate reproducible grids.
+        """
+        m, n = self.m, self.n
+        low, high = difficulty_band(m, n, difficulty)
+        k = rng.randint(low, high)
+        return Grid(m, n, unflatten(permutation_with_inversions(m*n, k, rng), m, n))
 
 
 
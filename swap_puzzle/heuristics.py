@@ -0,0 +1,141 @@
+"""
+This is the heuristics module. It contains the heuristics used by the A* search to estimate the number of swaps
+needed to sort a grid.
+
+A heuristic is an object h built for a grid shape (m, n), with two methods:
+    - h(flat) evaluates the flat state (tuple of the values in row-major order) from scratch;
+    - h.delta(flat, h_flat, a, b) returns the value for the state obtained by swapping the flat positions a and b
+      of flat, knowing that the value of flat is h_flat. The heuristics of this module do it without rescanning
+      the grid, which removes an O(mn) evaluation from every node expansion.
+The heuristics of HEURISTICS are admissible (they never overestimate the number of swaps) and consistent
+(one swap changes them by at most 1), so A* returns optimal solutions with them.
+"""
+from generator import count_inversions
+
+
+def manhattan(flat, m, n):
+    """
+    Returns the sum, over all the values of the grid, of the Manhattan distance (norm 1) between the cell (i, j)
+    of the value and the cell (itarget, jtarget) where it is in the sorted grid.
+    This sum is not a lower bound of the number of swaps: one swap moves two values and can decrease it by 2.
+    """
+    s = 0
+    for p in range(m*n):
+        k = flat[p] - 1
+        s += abs(p//n - k//n) + abs(p%n - k%n)
+    return s
+
+
+def half_manhattan(flat, m, n):
+    """
+    Returns manhattan / 2, an admissible bound since one swap decreases the Manhattan sum by at most 2.
+    The sum is always even (it is 0 for the sorted grid and each swap changes it by -2, 0 or 2).
+    """
+    return manhattan(flat, m, n) // 2
+
+
+def kendall_tau(flat, m, n):
+    """
+    Returns the Kendall-Tau distance between the flat state and the identity, i.e., the number of inversions
+    of the permutation, in O(mn log(mn)) (see generator.count_inversions).
+    """
+    return count_inversions(flat)
+
+
+def inversion_bound(flat, m, n):
+    """
+    Returns an admissible bound derived from the number of inversions: a horizontal swap changes it by 1,
+    a vertical swap exchanges two values n cells apart and changes it by at most 2n - 1.
+    """
+    step = 2*n - 1 if m > 1 else 1
+    return -(-kendall_tau(flat, m, n) // step)
+
+
+class Heuristic:
+    """
+    A heuristic given by a function h(flat, m, n). Its delta evaluates the child state from scratch.
+    """
+
+    def __init__(self, m, n, function=None):
+        self.m = m
+        self.n = n
+        self.function = function
+
+    def __call__(self, flat):
+        return self.function(flat, self.m, self.n)
+
+    def delta(self, flat, h, a, b):
+        child = list(flat)
+        child[a], child[b] = child[b], child[a]
+        return self(tuple(child))
+
+
+class ManhattanHeuristic(Heuristic):
+    """
+    Half of the summed Manhattan distances (see half_manhattan), updated in O(1) after a swap from a table
+    of the distance of each value to each cell.
+    """
+
+    def __init__(self, m, n):
+        super().__init__(m, n)
+        size = m*n
+        self.distances = [[0]*size] + [[abs(p//n - (v-1)//n) + abs(p%n - (v-1)%n) for p in range(size)]
+                                       for v in range(1, size + 1)]
+
+    def __call__(self, flat):
+        return half_manhattan(flat, self.m, self.n)
+
+    def delta(self, flat, h, a, b):
+        x, y = self.distances[flat[a]], self.distances[flat[b]]
+        return h + (x[b] + y[a] - x[a] - y[b]) // 2
+
+
+class InversionHeuristic(Heuristic):
+    """
+    The number of inversions divided by the largest change a single swap can make to it, 2n - 1 (1 for a
+    single line). The value is kept as an exact fraction of the inversion count so that it can be updated:
+    a horizontal swap changes the count by 1, a vertical swap by 1 plus twice the number of values, between
+    the two swapped cells, whose value lies between the two swapped values (O(n) instead of O((mn)^2)).
+    """
+
+    def __init__(self, m, n):
+        super().__init__(m, n)
+        self.step = 2*n - 1 if m > 1 else 1
+
+    def __call__(self, flat):
+        return kendall_tau(flat, self.m, self.n) / self.step
+
+    def delta(self, flat, h, a, b):
+        if a > b:
+            a, b = b, a
+        x, y = flat[a], flat[b]
+        low, high = min(x, y), max(x, y)
+        between = 0
+        for p in range(a+1, b):
+            if low < flat[p] < high:
+                between += 1
+        change = 1 + 2*between
+        inversions = round(h * self.step) + (change if x < y else -change)
+        return inversions / self.step
+
+
+HEURISTICS = {"manhattan": ManhattanHeuristic, "kendall": InversionHeuristic}
+
+
+def get_heuristic(heuristic, m, n):
+    """
+    Returns the heuristic for the m x n grids given by its name (a key of HEURISTICS, or "pdb" for the pattern 
+    database of the shape with the default groups, see pattern_db.PatternDatabase.for_shape), as a function
+    h(flat, m, n) or as an already built heuristic object (such as a pattern_db.PatternDatabase).
+    """
+    if isinstance(heuristic, Heuristic):
+        return heuristic
+    if heuristic == "pdb":
+        from pattern_db import PatternDatabase
+        return PatternDatabase.for_shape(m, n)
+    if callable(heuristic):
+        return Heuristic(m, n, heuristic)
+    try:
+        return HEURISTICS[heuristic](m, n)
+    except KeyError:
+        raise Exception(f"Unknown heuristic {heuristic!r}, expected one of {sorted(HEURISTICS)} or a function")
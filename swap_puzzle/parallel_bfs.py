@@ -0,0 +1,168 @@
+"""
+This is the parallel BFS module. It contains a level-synchronous BFS over the implicit graph of the m x n grids,
+whose nodes are the ranks of the states (see states.rank), parallelised over worker processes.
+
+The distances are stored in a numpy.uint8 array indexed by rank (UNSEEN for the states not reached yet), which is
+also the visited map. At each level, the frontier (an array of ranks) is split into chunks: each worker expands its
+chunk with vectorised operations (states.unrank_array, states.rank_array), removes the states already visited and
+the duplicates, and returns the rest. The distance array and the frontier live in shared memory, so they are not
+copied to the workers.
+"""
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from states import swap_table, rank_array, unrank_array, FACTORIALS, flatten, rank, neighbors
+
+UNSEEN = 255
+
+# largest number of cells of the shapes whose (mn)! states are enumerated (10! bytes = 3.6 MB, 11! = 40 MB, 16! = 20 TB)
+MAX_TABLE_CELLS = 10
+
+# distance arrays attached by a worker process, by shared memory name
+_attached = {}
+
+
+def check_shape(m, n):
+    """
+    Raises a ValueError if the (mn)! states of the m x n grids are too many to be enumerated (see MAX_TABLE_CELLS).
+    """
+    if m*n > MAX_TABLE_CELLS:
+        raise ValueError(f"The {m}x{n} grids have {FACTORIALS[m*n]} states, too many to be enumerated: "
+                         f"the distances of all the states are only computed up to {MAX_TABLE_CELLS} cells")
+
+
+def expand(ranks, distances, m, n):
+    """
+    Returns the sorted array of the ranks of the states one swap away from the states of the given ranks
+    that have not been visited yet (distances[rank] == UNSEEN), without duplicates.
+    """
+    size = m*n
+    if len(ranks) == 0:
+        return np.empty(0, dtype=np.int64)
+    states = unrank_array(ranks, size, size)
+    children = []
+    for a, b in swap_table(m, n):
+        child = states.copy()
+        child[:, [a, b]] = child[:, [b, a]]
+        child_ranks = rank_array(child, size)
+        children.append(child_ranks[distances[child_ranks] == UNSEEN])
+    return np.unique(np.concatenate(children))
+
+
+def _expand_chunk(distances_name, frontier_name, frontier_length, start, stop, m, n):
+    """
+    Task of a worker: expands the ranks frontier[start:stop] of the shared frontier. The distance array is
+    attached once per worker, the frontier (a new block at each level) is attached for the task only.
+    """
+    if distances_name not in _attached:
+        block = shared_memory.SharedMemory(name=distances_name)
+        _attached[distances_name] = (block, np.ndarray((FACTORIALS[m*n],), dtype=np.uint8, buffer=block.buf))
+    distances = _attached[distances_name][1]
+    frontier_block = shared_memory.SharedMemory(name=frontier_name)
+    try:
+        frontier = np.ndarray((frontier_length,), dtype=np.int64, buffer=frontier_block.buf)
+        chunk = frontier[start:stop].copy()
+        del frontier
+    finally:
+        frontier_block.close()
+    return expand(chunk, distances, m, n)
+
+
+def bfs_distances(m, n, source=None, target=None, workers=None, chunk_size=20000):
+    """
+    Computes the distances from the state source to all the states of the m x n grids by a level-synchronous BFS.
+
+    Parameters:
+    -----------
+    m, n: int
+        Shape of the grids. The (mn)! states must fit in memory: at most MAX_TABLE_CELLS cells (3x3 or 2x5),
+        a ValueError is raised otherwise.
+    source: int, optional
+        Rank of the source state (default: 0, the sorted grid).
+    target: int, optional
+        If given, the BFS stops after the level where the state of rank target is reached.
+    workers: int, optional
+        Number of worker processes (default: number of CPUs). With 1, everything is done in the current process.
+    chunk_size: int
+        Number of frontier states expanded by a worker task.
+
+    Output:
+    -------
+    distances: np.ndarray
+        A numpy.uint8 array of length (mn)! such that distances[r] is the number of swaps between source and the
+        state of rank r (UNSEEN if it was not reached).
+    """
+    check_shape(m, n)
+    total = FACTORIALS[m*n]
+    source = 0 if source is None else source
+    if workers is None:
+        workers = os.cpu_count() or 1
+    distances_block = shared_memory.SharedMemory(create=True, size=total)
+    try:
+        distances = np.ndarray((total,), dtype=np.uint8, buffer=distances_block.buf)
+        distances[:] = UNSEEN
+        distances[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while len(frontier) > 0 and (target is None or distances[target] == UNSEEN):
+                if executor is None or len(frontier) <= chunk_size:
+                    layer = expand(frontier, distances, m, n)
+                else:
+                    frontier_block = shared_memory.SharedMemory(create=True, size=frontier.nbytes)
+                    try:
+                        shared = np.ndarray(frontier.shape, dtype=np.int64, buffer=frontier_block.buf)
+                        shared[:] = frontier
+                        del shared
+                        futures = [executor.submit(_expand_chunk, distances_block.name, frontier_block.name,
+                                                   len(frontier), start, min(start + chunk_size, len(frontier)), m, n)
+                                   for start in range(0, len(frontier), chunk_size)]
+                        layer = np.unique(np.concatenate([future.result() for future in futures]))
+                    finally:
+                        frontier_block.close()
+                        frontier_block.unlink()
+                level += 1
+                layer = layer[distances[layer] == UNSEEN]
+                distances[layer] = level
+                frontier = layer
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        result = distances.copy()
+        del distances
+        return result
+    finally:
+        distances_block.close()
+        distances_block.unlink()
+
+
+def descent_path(distances, flat, m, n):
+    """
+    Returns a shortest sequence of flat states from flat to the source of distances (an array returned by 
+    bfs_distances, in which flat must have been reached): each step goes to a neighbor whose distance is 
+    smaller by one. Raises an exception if the distance of flat is unknown.
+    """
+    d = int(distances[rank(flat)])
+    if d == UNSEEN:
+        raise Exception("The state was not reached by the BFS")
+    path = [flat]
+    while d > 0:
+        for _, child in neighbors(path[-1], m, n):
+            if distances[rank(child)] == d - 1:
+                path.append(child)
+                d -= 1
+                break
+    return path
+
+
+def parallel_bfs_path(grid, workers=None):
+    """
+    Finds a shortest sequence of flat states from grid to the sorted grid: the distances from the sorted grid
+    are computed by bfs_distances until the level of grid, then the path descends them (see descent_path).
+    """
+    flat = flatten(grid.state)
+    distances = bfs_distances(grid.m, grid.n, target=rank(flat), workers=workers)
+    return descent_path(distances, flat, grid.m, grid.n)
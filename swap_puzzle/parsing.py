@@ -0,0 +1,135 @@
+"""
+This is the parsing module. It reads the .in grid and graph files in bulk into numpy arrays.
+
+The lines of a block are parsed at once with numpy.loadtxt instead of one int() per value, and a ragged or
+non-numeric block raises the same "Format incorrect" exception as before. With cache=True, the array is also
+saved in a binary sidecar file (the name of the file followed by .npy) at the first load, and the sidecar is
+memory-mapped by the next loads as long as it is more recent than the text file.
+"""
+import os
+from itertools import islice
+import numpy as np
+
+
+def _parse_block(lines, rows, columns):
+    """
+    Parses rows lines of columns integers into an array of shape (rows, columns).
+    Raises an exception if the lines are missing, ragged or not integers.
+    """
+    if rows == 0:
+        return np.empty((0, columns), dtype=np.int64)
+    try:
+        block = np.loadtxt(lines, dtype=np.int64, ndmin=2)
+    except ValueError:
+        raise Exception("Format incorrect")
+    if block.shape != (rows, columns):
+        raise Exception("Format incorrect")
+    return block
+
+
+def _read_header(file):
+    """
+    Reads the first non-empty line of file as two integers. Returns None at the end of the file.
+    """
+    for line in file:
+        fields = line.split()
+        if fields:
+            if len(fields) != 2:
+                raise Exception("Format incorrect")
+            return int(fields[0]), int(fields[1])
+    return None
+
+
+def sidecar_name(file_name):
+    """
+    Returns the name of the binary cache file of file_name.
+    """
+    return file_name + ".npy"
+
+
+def _cached(file_name, parse, cache):
+    """
+    Returns parse(file_name), or the memory-mapped sidecar if cache is True and the sidecar is up to date
+    (in which case it is written first if needed).
+    """
+    if not cache:
+        return parse(file_name)
+    sidecar = sidecar_name(file_name)
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(file_name):
+        return np.load(sidecar, mmap_mode="r")
+    np.save(sidecar, parse(file_name))
+    return np.load(sidecar, mmap_mode="r")
+
+
+def _parse_grid(file_name):
+    with open(file_name, "r") as file:
+        header = _read_header(file)
+        if header is None:
+            raise Exception("Format incorrect")
+        m, n = header
+        return _parse_block(list(islice(file, m)), m, n)
+
+
+def read_grid(file_name, cache=False):
+    """
+    Reads a grid file at the format of Grid.grid_from_file.
+
+    Parameters:
+    -----------
+    file_name: str
+        Name of the file to load.
+    cache: bool, optional
+        If True, the array is saved in (or memory-mapped from) the sidecar file, see the module docstring.
+
+    Output:
+    -------
+    state: np.ndarray
+        A numpy.int64 array of shape (m, n), read-only if it comes from the sidecar.
+    """
+    return _cached(file_name, _parse_grid, cache)
+
+
+def iter_grids(file_name):
+    """
+    Streams the grids of a file made of several grids at the format of Grid.grid_from_file, one after the other
+    (blank lines between them are allowed): yields the state of each grid as an array of shape (m, n),
+    reading only one grid at a time.
+    """
+    with open(file_name, "r") as file:
+        while True:
+            header = _read_header(file)
+            if header is None:
+                return
+            m, n = header
+            yield _parse_block(list(islice(file, m)), m, n)
+
+
+def _parse_graph(file_name):
+    with open(file_name, "r") as file:
+        header = _read_header(file)
+        if header is None:
+            raise Exception("Format incorrect")
+        n, m = header
+        edges = _parse_block(list(islice(file, m)), m, 2)
+    # the first line stores (n, m), so that the sidecar alone describes the graph
+    return np.concatenate((np.array([[n, m]], dtype=np.int64), edges))
+
+
+def read_graph(file_name, cache=False):
+    """
+    Reads a graph file at the format of Graph.graph_from_file.
+
+    Parameters:
+    -----------
+    file_name: str
+        Name of the file to load.
+    cache: bool, optional
+        If True, the array is saved in (or memory-mapped from) the sidecar file, see the module docstring.
+
+    Output:
+    -------
+    nb_nodes, edges: int, np.ndarray
+        The number of nodes and a numpy.int64 array of shape (nb_edges, 2), one edge per line.
+    """
+    table = _cached(file_name, _parse_graph, cache)
+    return int(table[0, 0]), table[1:]
@@ -0,0 +1,199 @@
+"""
+This is the pattern database module. It contains the PatternDatabase class, an additive admissible heuristic
+precomputed once per grid shape.
+
+The values 1, ..., mn are partitioned into disjoint groups. For each group, the abstract state of a grid is the
+sequence of the cells of the values of the group (the other values are indistinguishable), and a backward search
+from the sorted grid gives the distance of every abstract state. A swap of two values of the group costs 2 half-swaps
+in the abstraction of the group, a swap of a value of the group with another value costs 1: every real swap is thus
+charged at most 2 half-swaps over all the groups, and half of the sum of the distances of the groups is a lower bound
+of the number of swaps.
+
+The distances, in half-swaps, are stored in numpy.uint8 arrays indexed by the rank of the abstract state
+(see states.rank_array), saved as .npy files and memory-mapped when loaded.
+"""
+import os
+import numpy as np
+
+from heuristics import Heuristic
+from states import swap_table, rank_array, unrank_array, FACTORIALS
+
+UNKNOWN = 255
+
+_databases = {}
+
+
+def default_groups(m, n, max_states=2000000):
+    """
+    Returns the default partition of the values 1, ..., mn into groups of consecutive values of balanced sizes, 
+    with as few groups as possible while each group has at most max_states abstract states.
+    """
+    size = m*n
+    k = 1
+    while k < size and FACTORIALS[size] // FACTORIALS[size - k - 1] <= max_states:
+        k += 1
+    count = -(-size // k)
+    bounds = [1 + (size * i) // count for i in range(count + 1)]
+    return [tuple(range(bounds[i], bounds[i+1])) for i in range(count)]
+
+
+def build_table(m, n, group):
+    """
+    Computes the distances, in half-swaps, from the sorted m x n grid to every abstract state of group
+    (a tuple of values) by a backward search processing the abstract states by increasing distance.
+
+    Output:
+    -------
+    table: np.ndarray
+        A numpy.uint8 array such that table[rank] is the distance of the abstract state of rank rank.
+    """
+    size, k = m*n, len(group)
+    table = np.full(FACTORIALS[size] // FACTORIALS[size - k], UNKNOWN, dtype=np.uint8)
+    goal = np.array([[value - 1 for value in group]])
+    table[rank_array(goal, size)] = 0
+    swaps = swap_table(m, n)
+    distance = 0
+    frontier = rank_array(goal, size)
+    while True:
+        positions = unrank_array(frontier, size, k)
+        for a, b in swaps:
+            at_a, at_b = positions == a, positions == b
+            has_a, has_b = at_a.any(axis=1), at_b.any(axis=1)
+            moved = has_a | has_b
+            if not moved.any():
+                continue
+            children = positions[moved].copy()
+            children[at_a[moved]] = b
+            children[at_b[moved]] = a
+            costs = np.where(has_a[moved] & has_b[moved], 2, 1)
+            ranks = rank_array(children, size)
+            # unbuffered minimum, so that the smallest distance wins among duplicated ranks
+            np.minimum.at(table, ranks, (distance + costs).astype(np.uint8))
+        distance += 1
+        frontier = np.flatnonzero(table == distance)
+        if len(frontier) == 0 and not (table == distance + 1).any():
+            break
+    return table
+
+
+class PatternDatabase(Heuristic):
+    """
+    An additive pattern database heuristic for the m x n grids, see the module docstring.
+
+    Attributes:
+    -----------
+    m, n: int
+        Shape of the grids.
+    groups: list[tuple[int]]
+        The disjoint groups of values, which cover 1, ..., mn.
+    tables: list[np.ndarray]
+        For each group, the numpy.uint8 array of the distances (in half-swaps) indexed by abstract state rank.
+    """
+
+    def __init__(self, m, n, groups, tables):
+        super().__init__(m, n)
+        self.groups = [tuple(group) for group in groups]
+        self.tables = tables
+        self.owner = [None] * (m*n + 1)
+        for index, group in enumerate(self.groups):
+            for value in group:
+                self.owner[value] = index
+
+    @classmethod
+    def build(cls, m, n, groups=None, max_states=2000000):
+        """
+        Builds the pattern database of the m x n grids for the given groups (default_groups by default).
+        """
+        if groups is None:
+            groups = default_groups(m, n, max_states)
+        return cls(m, n, groups, [build_table(m, n, group) for group in groups])
+
+    @staticmethod
+    def file_name(directory, m, n, group):
+        """
+        Returns the name of the .npy file of the table of group for the m x n grids.
+        """
+        return os.path.join(directory, f"pdb_{m}x{n}_{'-'.join(map(str, group))}.npy")
+
+    def save(self, directory):
+        """
+        Saves the tables as .npy files in directory (created if needed).
+        """
+        os.makedirs(directory, exist_ok=True)
+        for group, table in zip(self.groups, self.tables):
+            np.save(self.file_name(directory, self.m, self.n, group), table)
+
+    @classmethod
+    def load(cls, directory, m, n, groups=None, max_states=2000000):
+        """
+        Loads the pattern database saved in directory, memory-mapping the tables.
+        Raises an exception if a table is missing.
+        """
+        if groups is None:
+            groups = default_groups(m, n, max_states)
+        tables = []
+        for group in groups:
+            name = cls.file_name(directory, m, n, group)
+            if not os.path.exists(name):
+                raise Exception(f"Missing pattern database table {name}")
+            tables.append(np.load(name, mmap_mode="r"))
+        return cls(m, n, groups, tables)
+
+    @classmethod
+    def load_or_build(cls, directory, m, n, groups=None, max_states=2000000):
+        """
+        Loads the pattern database saved in directory, or builds and saves it if it does not exist yet,
+        so that the precomputation is paid once per grid shape.
+        """
+        try:
+            return cls.load(directory, m, n, groups, max_states)
+        except Exception:
+            pdb = cls.build(m, n, groups, max_states)
+            pdb.save(directory)
+            return cls.load(directory, m, n, pdb.groups)
+
+    @classmethod
+    def for_shape(cls, m, n):
+        """
+        Returns the pattern database of the m x n grids with the default groups, built at the first call 
+        and then kept in memory.
+        """
+        if (m, n) not in _databases:
+            _databases[(m, n)] = cls.build(m, n)
+        return _databases[(m, n)]
+
+    def group_distance(self, index, positions):
+        """
+        Returns the distance, in half-swaps, of the abstract state of the group of the given index,
+        positions[v] being the flat index of the cell of the value v.
+        """
+        group = self.groups[index]
+        size = self.m*self.n
+        r = 0
+        used = []
+        for i, value in enumerate(group):
+            p = positions[value]
+            r = r * (size - i) + p - sum(1 for q in used if q < p)
+            used.append(p)
+        return int(self.tables[index][r])
+
+    def _positions(self, flat):
+        positions = [0] * (len(flat) + 1)
+        for p, value in enumerate(flat):
+            positions[value] = p
+        return positions
+
+    def __call__(self, flat):
+        positions = self._positions(flat)
+        return sum(self.group_distance(index, positions) for index in range(len(self.groups))) / 2
+
+    def delta(self, flat, h, a, b):
+        """
+        Only the groups of the two swapped values change: their distances are computed before and after the swap.
+        """
+        positions = self._positions(flat)
+        indices = {self.owner[flat[a]], self.owner[flat[b]]}
+        before = sum(self.group_distance(index, positions) for index in indices)
+        positions[flat[a]], positions[flat[b]] = b, a
+        after = sum(self.group_distance(index, positions) for index in indices)
+        return h + (after - before) / 2
@@ -0,0 +1,489 @@
+"""
+This is the search module. It contains the generic search engines shared by the Graph, Grid and Solver classes.
+
+The engines work on implicit graphs: nodes can be of any hashable type and the graph is only known through a
+function returning the neighbors of a node. They never need the whole set of nodes in memory.
+Each engine takes an optional stats.SearchStats object (stats=None disables the instrumentation).
+"""
+import time
+from collections import deque
+import heapq as hq
+
+
+def rebuild_path(parents, node):
+    """
+    Rebuilds the path from the root of a parent map to node.
+
+    Parameters:
+    -----------
+    parents: dict
+        A dictionnary such that parents[v] is the node from which v was reached (None for the root).
+    node: NodeType
+        The last node of the path.
+
+    Output:
+    -------
+    path: list[NodeType]
+        The path [root, ..., node].
+    """
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
+
+
+def bfs(src, dst, neighbors, max_depth=None, max_nodes=None, stats=None):
+    """
+    Finds a shortest path from src to dst by BFS on the graph defined by the function neighbors.
+    The frontier is a deque and visited nodes are stored in a parent map, the path is rebuilt at the end.
+
+    Parameters:
+    -----------
+    src: NodeType
+        The source node.
+    dst: NodeType
+        The destination node.
+    neighbors: function
+        neighbors(node) returns an iterable over the neighbors of node.
+    max_depth: int, optional
+        If given, only the paths with at most max_depth edges are explored.
+    max_nodes: int, optional
+        If given, the search gives up once more than max_nodes nodes have been visited.
+    stats: stats.SearchStats, optional
+        If given, it is filled with the statistics of the search.
+
+    Output:
+    -------
+    path: list[NodeType] | None
+        A shortest path [src, ..., dst]. Returns None if dst is not reachable from src within the budget.
+    """
+    if src == dst:
+        return [src]
+    if stats is not None:
+        stats.start()
+        neighbors = stats.wrap_neighbors(neighbors)
+    parents = {src: None}
+    frontier = deque([src])
+    depth = 0
+    try:
+        while frontier:
+            if max_depth is not None and depth >= max_depth:
+                return None
+            depth += 1
+            for _ in range(len(frontier)):
+                node = frontier.popleft()
+                if stats is not None:
+                    stats.expand(len(frontier) + 1, len(parents))
+                for neighbor in neighbors(node):
+                    if neighbor in parents:
+                        if stats is not None:
+                            stats.duplicates += 1
+                        continue
+                    parents[neighbor] = node
+                    if neighbor == dst:
+                        return rebuild_path(parents, neighbor)
+                    if max_nodes is not None and len(parents) > max_nodes:
+                        return None
+                    frontier.append(neighbor)
+        return None
+    finally:
+        if stats is not None:
+            stats.stop()
+
+
+def bfs_tree(src, neighbors):
+    """
+    Computes the BFS tree of src on the graph defined by the function neighbors, i.e., the parent map of all the 
+    nodes reachable from src, in which rebuild_path gives a shortest path from src to any of them.
+
+    Parameters:
+    -----------
+    src: NodeType
+        The root of the tree.
+    neighbors: function
+        neighbors(node) returns an iterable over the neighbors of node.
+
+    Output:
+    -------
+    parents: dict
+        The parent map (parents[src] is None), see rebuild_path.
+    """
+    parents = {src: None}
+    frontier = deque([src])
+    while frontier:
+        node = frontier.popleft()
+        for neighbor in neighbors(node):
+            if neighbor not in parents:
+                parents[neighbor] = node
+                frontier.append(neighbor)
+    return parents
+
+
+def bidirectional_bfs(src, dst, neighbors, max_nodes=None, stats=None):
+    """
+    Finds a shortest path from src to dst on an undirected graph by two BFS, one from src and one from dst, 
+    that meet in the middle. Each step expands a whole layer of the smaller frontier. When the two searches meet, 
+    the layer is finished and the shortest of the paths found through a meeting node is returned.
+
+    Parameters:
+    -----------
+    src: NodeType
+        The source node.
+    dst: NodeType
+        The destination node.
+    neighbors: function
+        neighbors(node) returns an iterable over the neighbors of node. The graph must be undirected.
+    max_nodes: int, optional
+        If given, the search gives up once more than max_nodes nodes have been visited by the two searches.
+    stats: stats.SearchStats, optional
+        If given, it is filled with the statistics of the search (the open set is the two frontiers).
+
+    Output:
+    -------
+    path: list[NodeType] | None
+        A shortest path [src, ..., dst]. Returns None if dst is not reachable from src within the budget.
+    """
+    if src == dst:
+        return [src]
+    if stats is not None:
+        stats.start()
+        neighbors = stats.wrap_neighbors(neighbors)
+    parents = ({src: None}, {dst: None})
+    depths = ({src: 0}, {dst: 0})
+    frontiers = ([src], [dst])
+    try:
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own_parents, other_parents = parents[side], parents[1-side]
+            own_depths, other_depths = depths[side], depths[1-side]
+            best, meeting = None, None
+            layer = []
+            for node in frontiers[side]:
+                if stats is not None:
+                    stats.expand(len(frontiers[0]) + len(frontiers[1]) + len(layer), len(parents[0]) + len(parents[1]))
+                depth = own_depths[node] + 1
+                for neighbor in neighbors(node):
+                    if neighbor in own_parents:
+                        if stats is not None:
+                            stats.duplicates += 1
+                        continue
+                    own_parents[neighbor] = node
+                    own_depths[neighbor] = depth
+                    layer.append(neighbor)
+                    if neighbor in other_parents:
+                        length = depth + other_depths[neighbor]
+                        if best is None or length < best:
+                            best, meeting = length, neighbor
+            if meeting is not None:
+                forward = rebuild_path(parents[0], meeting)
+                backward = rebuild_path(parents[1], meeting)
+                backward.reverse()
+                return forward + backward[1:]
+            if max_nodes is not None and len(parents[0]) + len(parents[1]) > max_nodes:
+                return None
+            frontiers = (layer, frontiers[1]) if side == 0 else (frontiers[0], layer)
+        return None
+    finally:
+        if stats is not None:
+            stats.stop()
+
+
+def astar(src, dst, successors, h_src, closed=True, max_nodes=None, stats=None):
+    """
+    Finds a shortest path from src to dst with the A* algorithm. All the edges have cost 1.
+    The open set is a binary heap of entries (f, h, tie-break, node, g) with f = g + h: among nodes of equal f, the 
+    deepest one (lowest h) is expanded first, then the oldest one. Entries made obsolete by a better path are not 
+    removed from the heap but skipped when popped (lazy deletion).
+
+    Parameters:
+    -----------
+    src: NodeType
+        The source node.
+    dst: NodeType
+        The destination node.
+    successors: function
+        successors(node, h) returns an iterable over the pairs (neighbor, h(neighbor)), where h is the heuristic 
+        value of node (which allows incremental heuristics).
+    h_src: int | float
+        The heuristic value of src.
+    closed: bool, optional
+        If True (default), expanded nodes are kept in a closed set. A closed node is reopened when a shorter path 
+        to it is found, so the path stays optimal for admissible but inconsistent heuristics.
+    max_nodes: int, optional
+        If given, the search gives up after max_nodes expansions.
+    stats: stats.SearchStats, optional
+        If given, it is filled with the detailed statistics of the search.
+
+    Output:
+    -------
+    path, stats: list[NodeType] | None, dict
+        A path [src, ..., dst] (a shortest one if the heuristic is admissible), or None if dst was not reached, 
+        and the statistics of the search: the numbers of "expanded" and "generated" nodes, the peak number 
+        "max_open" of nodes in the open set (stale heap entries excluded) and the number "reopened" of closed 
+        nodes expanded again.
+    """
+    if stats is not None:
+        stats.start()
+        successors = stats.wrap_neighbors(successors)
+    g = {src: 0}
+    parents = {src: None}
+    closed_set = set()
+    open_set = {src}
+    heap = [(h_src, h_src, 0, src, 0)]
+    count = 0
+    expanded = 0
+    reopened = 0
+    max_open = 1
+    path = None
+    while heap:
+        _, h, _, node, g_entry = hq.heappop(heap)
+        if g_entry > g[node]:
+            continue
+        open_set.discard(node)
+        if node == dst:
+            path = rebuild_path(parents, node)
+            break
+        if max_nodes is not None and expanded >= max_nodes:
+            break
+        if closed:
+            closed_set.add(node)
+        if stats is not None:
+            stats.expand(len(open_set) + 1, len(closed_set))
+        expanded += 1
+        g_child = g_entry + 1
+        for child, h_child in successors(node, h):
+            if g_child < g.get(child, g_child + 1):
+                g[child] = g_child
+                parents[child] = node
+                if child in closed_set:
+                    closed_set.remove(child)
+                    reopened += 1
+                open_set.add(child)
+                count += 1
+                hq.heappush(heap, (g_child + h_child, h_child, count, child, g_child))
+            elif stats is not None:
+                stats.duplicates += 1
+        if len(open_set) > max_open:
+            max_open = len(open_set)
+    if stats is not None:
+        stats.reopened += reopened
+        stats.stop()
+    return path, {"expanded": expanded, "generated": count, "max_open": max_open, "reopened": reopened}
+
+
+def idastar(src, dst, successors, h_src, tt_size=1000000, max_nodes=None, stats=None):
+    """
+    Finds a shortest path from src to dst with the IDA* algorithm (iterative deepening A*). All the edges have cost 1.
+    Each iteration is a depth-first search that cuts the paths whose f = g + h exceeds a threshold; the next threshold 
+    is the smallest f that was cut. The memory used is proportional to the depth of the solution, plus a 
+    transposition table of bounded size.
+
+    Parameters:
+    -----------
+    src: NodeType
+        The source node.
+    dst: NodeType
+        The destination node.
+    successors: function
+        successors(node, h) returns an iterable over the pairs (neighbor, h(neighbor)), see astar.
+    h_src: int | float
+        The heuristic value of src.
+    tt_size: int, optional
+        Maximum number of entries of the transposition table, which stores the smallest depth at which each node 
+        was reached during the current iteration, so that the subtrees already explored from a lower depth are not 
+        explored again. When it is full, new nodes are no longer recorded. 0 disables it.
+    max_nodes: int, optional
+        If given, the search gives up after max_nodes expansions.
+    stats: stats.SearchStats, optional
+        If given, it is filled with the detailed statistics of the search (the open set is the current path, 
+        the closed set the transposition table).
+
+    Output:
+    -------
+    path, stats: list[NodeType] | None, dict
+        A path [src, ..., dst] (a shortest one if the heuristic is admissible), or None if dst was not reached, 
+        and the statistics of the search: the numbers of "expanded" nodes and of "iterations" and the last 
+        "threshold".
+    """
+    if stats is not None:
+        stats.start()
+        successors = stats.wrap_neighbors(successors)
+    path = [src]
+    table = {}
+    expanded = 0
+    iterations = 0
+
+    def dfs(node, g, h, threshold):
+        """
+        Explores the subtree of node, the last node of path, reached at depth g. Returns True when dst is found, 
+        otherwise the smallest f that exceeded threshold (None if there is none).
+        """
+        nonlocal expanded
+        f = g + h
+        if f > threshold:
+            return f
+        if node == dst:
+            return True
+        if max_nodes is not None and expanded >= max_nodes:
+            return None
+        expanded += 1
+        if stats is not None:
+            stats.expand(len(path), len(table))
+        previous = path[-2] if len(path) > 1 else None
+        smallest = None
+        for child, h_child in successors(node, h):
+            # the swap that undoes the previous one leads back to the parent
+            if child == previous:
+                continue
+            if child in table:
+                if table[child] <= g + 1:
+                    if stats is not None:
+                        stats.duplicates += 1
+                    continue
+                table[child] = g + 1
+            elif len(table) < tt_size:
+                table[child] = g + 1
+            path.append(child)
+            result = dfs(child, g + 1, h_child, threshold)
+            if result is True:
+                return True
+            path.pop()
+            if result is not None and (smallest is None or result < smallest):
+                smallest = result
+        return smallest
+
+    threshold = h_src
+    found = False
+    while threshold is not None:
+        iterations += 1
+        table.clear()
+        table[src] = 0
+        result = dfs(src, 0, h_src, threshold)
+        if result is True:
+            found = True
+            break
+        if max_nodes is not None and expanded >= max_nodes:
+            break
+        threshold = result
+    if stats is not None:
+        stats.stop()
+    return path if found else None, {"expanded": expanded, "iterations": iterations, "threshold": threshold}
+
+
+def ara_star(src, dst, successors, h_src, weights=(3, 2, 1.5, 1.25, 1), time_budget=None, max_nodes=None, stats=None):
+    """
+    Anytime search with the ARA* algorithm (anytime repairing A*). All the edges have cost 1.
+    A first path is found quickly by a weighted A* whose open set is ordered by g + w h with a large weight w. 
+    The weight is then decreased step by step, and each search reuses the previous one: its open set is reordered 
+    with the new weight and the nodes whose g improved after they were expanded (the inconsistent nodes) are added 
+    to it, so only the part of the graph affected by the smaller weight is expanded again. After each search, the 
+    cost of the best path is at most bound times the optimal cost, where bound is min(w, cost / min(g + h)) over 
+    the open and inconsistent nodes. The search stops when the last weight is done (bound 1 with weight 1 and an 
+    admissible and consistent heuristic) or when a budget is exhausted, and returns the best path found so far.
+
+    Parameters:
+    -----------
+    src: NodeType
+        The source node.
+    dst: NodeType
+        The destination node.
+    successors: function
+        successors(node, h) returns an iterable over the pairs (neighbor, h(neighbor)), see astar.
+    h_src: int | float
+        The heuristic value of src.
+    weights: tuple[float]
+        The decreasing weights of the successive searches.
+    time_budget: float, optional
+        If given, the search stops after time_budget seconds.
+    max_nodes: int, optional
+        If given, the search stops after max_nodes expansions in total.
+    stats: stats.SearchStats, optional
+        If given, it is filled with the detailed statistics of the search.
+
+    Output:
+    -------
+    path, stats: list[NodeType] | None, dict
+        The best path [src, ..., dst] found (None if none was found within the budget) and the statistics of the 
+        search: the numbers of "expanded" and "generated" nodes, the "weight" of the last finished search, the 
+        suboptimality "bound" of the path (None without a path), the number of finished "searches" and whether the 
+        search stopped on a budget ("interrupted").
+    """
+    if stats is not None:
+        stats.start()
+        successors = stats.wrap_neighbors(successors)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    g = {src: 0}
+    h = {src: h_src}
+    parents = {src: None}
+    closed_set = set()
+    inconsistent = set()
+    open_set = {src}
+    count = 0
+    generated = 0
+    expanded = 0
+    best, bound, weight = None, None, None
+    searches = 0
+    interrupted = False
+    inf = float("inf")
+    for w in weights:
+        if deadline is not None and time.perf_counter() > deadline:
+            interrupted = True
+            break
+        # the open set, ordered by the new weight, with the nodes that became inconsistent
+        open_set |= inconsistent
+        inconsistent = set()
+        closed_set = set()
+        heap = []
+        for node in open_set:
+            count += 1
+            heap.append((g[node] + w * h[node], h[node], count, node, g[node]))
+        hq.heapify(heap)
+        while heap and g.get(dst, inf) > heap[0][0]:
+            _, h_node, _, node, g_entry = hq.heappop(heap)
+            if g_entry > g[node] or node in closed_set:
+                continue
+            if (max_nodes is not None and expanded >= max_nodes) or \
+                    (deadline is not None and expanded % 16 == 0 and time.perf_counter() > deadline):
+                interrupted = True
+                break
+            open_set.discard(node)
+            closed_set.add(node)
+            expanded += 1
+            if stats is not None:
+                stats.expand(len(open_set) + 1, len(closed_set))
+            g_child = g_entry + 1
+            for child, h_child in successors(node, h_node):
+                if g_child < g.get(child, inf):
+                    g[child] = g_child
+                    h[child] = h_child
+                    parents[child] = node
+                    if child in closed_set:
+                        inconsistent.add(child)
+                    else:
+                        open_set.add(child)
+                        count += 1
+                        generated += 1
+                        hq.heappush(heap, (g_child + w * h_child, h_child, count, child, g_child))
+                elif stats is not None:
+                    stats.duplicates += 1
+        if interrupted:
+            # a better path found by the interrupted search: since the optimal cost is at least cost / bound for 
+            # the previous path, the bound scales with the cost
+            if best is not None and g[dst] < len(best) - 1:
+                bound = max(1, bound * g[dst] / (len(best) - 1))
+                best = rebuild_path(parents, dst)
+            break
+        searches += 1
+        weight = w
+        if dst in g:
+            best = rebuild_path(parents, dst)
+            lower = min((g[node] + h[node] for node in open_set | inconsistent), default=inf)
+            bound = 1 if lower >= g[dst] else min(w, g[dst] / lower) if lower > 0 else w
+        if bound == 1:
+            break
+    if stats is not None:
+        stats.stop()
+    return best, {"expanded": expanded, "generated": generated, "weight": weight, "bound": bound, "searches": searches,
+                  "interrupted": interrupted}
@@ -0,0 +1,401 @@
+"""
+This is the service module. It serves the solvers over a local socket (TCP or Unix), with the standard library only.
+
+The protocol is JSON lines: each line sent by a client is a request, each line sent back is the response to one of
+them, with the same "id" (the responses of a connection come in the order in which the solves finish).
+    {"id": 1, "grid": [[2, 1], [3, 4]], "solver": "astar", "heuristic": "manhattan", "timeout": 5, "options": {}}
+    {"id": 1, "swaps": [[[0, 0], [0, 1]]], "length": 1, "error": null, "stats": {...}, "time": 0.001, ...}
+    {"id": 2, "op": "stats"}
+Only "grid" is required. The error of a response is None, "timeout", "busy" or the error message.
+
+The searches run in a pool of worker processes (see batch.solve_state). The service:
+    - coalesces the identical requests in flight (same grid, solver, heuristic and options): they wait for the
+      same computation, which is only queued once;
+    - enforces a deadline per request: a request that is not answered in time gets the error "timeout", and
+      a computation no request waits for any more is dropped from the queue, or stopped in its worker by the
+      SIGALRM timer of batch.solve_state, set to the latest deadline of the requests waiting for it when it starts;
+    - applies backpressure: at most queue_size computations wait for a worker, the others are rejected at once
+      with the error "busy";
+    - reports its queue depth and the percentiles of its latencies (see SolveService.stats).
+
+Usage from the command line:
+    python swap_puzzle/service.py --port 8765 --workers 4 --queue-size 64
+    python swap_puzzle/service.py --unix /tmp/swap_puzzle.sock
+"""
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from batch import SOLVERS, solve_state
+from states import flatten
+
+# maximum length of a request line, in bytes
+LINE_LIMIT = 1 << 22
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """
+    Returns the percentiles of the values (nearest rank) as a dictionnary {"p50": ..., "p90": ..., "p99": ...,
+    "max": ...}, with None values if there are no values.
+    """
+    values = sorted(values)
+    result = {}
+    for point in points:
+        result[f"p{point}"] = values[max(0, -(-len(values) * point // 100) - 1)] if values else None
+    result["max"] = values[-1] if values else None
+    return result
+
+
+class _Job:
+    """
+    A computation and the requests that wait for it.
+    """
+
+    def __init__(self, key, m, n, flat, solver, heuristic, options, deadline):
+        self.key = key
+        self.m, self.n, self.flat = m, n, flat
+        self.solver, self.heuristic, self.options = solver, heuristic, options
+        self.deadline = deadline
+        self.waiters = 0
+        self.started = False
+        self.cancelled = False
+        self.future = asyncio.get_running_loop().create_future()
+
+
+class SolveService:
+    """
+    An asyncio service solving grids in a pool of worker processes (see the module docstring).
+
+    Attributes:
+    -----------
+    workers: int
+        Number of worker processes (default: number of CPUs).
+    queue_size: int
+        Maximum number of computations waiting for a worker.
+    solver, heuristic: str
+        Default solver (a key of batch.SOLVERS) and heuristic of the requests.
+    timeout: float
+        Default deadline of the requests, in seconds.
+    max_timeout: float
+        Largest deadline accepted from a request, in seconds.
+    requests, completed, rejected, timeouts, coalesced, errors: int
+        Counters of the requests: received, answered with a solution, rejected ("busy"), timed out, coalesced with
+        a computation in flight, and answered with another error.
+    """
+
+    def __init__(self, workers=None, queue_size=64, solver="astar", heuristic="manhattan", timeout=10.0,
+                 max_timeout=60.0, window=10000):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.solver = solver
+        self.heuristic = heuristic
+        self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.requests = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.running = 0
+        self._latencies = deque(maxlen=window)
+        self._jobs = {}
+        self._queue = None
+        self._executor = None
+        self._dispatchers = []
+        self._server = None
+
+    def __repr__(self):
+        return f"<service.SolveService: workers={self.workers}, queue_size={self.queue_size}>"
+
+    async def start(self):
+        """
+        Starts the worker processes and the tasks that feed them.
+        """
+        self._queue = asyncio.Queue(self.queue_size)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._dispatchers = [asyncio.ensure_future(self._dispatch()) for _ in range(self.workers)]
+
+    async def listen(self, host="127.0.0.1", port=0, path=None):
+        """
+        Starts the service (if needed) and accepts the connections on the Unix socket path if it is given,
+        on (host, port) otherwise (port 0: any free port). Returns the address listened to.
+        """
+        if self._queue is None:
+            await self.start()
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=LINE_LIMIT)
+            return path
+        self._server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """
+        Stops accepting connections, cancels the requests in flight and stops the worker processes.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        for job in self._jobs.values():
+            job.future.cancel()
+        self._jobs = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._queue = None
+
+    def stats(self):
+        """
+        Returns the statistics of the service: the counters of the requests (see the class docstring), the
+        "queue_depth" (computations waiting for a worker), the computations "running" and "in_flight" (queued or
+        running), and the percentiles of the "latency" (seconds) of the last requests answered.
+        """
+        return {"requests": self.requests, "completed": self.completed, "rejected": self.rejected,
+                "timeouts": self.timeouts, "coalesced": self.coalesced, "errors": self.errors,
+                "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+                "running": self.running, "in_flight": len(self._jobs), "latency": percentiles(self._latencies)}
+
+    async def solve(self, grid, solver=None, heuristic=None, timeout=None, options=None):
+        """
+        Solves the grid (a list of lines) in a worker process and returns the result as batch.solve_state, with
+        the additional keys "coalesced" (whether the request joined a computation in flight) and "latency"
+        (seconds). The error is "busy" if the queue is full and "timeout" if the deadline (timeout seconds,
+        default: the timeout of the service, at most max_timeout) passed.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.requests += 1
+        solver = self.solver if solver is None else solver
+        heuristic = self.heuristic if heuristic is None else heuristic
+        options = {} if options is None else options
+        timeout = self.timeout if timeout is None else timeout
+        result = {"swaps": None, "length": None, "stats": None, "error": None, "coalesced": False}
+        try:
+            if not isinstance(solver, str) or solver not in SOLVERS:
+                raise Exception(f"Unknown solver {solver!r}, expected one of {sorted(SOLVERS)}")
+            if not isinstance(heuristic, str):
+                raise Exception(f"The heuristic must be a name, not {heuristic!r}")
+            if not isinstance(options, dict):
+                raise Exception(f"The options must be an object, not {options!r}")
+            if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not timeout > 0:
+                raise Exception(f"The timeout must be a positive number of seconds, not {timeout!r}")
+            timeout = min(timeout, self.max_timeout)
+            m, n = len(grid), len(grid[0]) if grid else 0
+            if m*n == 0:
+                raise Exception("The grid is empty")
+            flat = flatten(grid)
+            if any(len(line) != n for line in grid) or sorted(flat) != list(range(1, m*n + 1)):
+                raise Exception("The grid must contain the values 1, ..., mn once each, on lines of equal lengths")
+            key = (solver, heuristic if SOLVERS[solver][2] else None, m, n, flat, json.dumps(options, sort_keys=True))
+            job = self._jobs.get(key)
+        except Exception as error:
+            self.errors += 1
+            result["error"] = f"{type(error).__name__}: {error}"
+            return result
+        if job is not None:
+            self.coalesced += 1
+            result["coalesced"] = True
+        else:
+            job = _Job(key, m, n, flat, solver, heuristic, options, start + timeout)
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self.rejected += 1
+                result["error"] = "busy"
+                return result
+            self._jobs[key] = job
+        job.waiters += 1
+        job.deadline = max(job.deadline, start + timeout)
+        try:
+            result.update(await asyncio.wait_for(asyncio.shield(job.future), timeout))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            result["error"] = "timeout"
+        finally:
+            job.waiters -= 1
+            # a queued computation no request waits for is dropped (a running one stops at its own deadline)
+            if job.waiters == 0 and not job.started:
+                job.cancelled = True
+                if self._jobs.get(key) is job:
+                    del self._jobs[key]
+        if result["error"] is None:
+            self.completed += 1
+        elif result["error"] != "timeout":
+            self.errors += 1
+        result["latency"] = loop.time() - start
+        self._latencies.append(result["latency"])
+        return result
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            if job.cancelled:
+                continue
+            job.started = True
+            self.running += 1
+            try:
+                call = functools.partial(solve_state, job.m, job.n, job.flat, job.solver,
+                                         max(job.deadline - loop.time(), 0.001), job.heuristic, **job.options)
+                output = await loop.run_in_executor(self._executor, call)
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as error:
+                output = {"error": f"{type(error).__name__}: {error}"}
+            finally:
+                self.running -= 1
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+            if not job.future.done():
+                job.future.set_result(output)
+
+    async def _respond(self, line, writer, lock):
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise Exception("A request must be a JSON object")
+        except Exception as error:
+            self.errors += 1
+            response = {"id": None, "error": f"{type(error).__name__}: {error}"}
+        else:
+            if message.get("op") == "stats":
+                response = self.stats()
+            else:
+                response = await self.solve(message.get("grid"), message.get("solver"),
+                                            message.get("heuristic"), message.get("timeout"), message.get("options"))
+            response["id"] = message.get("id")
+        async with lock:
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+
+    async def _handle(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            # a client that leaves cancels its requests
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+class Client:
+    """
+    A client of the service over one connection, which can send many requests concurrently (e.g. for load tests).
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._pending = {}
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=None, path=None):
+        """
+        Connects to the service listening on the Unix socket path if it is given, on (host, port) otherwise.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The connection to the service was closed"))
+
+    async def call(self, message):
+        """
+        Sends the request message (a dictionnary, whose "id" is set) and returns the response.
+        """
+        message = dict(message, id=next(self._ids))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = future
+        self._writer.write((json.dumps(message) + "\n").encode())
+        await self._writer.drain()
+        return await future
+
+    async def solve(self, grid, **fields):
+        """
+        Requests the solution of the grid, with the other fields of the request (solver, heuristic, timeout, options).
+        """
+        return await self.call(dict(fields, grid=grid))
+
+    async def stats(self):
+        """
+        Returns the statistics of the service.
+        """
+        return await self.call({"op": "stats"})
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._listener.cancel()
+
+
+async def _serve(args):
+    service = SolveService(args.workers, args.queue_size, args.solver, args.heuristic, args.timeout, args.max_timeout)
+    address = await service.listen(args.host, args.port, args.unix)
+    print(f"Listening on {address}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Serves the swap puzzle solvers as JSON lines over a socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Unix socket path (instead of TCP)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--solver", default="astar", choices=sorted(SOLVERS))
+    parser.add_argument("--heuristic", default="manhattan")
+    parser.add_argument("--timeout", type=float, default=10.0, help="default deadline of a request, in seconds")
+    parser.add_argument("--max-timeout", type=float, default=60.0)
+    args = parser.parse_args(arguments)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,83 @@
+import time
+
 from grid import Grid
+from states import swaps_from_path, flatten
+from parallel_bfs import parallel_bfs_path
+from distance_table import DistanceTable
+from divide import divide_solve
+from cache import cached
 
 class Solver(Grid): 
     """
-    A solver class, to be implemented.
+    A solver class: a grid with methods that compute sequences of swaps sorting it. 
+    get_solution and get_solution2 sort the grid in place, the search methods (get_solution_bfs, ...) leave it unchanged.
+
+    If the attribute cache is a cache.SolutionCache (on the class or on an instance), every get_solution method 
+    first looks the grid up in it, and stores its solution there, see cache.cached.
     """
+    cache = None
 
+    @cached(in_place=True)
     def get_solution(self):  # Question 3
         """
         Solves the grid and returns the sequence of swaps at the format 
-        [((i1, j1), (i2, j2)), ((i1', j1'), (i2', j2')), ...]. 
+        [((i1, j1), (i2, j2)), ((i1', j1'), (i2', j2')), ...]. The grid is sorted in place.
+
+        The values 1, ..., mn are placed one after the other: the value x, whose target cell is (i, j), is first 
+        moved along its line to the column j, then up along the column j to the line i. Since the cells before 
+        (i, j) are already placed, the value is always below the line i, or on the line i at the right of (i, j), 
+        so these moves never disturb the placed values. A position index (value -> cell), updated at each swap, 
+        replaces the search of each value in the whole grid: the complexity is O(mn(m+n)), which is also 
+        a bound on the number of swaps. The solution is not optimal but it is fast for very large grids.
         """
         n = self.n
         m = self.m
         grille = self.state
-        def research(x,grille):
-            for k in range (m):
-                for l in range (n):
-                    if grille[k][l] == x+1 :
-                        return (k,l)
-
-        def relocate(x):
-            (k,l) = research(x,grille)
-            i = x//n
-            j = x - n*i
-            if k<i :
-                for a in range(i-k):
-                    self.swap((k+a+1,l),(k+a,l))
-            elif k>i :
-                for a in range(k-i, -1):
-                    self.swap((k+a+1,l),(k+a,l))
-            if l<j : 
-                for b in range(j-l):
-                    self.swap((i,l+b+1),(i,l+b))
-            if l>j : 
-                for b in range(l-j, -1):
-                    self.swap((i,l+b+1),(i,l+b))
-
-        for x in range (n*m):
-            relocate(x)
+        position = [None] * (m*n + 1)
+        for k in range(m):
+            for l in range(n):
+                position[grille[k][l]] = (k, l)
+        swaps = [None] * (m*n*(m + n - 2))
+        count = 0
+        for x in range(1, m*n + 1):
+            i, j = divmod(x - 1, n)
+            k, l = position[x]
+            while (k, l) != (i, j):
+                if l != j:
+                    k2, l2 = k, (l - 1 if l > j else l + 1)
+                else:
+                    k2, l2 = k - 1, l
+                y = grille[k2][l2]
+                grille[k][l], grille[k2][l2] = y, x
+                position[y] = (k, l)
+                swaps[count] = ((k, l), (k2, l2))
+                count += 1
+                k, l = k2, l2
+            position[x] = (i, j)
+        del swaps[count:]
+        return swaps
 
     """
     The Function below is another proposal of answer to the question 3, 
     that is effective and was considered as naive by the binomial.
     While the grid is not sorted, it runs through the grid comparing
     every square to its right neighbor and then its bottom neighbor.
+    A pass without any swap does not imply that the grid is sorted (for example [[1, 3], [2, 4]]): 
+    the remaining values are then placed by get_solution.
     """
 
+    @cached(in_place=True)
     def get_solution2(self):  # Question 3
         """
         Solves the grid and returns the sequence of swaps at the format 
-        [((i1, j1), (i2, j2)), ((i1', j1'), (i2', j2')), ...]. 
+        [((i1, j1), (i2, j2)), ((i1', j1'), (i2', j2')), ...]. The grid is sorted in place.
         """
         n = self.n
         m = self.m
-        while not self.is_sorted() :
+        swaps = []
+        swapped = True
+        while swapped:
+            swapped = False
             for i in range (m):
                 for j in range (n):
                     if j < n-1 :
@@ -61,16 +85,134 @@ class Solver(Grid):
                         cell2 = (i, j+1)
                         if self.state[i][j] > self.state[i][j+1]:
                             self.swap(cell1,cell2)
+                            swaps.append((cell1, cell2))
+                            swapped = True
                     if i < m-1 :
                         cell1 = (i, j)
                         cell2 = (i+1, j)
                         if self.state[i][j] > self.state[i+1][j]:
                             self.swap(cell1, cell2)
+                            swaps.append((cell1, cell2))
+                            swapped = True
+        if not self.is_sorted():
+            swaps += self.get_solution()
+        return swaps
+
+    @cached()
+    def get_solution_bfs(self, max_depth=None, max_nodes=None, compact=False, stats=None):  # Question 8
+        """
+        Computes an optimal solution by BFS on the implicit graph of the grids (see Grid.bfs_path) and returns 
+        the sequence of swaps at the format [((i1, j1), (i2, j2)), ((i1', j1'), (i2', j2')), ...]. 
+        The grid itself is not modified. Returns None if no solution is found within the budget.
+        With compact=True the visited states are stored as Grid.key keys instead of flat tuples.
+        If stats (a stats.SearchStats) is given, it is filled with the statistics of the search.
+        """
+        path = self.bfs_path(Grid(self.m, self.n), max_depth, max_nodes, compact, stats)
+        if path is None:
+            return None
+        return swaps_from_path(path, self.n)
+
+    @cached()
+    def get_solution_bidirectional(self, max_nodes=None, stats=None):  # Question 8
+        """
+        Computes an optimal solution by a bidirectional BFS between the grid and the sorted grid 
+        (see Grid.bidirectional_path) and returns the sequence of swaps at the format [((i1, j1), (i2, j2)), ...]. 
+        It explores far fewer states than get_solution_bfs and is the default optimal solver for 3x3 grids and 
+        shallow 4x4 grids. The grid itself is not modified. Returns None if no solution is found within the budget.
+        """
+        path = self.bidirectional_path(Grid(self.m, self.n), max_nodes, stats)
+        if path is None:
+            return None
+        return swaps_from_path(path, self.n)
+
+    @cached(with_stats=True)
+    def get_solution_astar(self, heuristic="manhattan", closed=True, max_nodes=None, stats=None):  # Séances 3 et 4
+        """
+        Solves the grid with the A* algorithm (see Grid.astar_path) without modifying it.
+        If stats (a stats.SearchStats) is given, it is filled with the detailed statistics of the search.
+
+        Output: 
+        -------
+        swaps, stats: list[tuple[tuple[int]]] | None, dict
+            The sequence of swaps at the format [((i1, j1), (i2, j2)), ...] (None if no solution was found within 
+            the budget) and the statistics of the search: "expanded" and "generated" nodes and peak open set size "max_open".
+        """
+        path, summary = self.astar_path(Grid(self.m, self.n), heuristic, closed, max_nodes, stats=stats)
+        if path is None:
+            return None, summary
+        return swaps_from_path(path, self.n), summary
+
+    @cached(with_stats=True)
+    def get_solution_idastar(self, heuristic="manhattan", tt_size=1000000, max_nodes=None, stats=None):  # Séances 3 et 4
+        """
+        Solves the grid with the IDA* algorithm (see Grid.idastar_path) without modifying it. Unlike A*, its memory 
+        does not grow with the number of explored states, which makes it suited to 4x4 and larger grids.
+        If stats (a stats.SearchStats) is given, it is filled with the detailed statistics of the search.
 
+        Output: 
+        -------
+        swaps, stats: list[tuple[tuple[int]]] | None, dict
+            The sequence of swaps at the format [((i1, j1), (i2, j2)), ...] (None if no solution was found within 
+            the budget) and the statistics of the search (see search.idastar).
+        """
+        path, summary = self.idastar_path(Grid(self.m, self.n), heuristic, tt_size, max_nodes, stats)
+        if path is None:
+            return None, summary
+        return swaps_from_path(path, self.n), summary
 
+    @cached(ignore=("workers",))
+    def get_solution_parallel_bfs(self, workers=None):  # Question 8
+        """
+        Computes an optimal solution by a level-synchronous BFS over the ranks of the states, parallelised over 
+        worker processes (see parallel_bfs.parallel_bfs_path), and returns the sequence of swaps at the format 
+        [((i1, j1), (i2, j2)), ...]. Meant for shapes whose (mn)! states fit in memory (up to 3x3 or 2x5).
+        The grid itself is not modified.
+        """
+        return swaps_from_path(parallel_bfs_path(self, workers), self.n)
 
+    @cached(ignore=("directory",))
+    def get_solution_table(self, directory=None):  # Question 8
+        """
+        Returns an optimal sequence of swaps at the format [((i1, j1), (i2, j2)), ...] read from the distance table 
+        of the shape (see distance_table.DistanceTable), built at the first call, or loaded from directory (and saved 
+        there) if it is given. Every following grid of the same shape is solved in O(length of the solution).
+        The grid itself is not modified.
+        """
+        return DistanceTable.for_shape(self.m, self.n, directory).solve(self)
 
-        
+    @cached(with_stats=True, ignore=("directory",))
+    def get_solution_divide(self, block=(3, 3), directory=None, heuristic="pdb"):  # Séances 3 et 4
+        """
+        Solves the grid by divide and conquer (see divide.divide_solve) without modifying it: the outer rows and 
+        columns are placed one after the other, then the last block (3x3 by default) is solved optimally with the 
+        distance table of its shape. The solution is not optimal, but it is much shorter than the one of 
+        get_solution and is computed in a few milliseconds on 8x8 grids.
 
+        Output: 
+        -------
+        swaps, stats: list[tuple[tuple[int]]], dict
+            The sequence of swaps at the format [((i1, j1), (i2, j2)), ...] and the statistics: the total "time" 
+            (seconds) and the list of the "stages" with their names, numbers of swaps and times.
+        """
+        start = time.perf_counter()
+        swaps, stages = divide_solve(flatten(self.state), self.m, self.n, block, directory, heuristic)
+        return swaps, {"time": time.perf_counter() - start, "stages": stages}
 
+    def get_solution_anytime(self, heuristic="manhattan", weights=(3, 2, 1.5, 1.25, 1), time_budget=None,
+                             max_nodes=None, stats=None):  # Séances 3 et 4
+        """
+        Solves the grid within a time budget (in seconds) and/or a budget of expanded nodes with the anytime ARA* 
+        algorithm (see Grid.anytime_path) without modifying it: the best solution found when the budget runs out is 
+        returned with its suboptimality bound. Without budget, the solution is optimal. The results are not cached, 
+        since they depend on the budget.
 
+        Output: 
+        -------
+        swaps, stats: list[tuple[tuple[int]]] | None, dict
+            The sequence of swaps at the format [((i1, j1), (i2, j2)), ...] (None if no solution was found within 
+            the budget) and the statistics of the search, whose "bound" is such that len(swaps) <= bound * optimum.
+        """
+        path, summary = self.anytime_path(Grid(self.m, self.n), heuristic, weights, time_budget, max_nodes, stats)
+        if path is None:
+            return None, summary
+        return swaps_from_path(path, self.n), summary
@@ -0,0 +1,222 @@
+"""
+This is the states module. It contains the compact, hashable encodings of grid states used by the search algorithms.
+
+A state of an m x n grid is seen as a permutation of {1, ..., mn} read in row-major order (the "flat" state).
+Two encodings are provided:
+    - the rank of the permutation in lexicographic order (Lehmer code), a single integer,
+      used for grids of at most RANK_MAX_CELLS cells (4x4);
+    - a packed key (bytes, or a tuple when a value does not fit in a byte) for larger grids.
+It also contains the per-shape table of the swaps over flat indices and the neighbor generator used by every search.
+"""
+from functools import lru_cache
+from operator import itemgetter
+import numpy as np
+
+RANK_MAX_CELLS = 16
+
+FACTORIALS = [1]
+for _i in range(1, 257):
+    FACTORIALS.append(FACTORIALS[-1] * _i)
+
+
+def flatten(state):
+    """
+    Returns the flat state (tuple of the values in row-major order) of a list of lists state (or of a 2D numpy array).
+    """
+    if isinstance(state, np.ndarray):
+        return tuple(state.ravel().tolist())
+    return tuple(value for line in state for value in line)
+
+
+def unflatten(flat, m, n):
+    """
+    Returns the list of lists state of an m x n grid from its flat state.
+    """
+    return [list(flat[i*n:(i+1)*n]) for i in range(m)]
+
+
+def rank(flat):
+    """
+    Returns the rank of the permutation flat of {1, ..., N} in lexicographic order, in [0, N! - 1].
+
+    Parameters:
+    -----------
+    flat: tuple[int]
+        A permutation of {1, ..., N}.
+    """
+    size = len(flat)
+    r = 0
+    for i in range(size):
+        x = flat[i]
+        smaller = 0
+        for j in range(i+1, size):
+            if flat[j] < x:
+                smaller += 1
+        r += smaller * FACTORIALS[size-1-i]
+    return r
+
+
+def unrank(r, size):
+    """
+    Returns the permutation of {1, ..., size} of rank r in lexicographic order (inverse of rank).
+    """
+    available = list(range(1, size+1))
+    flat = []
+    for i in range(size-1, -1, -1):
+        digit, r = divmod(r, FACTORIALS[i])
+        flat.append(available.pop(digit))
+    return tuple(flat)
+
+
+def pack(flat):
+    """
+    Returns a packed hashable key of the flat state: bytes when every value fits in a byte, a tuple otherwise.
+    """
+    if len(flat) < 256:
+        return bytes(flat)
+    return tuple(flat)
+
+
+def unpack(key):
+    """
+    Returns the flat state encoded by a packed key (inverse of pack).
+    """
+    return tuple(key)
+
+
+def encode(flat):
+    """
+    Returns the key of a flat state: its rank if it has at most RANK_MAX_CELLS cells, its packed form otherwise.
+    """
+    if len(flat) <= RANK_MAX_CELLS:
+        return rank(flat)
+    return pack(flat)
+
+
+def decode(key, size):
+    """
+    Returns the flat state of size cells encoded by key (inverse of encode). Both ranks and packed keys are accepted.
+    """
+    if isinstance(key, int):
+        return unrank(key, size)
+    return unpack(key)
+
+
+def swaps_from_path(path, n):
+    """
+    Returns the sequence of swaps [((i1, j1), (i2, j2)), ...] that transforms each flat state of path into the next one.
+    Two consecutive flat states must differ by exactly one swap.
+
+    Parameters:
+    -----------
+    path: list[tuple[int] | bytes]
+        A list of flat states (or packed keys) of a grid with n columns.
+    n: int
+        Number of columns of the grid.
+    """
+    swaps = []
+    for k in range(len(path)-1):
+        before, after = path[k], path[k+1]
+        a, b = [p for p in range(len(before)) if before[p] != after[p]]
+        swaps.append(((a//n, a%n), (b//n, b%n)))
+    return swaps
+
+
+@lru_cache(maxsize=None)
+def swap_table(m, n):
+    """
+    Returns the m(n-1) + n(m-1) swaps allowed in an m x n grid, each one given once as a pair (a, b) of flat indices 
+    with a < b: first the horizontal swaps, then the vertical ones. The table is computed once per shape.
+    """
+    horizontal = [(i*n + j, i*n + j + 1) for i in range(m) for j in range(n-1)]
+    vertical = [(i*n + j, (i+1)*n + j) for i in range(m-1) for j in range(n)]
+    return tuple(horizontal + vertical)
+
+
+@lru_cache(maxsize=None)
+def _swap_getters(m, n):
+    """
+    Returns, for each swap of swap_table(m, n), the pair (swap, getter) where getter(flat) is the flat tuple 
+    obtained by applying the swap to flat.
+    """
+    getters = []
+    for a, b in swap_table(m, n):
+        positions = list(range(m*n))
+        positions[a], positions[b] = b, a
+        getters.append(((a, b), itemgetter(*positions)))
+    return tuple(getters)
+
+
+def neighbors(state, m, n):
+    """
+    Generates the states that are one swap away from state, without copying it more than once per neighbor.
+
+    Parameters:
+    -----------
+    state: tuple[int] | bytes
+        A flat state (tuple) or a packed key (bytes) of an m x n grid.
+    m, n: int
+        Number of lines and columns of the grid.
+
+    Output:
+    -------
+    Yields the pairs (swap, child) where swap = (a, b) is the pair of flat indices swapped and child is the 
+    resulting state, of the same type as state.
+    """
+    if isinstance(state, bytes):
+        for a, b in swap_table(m, n):
+            child = bytearray(state)
+            child[a], child[b] = child[b], child[a]
+            yield (a, b), bytes(child)
+    else:
+        for swap, getter in _swap_getters(m, n):
+            yield swap, getter(state)
+
+
+
+def rank_array(sequences, size):
+    """
+    Vectorised rank of partial permutations: each line of sequences is a sequence of k distinct integers of 
+    {0, ..., size-1} and its rank is its index, in lexicographic order, among the size!/(size-k)! such sequences. 
+    When k = size, this is the rank of the permutation (see rank, shifted by one value).
+
+    Parameters:
+    -----------
+    sequences: np.ndarray
+        An integer array of shape (count, k).
+    size: int
+        The number of possible values.
+
+    Output:
+    -------
+    ranks: np.ndarray
+        An int64 array of shape (count,).
+    """
+    sequences = np.asarray(sequences, dtype=np.int64)
+    count, k = sequences.shape
+    ranks = np.zeros(count, dtype=np.int64)
+    for i in range(k):
+        digit = sequences[:, i] - np.sum(sequences[:, :i] < sequences[:, i:i+1], axis=1)
+        ranks = ranks * (size - i) + digit
+    return ranks
+
+
+def unrank_array(ranks, size, k):
+    """
+    Vectorised inverse of rank_array: returns the array of shape (count, k) of the partial permutations of 
+    k values of {0, ..., size-1} whose ranks are given.
+    """
+    ranks = np.asarray(ranks, dtype=np.int64).copy()
+    count = len(ranks)
+    digits = np.empty((count, k), dtype=np.int64)
+    for i in range(k-1, -1, -1):
+        ranks, digits[:, i] = np.divmod(ranks, size - i)
+    available = np.ones((count, size), dtype=bool)
+    sequences = np.empty((count, k), dtype=np.int64)
+    lines = np.arange(count)
+    for i in range(k):
+        # the chosen value is the (digit+1)-th value still available
+        chosen = np.argmax(np.cumsum(available, axis=1) > digits[:, i:i+1], axis=1)
+        sequences[:, i] = chosen
+        available[lines, chosen] = False
+    return sequences
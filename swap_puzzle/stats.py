@@ -0,0 +1,211 @@
+"""
+This is the stats module. It contains the instrumentation of the search engines of the search module.
+
+A SearchStats object is passed to an engine with stats=stats (the default, None, disables the instrumentation:
+the engines then only pay one test per expanded node). The engine counts the expanded nodes, samples the sizes of
+its open and closed sets over time, and times the generation of the neighbors; the heuristic can be timed too
+(see SearchStats.wrap_heuristic). A callback can follow the search while it runs, e.g. to log it or to abort it
+by raising an exception.
+
+The sampling_profiler context manager samples the call stack of the current thread at a fixed interval, to find
+the hot spots of a solver without the overhead of a deterministic profiler.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class SearchStats:
+    """
+    The statistics of a search.
+
+    Attributes:
+    -----------
+    generated: int
+        Number of neighbors generated.
+    expanded: int
+        Number of nodes expanded.
+    duplicates: int
+        Number of generated neighbors that were dropped because they had already been reached (as well or better).
+    reopened: int
+        Number of closed nodes reopened (A* only).
+    max_open, max_closed: int
+        Peak sizes of the open set (frontier) and of the closed set (nodes reached, or expanded for A*).
+    samples: list[tuple]
+        Every sample_every expansions, the tuple (elapsed seconds, expanded, open size, closed size).
+    times: dict
+        Seconds spent in the whole search ("total"), in the generation of the neighbors ("expand", heuristic
+        included), in the heuristic ("heuristic", if it was wrapped) and in the rest of the search ("bookkeeping").
+    """
+
+    def __init__(self, sample_every=1000, callback=None):
+        """
+        Parameters:
+        -----------
+        sample_every: int
+            Number of expansions between two samples of the sizes of the open and closed sets.
+        callback: function, optional
+            callback(stats) is called at each sample.
+        """
+        self.sample_every = sample_every
+        self.callback = callback
+        self.generated = 0
+        self.expanded = 0
+        self.duplicates = 0
+        self.reopened = 0
+        self.max_open = 0
+        self.max_closed = 0
+        self.samples = []
+        self.times = {"total": 0.0, "expand": 0.0, "heuristic": 0.0, "bookkeeping": 0.0}
+        self._start = None
+
+    def __repr__(self):
+        return f"<stats.SearchStats: expanded={self.expanded}, generated={self.generated}>"
+
+    def start(self):
+        """
+        Called by the engine when the search starts.
+        """
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """
+        Called by the engine when the search ends.
+        """
+        self.times["total"] += time.perf_counter() - self._start
+        self.times["bookkeeping"] = self.times["total"] - self.times["expand"]
+
+    def expand(self, open_size, closed_size):
+        """
+        Called by the engine before each expansion, with the current sizes of its open and closed sets.
+        """
+        self.expanded += 1
+        if open_size > self.max_open:
+            self.max_open = open_size
+        if closed_size > self.max_closed:
+            self.max_closed = closed_size
+        if self.expanded % self.sample_every == 0:
+            self.samples.append((time.perf_counter() - self._start, self.expanded, open_size, closed_size))
+            if self.callback is not None:
+                self.callback(self)
+
+    def wrap_neighbors(self, neighbors):
+        """
+        Returns the function neighbors (or successors) of an engine, timed and counting the generated neighbors.
+        """
+        def timed(*args):
+            start = time.perf_counter()
+            children = list(neighbors(*args))
+            self.times["expand"] += time.perf_counter() - start
+            self.generated += len(children)
+            return children
+        return timed
+
+    def wrap_heuristic(self, heuristic):
+        """
+        Returns the heuristic object (see the heuristics module) with its evaluations timed.
+        """
+        return _TimedHeuristic(heuristic, self.times)
+
+    def as_dict(self):
+        """
+        Returns the statistics as a dictionnary (without the samples).
+        """
+        return {"generated": self.generated, "expanded": self.expanded, "duplicates": self.duplicates,
+                "reopened": self.reopened, "max_open": self.max_open, "max_closed": self.max_closed,
+                "times": dict(self.times)}
+
+
+class _TimedHeuristic:
+    """
+    A heuristic whose evaluations add their time to times["heuristic"].
+    """
+
+    def __init__(self, heuristic, times):
+        self.heuristic = heuristic
+        self.times = times
+
+    def __call__(self, flat):
+        start = time.perf_counter()
+        value = self.heuristic(flat)
+        self.times["heuristic"] += time.perf_counter() - start
+        return value
+
+    def delta(self, flat, h, a, b):
+        start = time.perf_counter()
+        value = self.heuristic.delta(flat, h, a, b)
+        self.times["heuristic"] += time.perf_counter() - start
+        return value
+
+
+class Profile:
+    """
+    The result of sampling_profiler.
+
+    Attributes:
+    -----------
+    samples: int
+        Number of samples taken.
+    leaves: Counter
+        Number of samples in which each function (file, line of its definition, name) was running.
+    stacks: Counter
+        Number of samples in which each function was on the call stack.
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.leaves = Counter()
+        self.stacks = Counter()
+
+    def report(self, top=10):
+        """
+        Returns the top functions by own samples and by cumulated samples, as text.
+        """
+        lines = [f"{self.samples} samples", "own:"]
+        for (file, line, name), count in self.leaves.most_common(top):
+            lines.append(f"{count / max(self.samples, 1):7.1%}  {name} ({file}:{line})")
+        lines.append("cumulated:")
+        for (file, line, name), count in self.stacks.most_common(top):
+            lines.append(f"{count / max(self.samples, 1):7.1%}  {name} ({file}:{line})")
+        return "\n".join(lines)
+
+
+@contextmanager
+def sampling_profiler(interval=0.001):
+    """
+    Samples the call stack of the current thread every interval seconds while the block runs, from a background
+    thread, and yields a Profile filled when the block exits:
+        with sampling_profiler() as profile:
+            solver.get_solution_astar()
+        print(profile.report())
+    """
+    profile = Profile()
+    target = threading.get_ident()
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            profile.samples += 1
+            code = frame.f_code
+            profile.leaves[(code.co_filename, code.co_firstlineno, code.co_name)] += 1
+            seen = set()
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if key not in seen:
+                    seen.add(key)
+                    profile.stacks[key] += 1
+                frame = frame.f_back
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield profile
+    finally:
+        done.set()
+        sampler.join()
@@ -0,0 +1,60 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import random
+from grid import Grid
+from solver import Solver
+
+class Test_Anytime(unittest.TestCase):
+    def test_bound_shrinks(self):
+        # with larger node budgets, the solution and its bound can only improve, down to an optimal solution
+        rng = random.Random(0)
+        values = list(range(1, 17))
+        rng.shuffle(values)
+        state = [values[i*4:(i+1)*4] for i in range(4)]
+        optimum = len(Solver(4, 4, [line[:] for line in state]).get_solution_idastar(heuristic="pdb")[0])
+        previous = None
+        for max_nodes in [100, 1000, 20000, None]:
+            swaps, stats = Solver(4, 4, [line[:] for line in state]).get_solution_anytime(max_nodes=max_nodes)
+            self.assertEqual(stats["interrupted"], max_nodes is not None and stats["bound"] > 1)
+            self.assertLessEqual(len(swaps), stats["bound"] * optimum + 1e-9)
+            if previous is not None:
+                self.assertLessEqual(len(swaps), len(previous[0]))
+                self.assertLessEqual(stats["bound"], previous[1]["bound"])
+            previous = swaps, stats
+        self.assertEqual(len(swaps), optimum)
+        self.assertEqual(stats["bound"], 1)
+
+    def test_grid4(self):
+        g = Grid.grid_from_file("input/grid4.in")
+        swaps, stats = Solver(g.m, g.n, g.state).get_solution_anytime(heuristic="pdb")
+        self.assertEqual(len(swaps), 14)
+        g.swap_seq(swaps)
+        self.assertEqual(g.is_sorted(), True)
+
+    def test_budget(self):
+        g = Grid.grid_from_file("input/grid4.in")
+        swaps, stats = Solver(g.m, g.n, g.state).get_solution_anytime(max_nodes=200)
+        self.assertEqual(stats["interrupted"], True)
+        self.assertLessEqual(stats["expanded"], 200)
+        if swaps is not None:
+            self.assertGreaterEqual(stats["bound"], 1)
+            self.assertLessEqual(len(swaps), stats["bound"] * 14 + 1e-9)
+            g.swap_seq(swaps)
+            self.assertEqual(g.is_sorted(), True)
+
+    def test_time_budget(self):
+        rng = random.Random(0)
+        values = list(range(1, 26))
+        rng.shuffle(values)
+        g = Grid(5, 5, [values[i*5:(i+1)*5] for i in range(5)])
+        swaps, stats = Solver(5, 5, g.state).get_solution_anytime(time_budget=1.0)
+        self.assertIsNotNone(swaps)
+        self.assertGreaterEqual(stats["bound"], 1)
+        g.swap_seq(swaps)
+        self.assertEqual(g.is_sorted(), True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import random
+import numpy as np
+from grid import Grid
+from solver import Solver
+from array_grid import ArrayGrid
+
+class Test_ArrayGrid(unittest.TestCase):
+    def test_grid1(self):
+        grid = ArrayGrid.grid_from_file("input/grid1.in")
+        self.assertIsInstance(grid.state, np.ndarray)
+        self.assertEqual(grid.is_sorted(), False)
+        grid.swap((3,0), (3,1))
+        self.assertEqual(grid.is_sorted(), True)
+        self.assertEqual(grid.to_grid().state, [[1, 2], [3, 4], [5, 6], [7, 8]])
+        self.assertEqual(grid.key(), Grid(4, 2).key())
+
+    def test_swap_seq(self):
+        rng = random.Random(8)
+        m, n = 12, 9
+        values = list(range(1, m*n + 1))
+        rng.shuffle(values)
+        state = [values[i*n:(i+1)*n] for i in range(m)]
+        swaps = Solver(m, n, [line[:] for line in state]).get_solution()
+        for sequence in [swaps, np.array(swaps)]:
+            grid = ArrayGrid(m, n, state)
+            grid.swap_seq(sequence)
+            self.assertEqual(grid.is_sorted(), True)
+        grid, reference = ArrayGrid(m, n, state), Grid(m, n, [line[:] for line in state])
+        grid.swap_seq(swaps[:50])
+        reference.swap_seq(swaps[:50])
+        self.assertEqual(grid.state.tolist(), reference.state)
+
+    def test_invalid_swaps(self):
+        grid = ArrayGrid(2, 2)
+        for swaps in [[((0, 0), (1, 1))], [((0, 0), (0, 1)), ((0, 1), (0, 2))], [((0, 0), (0, 0))]]:
+            with self.assertRaises(Exception):
+                grid.swap_seq(swaps)
+        self.assertEqual(grid.is_sorted(), True)
+        with self.assertRaises(Exception):
+            Grid(2, 2).swap((0, 0), (2, 0))
+
+if __name__ == '__main__':
+    unittest.main()
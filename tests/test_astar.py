@@ -1,12 +1,62 @@
+# This will work if ran from the root folder ensae-prog24
 import sys 
 sys.path.append("swap_puzzle/")
 
+import unittest 
 from grid import Grid
-grid = Grid.grid_from_file("input/grid2.in")
+from solver import Solver
+import search
 
-n=grid.n
-m=grid.m
+class Test_Astar(unittest.TestCase):
+    def test_grid2(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        n = grid.n
+        m = grid.m
+        result = grid.astar(Grid(m, n))
+        self.assertEqual(result[0].state, grid.state)
+        self.assertEqual(result[-1].is_sorted(), True)
+        bfs_length, _ = grid.final_bfs(Grid(m, n))
+        self.assertEqual(len(result) - 1, bfs_length)
 
-result=grid.astar(Grid(m,n))
-for i in range(len(result)):
-    print(result[i])
+    def test_get_solution_astar(self):
+        for name in ["grid2", "grid3", "grid4"]:
+            for heuristic in ["manhattan", "kendall"] if name != "grid4" else ["manhattan"]:
+                g = Grid.grid_from_file("input/" + name + ".in")
+                s = Solver(g.m, g.n, g.state)
+                swaps, stats = s.get_solution_astar(heuristic)
+                g.swap_seq(swaps)
+                self.assertEqual(g.is_sorted(), True)
+                self.assertGreaterEqual(stats["generated"], stats["expanded"])
+
+    def test_reopening(self):
+        # h(A) = 2 is admissible but inconsistent: C is first closed through D, E, then reopened through A
+        edges = {"S": ["A", "D"], "A": ["C"], "D": ["E"], "E": ["C"], "C": ["G"], "G": []}
+        h = {"S": 0, "A": 2, "D": 0, "E": 0, "C": 0, "G": 0}
+        successors = lambda node, h_node: [(child, h[child]) for child in edges[node]]
+        path, stats = search.astar("S", "G", successors, 0, closed=True)
+        self.assertEqual(path, ["S", "A", "C", "G"])
+        self.assertEqual(stats["reopened"], 1)
+        path, stats = search.astar("S", "G", successors, 0, closed=False)
+        self.assertEqual(path, ["S", "A", "C", "G"])
+        self.assertEqual(stats["reopened"], 0)
+
+    def test_example_2x3(self):
+        s = Solver(2, 3, [[1, 6, 3], [5, 4, 2]])
+        for heuristic in ["manhattan", "kendall"]:
+            swaps, _ = s.get_solution_astar(heuristic)
+            self.assertEqual(len(swaps), 4)
+
+    def test_callable_heuristic(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        swaps, _ = s.get_solution_astar(lambda flat, m, n: 0)
+        self.assertEqual(len(swaps), 4)
+
+    def test_unsorted_destination(self):
+        grid = Grid.grid_from_file("input/grid2.in")
+        dst = Grid(3, 3, [[1, 2, 3], [4, 5, 6], [7, 9, 8]])
+        result = grid.astar(dst)
+        self.assertEqual(result[-1].state, dst.state)
+
+if __name__ == '__main__':
+    unittest.main()
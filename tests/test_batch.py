@@ -0,0 +1,30 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from grid import Grid
+from batch import solve_many, solve_file
+
+class Test_Batch(unittest.TestCase):
+    def test_solve_many(self):
+        paths = ["input/grid%d.in" % k for k in range(5)]
+        results = list(solve_many(paths, solver="astar", workers=2))
+        self.assertEqual(sorted(result["file"] for result in results), paths)
+        for result in results:
+            self.assertEqual(result["error"], None)
+            g = Grid.grid_from_file(result["file"])
+            g.swap_seq(result["swaps"])
+            self.assertEqual(g.is_sorted(), True)
+
+    def test_timeout(self):
+        result = solve_file("input/grid4.in", solver="bfs", timeout=0.2)
+        self.assertEqual(result["error"], "timeout")
+        self.assertEqual(result["swaps"], None)
+
+    def test_unknown_solver(self):
+        with self.assertRaises(Exception):
+            list(solve_many(["input/grid1.in"], solver="magic"))
+
+if __name__ == '__main__':
+    unittest.main()
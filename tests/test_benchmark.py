@@ -0,0 +1,37 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import copy
+from distance_table import DistanceTable
+from benchmark import make_corpus, benchmark, compare
+
+class Test_Benchmark(unittest.TestCase):
+    def test_corpus(self):
+        corpus = make_corpus(2, 3, 5, 10, seed=1)
+        self.assertEqual(len(set(corpus)), 10)
+        table = DistanceTable.for_shape(2, 3)
+        for flat in corpus:
+            self.assertEqual(table.distance(flat), 5)
+        self.assertEqual(make_corpus(2, 3, 5, 10, seed=1), corpus)
+        self.assertNotEqual(make_corpus(2, 3, 5, 10, seed=2), corpus)
+        self.assertEqual(len(make_corpus(4, 4, 6, 3)), 3)
+        self.assertRaises(Exception, make_corpus, 2, 2, 10, 1)
+
+    def test_benchmark_and_compare(self):
+        results = benchmark({(2, 3): [3, 6]}, ["greedy", "bfs", "astar"], count=3, memory=False)
+        self.assertEqual(len(results), 6)
+        for entry in results:
+            self.assertEqual(entry["solved"], 3)
+            if entry["solver"] != "greedy":
+                self.assertEqual(entry["length"], entry["distance"])
+        self.assertEqual(compare(results, results), [])
+        worse = copy.deepcopy(results)
+        worse[-1]["length"] += 1
+        worse[-1]["solved"] -= 1
+        worse[-1]["time"] *= 2
+        self.assertEqual(len(compare(worse, results)), 3)
+
+if __name__ == '__main__':
+    unittest.main()
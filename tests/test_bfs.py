@@ -14,6 +14,31 @@ class Test_BFSLoading(unittest.TestCase):
         """
         self.assertEqual(g.bfs(2,17), (2, [2, 14, 17]))
 
+    def test_bfs_path_out(self):
+        for name in ["graph1", "graph2"]:
+            g = Graph.graph_from_file("input/" + name + ".in")
+            with open("input/" + name + ".path.out", "r") as file:
+                for line in file:
+                    fields = line.split()
+                    src, dst = int(fields[0]), int(fields[1])
+                    result = g.bfs(src, dst)
+                    if fields[2] == "None":
+                        self.assertEqual(result, None)
+                        continue
+                    length = int(fields[2])
+                    self.assertEqual(result[0], length)
+                    path = result[1]
+                    self.assertEqual((path[0], path[-1]), (src, dst))
+                    for k in range(len(path)-1):
+                        self.assertIn(path[k+1], g.graph[path[k]])
+
+    def test_bfs_budget(self):
+        g = Graph.graph_from_file("input/graph1.in")
+        self.assertEqual(g.bfs(2, 2), (0, [2]))
+        self.assertEqual(g.bfs(2, 17, max_depth=1), None)
+        self.assertEqual(g.bfs(2, 17, max_depth=2), (2, [2, 14, 17]))
+        self.assertEqual(g.bfs(2, 17, max_nodes=1), None)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,41 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from grid import Grid
+from solver import Solver
+
+class Test_BFSSolver(unittest.TestCase):
+    def test_grid1(self):
+        g = Grid.grid_from_file("input/grid1.in")
+        s = Solver(g.m, g.n, g.state)
+        self.assertEqual(s.get_solution_bfs(), [((3, 0), (3, 1))])
+
+    def test_grid2(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        swaps = s.get_solution_bfs()
+        self.assertEqual(len(swaps), 4)
+        g.swap_seq(swaps)
+        self.assertEqual(g.is_sorted(), True)
+
+    def test_compact(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        self.assertEqual(s.get_solution_bfs(compact=True), s.get_solution_bfs())
+
+    def test_final_bfs(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        length, path = g.final_bfs(Grid(3, 3))
+        self.assertEqual(length, 4)
+        self.assertEqual(path[0].state, g.state)
+        self.assertEqual(path[-1].is_sorted(), True)
+
+    def test_budget(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        self.assertEqual(s.get_solution_bfs(max_depth=3), None)
+
+if __name__ == '__main__':
+    unittest.main()
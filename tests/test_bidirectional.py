@@ -0,0 +1,24 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from grid import Grid
+from solver import Solver
+
+class Test_Bidirectional(unittest.TestCase):
+    def test_grid3(self):
+        g = Grid.grid_from_file("input/grid3.in")
+        s = Solver(g.m, g.n, g.state)
+        swaps = s.get_solution_bidirectional()
+        self.assertEqual(len(swaps), 4)
+        g.swap_seq(swaps)
+        self.assertEqual(g.is_sorted(), True)
+
+    def test_sorted_and_budget(self):
+        self.assertEqual(Solver(2, 2).get_solution_bidirectional(), [])
+        g = Grid.grid_from_file("input/grid4.in")
+        self.assertEqual(Solver(g.m, g.n, g.state).get_solution_bidirectional(max_nodes=100), None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import os
+import random
+import tempfile
+from grid import Grid
+from solver import Solver
+from states import flatten, neighbors
+from stats import SearchStats
+from cache import SolutionCache, symmetries, transform
+
+class Test_Cache(unittest.TestCase):
+    def test_symmetries(self):
+        self.assertEqual(len(symmetries(3, 3)), 8)
+        self.assertEqual(len(symmetries(2, 3)), 4)
+        for m, n in [(3, 3), (2, 3), (1, 4)]:
+            identity = tuple(range(1, m*n + 1))
+            edges = {(a, b) for (a, b), _ in neighbors(identity, m, n)}
+            for sigma in symmetries(m, n):
+                self.assertEqual(transform(identity, sigma), identity)
+                self.assertEqual({tuple(sorted((sigma[a], sigma[b]))) for a, b in edges}, edges)
+
+    def test_symmetric_hit(self):
+        cache = SolutionCache()
+        rng = random.Random(5)
+        values = list(range(1, 10))
+        rng.shuffle(values)
+        flat = tuple(values)
+        s = Solver(3, 3, [list(flat[i*3:(i+1)*3]) for i in range(3)])
+        s.cache = cache
+        swaps = s.get_solution_bidirectional()
+        self.assertEqual(cache.misses, 1)
+        for sigma in symmetries(3, 3):
+            image = transform(flat, sigma)
+            other = Solver(3, 3, [list(image[i*3:(i+1)*3]) for i in range(3)])
+            other.cache = cache
+            cached = other.get_solution_bidirectional()
+            self.assertEqual(len(cached), len(swaps))
+            other.swap_seq(cached)
+            self.assertTrue(other.is_sorted())
+        self.assertEqual(cache.hits, 8)
+        self.assertEqual(len(cache), 1)
+
+    def test_methods(self):
+        cache = SolutionCache(capacity=2)
+        g = Grid.grid_from_file("input/grid2.in")
+        for _ in range(2):
+            s = Solver(g.m, g.n, [line[:] for line in g.state])
+            s.cache = cache
+            swaps, stats = s.get_solution_astar()
+            s.swap_seq(swaps)
+            self.assertTrue(s.is_sorted())
+        self.assertEqual(stats, {"cached": True})
+        # the in-place solvers also sort the grid on a hit
+        for _ in range(2):
+            s = Solver(g.m, g.n, [line[:] for line in g.state])
+            s.cache = cache
+            s.get_solution()
+            self.assertTrue(s.is_sorted())
+        self.assertEqual(cache.hits, 2)
+        # budget failures are not cached
+        s = Solver(g.m, g.n, [line[:] for line in g.state])
+        s.cache = cache
+        self.assertEqual(s.get_solution_bfs(max_nodes=1), None)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(Solver.cache, None)
+
+    def test_arguments(self):
+        cache = SolutionCache()
+        rng = random.Random(1)
+        values = list(range(1, 37))
+        rng.shuffle(values)
+        state = [values[i*6:(i+1)*6] for i in range(6)]
+        s = Solver(6, 6, state)
+        s.cache = cache
+        swaps2, _ = s.get_solution_divide(block=(2, 2))
+        swaps3, stats = s.get_solution_divide(block=(3, 3))
+        self.assertNotEqual(stats, {"cached": True})
+        self.assertEqual(s.get_solution_divide(block=[3, 3]), (swaps3, {"cached": True}))
+        self.assertEqual(s.get_solution_divide(block=(2, 2)), (swaps2, {"cached": True}))
+        # a callable heuristic or a stats object bypass the cache
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        s.cache = cache
+        length = len(cache)
+        _, stats = s.get_solution_astar(heuristic=lambda flat, m, n: 0)
+        self.assertNotEqual(stats, {"cached": True})
+        self.assertEqual(len(cache), length)
+        s.get_solution_astar()
+        summary = SearchStats()
+        _, stats = s.get_solution_astar(stats=summary)
+        self.assertNotEqual(stats, {"cached": True})
+        self.assertGreater(summary.expanded, 0)
+
+    def test_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solutions.db")
+            g = Grid.grid_from_file("input/grid3.in")
+            s = Solver(g.m, g.n, [line[:] for line in g.state])
+            s.cache = SolutionCache(path=path)
+            swaps = s.get_solution_bidirectional()
+            s.cache.close()
+            cache = SolutionCache(path=path)
+            self.assertEqual(cache.get("get_solution_bidirectional", g.m, g.n, flatten(g.state)), swaps)
+            self.assertEqual(cache.hits, 1)
+            cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
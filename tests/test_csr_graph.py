@@ -0,0 +1,57 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import tempfile
+import os
+from graph import Graph, CSRGraph
+
+class Test_CSRGraph(unittest.TestCase):
+    def test_bfs_path_out(self):
+        for name in ["graph1", "graph2"]:
+            g = CSRGraph.graph_from_file("input/" + name + ".in")
+            with open("input/" + name + ".path.out", "r") as file:
+                for line in file:
+                    fields = line.split()
+                    src, dst = int(fields[0]), int(fields[1])
+                    result = g.bfs(src, dst)
+                    if fields[2] == "None":
+                        self.assertEqual(result, None)
+                        continue
+                    self.assertEqual(result[0], int(fields[2]))
+                    path = result[1]
+                    self.assertEqual((path[0], path[-1]), (src, dst))
+                    for k in range(len(path)-1):
+                        self.assertIn(path[k+1], g.neighbors(path[k]))
+
+    def test_same_as_graph(self):
+        graph = Graph.graph_from_file("input/graph2.in")
+        csr = CSRGraph.from_graph(graph)
+        self.assertEqual((csr.nb_nodes, csr.nb_edges), (graph.nb_nodes, graph.nb_edges))
+        for node in range(1, graph.nb_nodes + 1):
+            self.assertEqual(csr.neighbors(node).tolist(), graph.graph[node])
+
+    def test_bfs_budget(self):
+        g = CSRGraph.graph_from_file("input/graph1.in")
+        self.assertEqual(g.bfs(2, 2), (0, [2]))
+        self.assertEqual(g.bfs(2, 17, max_depth=1), None)
+        self.assertEqual(g.bfs(2, 17, max_depth=2)[0], 2)
+        self.assertEqual(g.bfs(2, 17, max_nodes=1), None)
+        self.assertRaises(Exception, g.bfs, 2, 21)
+
+    def test_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, "graph.in")
+            with open(name, "w") as file:
+                file.write("3 2\n1 2\n2 3 1\n")
+            self.assertRaises(Exception, CSRGraph.graph_from_file, name)
+
+    def test_nodes_not_aliased(self):
+        nodes = [1, 2]
+        g = Graph(nodes)
+        g.add_edge(2, 3)
+        self.assertEqual(nodes, [1, 2])
+        self.assertEqual(Graph().nodes, [])
+
+if __name__ == '__main__':
+    unittest.main()
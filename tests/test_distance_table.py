@@ -0,0 +1,63 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import random
+import tempfile
+import numpy as np
+from grid import Grid
+from solver import Solver
+from states import flatten
+from distance_table import DistanceTable
+
+class Test_DistanceTable(unittest.TestCase):
+    def test_distances(self):
+        table = DistanceTable.for_shape(2, 3)
+        self.assertEqual(table.distance((1, 2, 3, 4, 5, 6)), 0)
+        self.assertEqual(table.distance((2, 1, 3, 4, 5, 6)), 1)
+        rng = random.Random(4)
+        for _ in range(20):
+            values = list(range(1, 7))
+            rng.shuffle(values)
+            g = Grid(2, 3, [values[:3], values[3:]])
+            s = Solver(2, 3, [row[:] for row in g.state])
+            swaps = s.get_solution_table()
+            self.assertEqual(len(swaps), table.distance(flatten(g.state)))
+            self.assertEqual(len(swaps), len(s.get_solution_bfs()))
+            g.swap_seq(swaps)
+            self.assertEqual(g.is_sorted(), True)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            built = DistanceTable.load_or_build(directory, 2, 2)
+            loaded = DistanceTable.load(directory, 2, 2)
+            self.assertIsInstance(loaded.distances, np.memmap)
+            self.assertTrue(np.array_equal(built.distances, loaded.distances))
+            self.assertRaises(Exception, DistanceTable.load, directory, 2, 3)
+
+    def test_bfs_swap(self):
+        g = Grid(2, 2, [[4, 3], [2, 1]])
+        swaps = g.bfs_swap()
+        self.assertEqual(len(swaps), 4)
+        self.assertEqual(g.is_sorted(), True)
+
+    def test_too_large(self):
+        g = Grid.grid_from_file("input/grid4.in")
+        s = Solver(g.m, g.n, g.state)
+        for solve in [DistanceTable.for_shape, lambda m, n: s.get_solution_table(), lambda m, n: s.get_solution_parallel_bfs(),
+                      lambda m, n: s.bfs_swap(), lambda m, n: s.construct_graph()]:
+            with self.assertRaises(ValueError):
+                solve(g.m, g.n)
+        self.assertEqual(s.state, g.state)
+
+    def test_construct_graph(self):
+        graph = Grid(2, 2).construct_graph()
+        self.assertEqual(graph.nb_nodes, 24)
+        self.assertEqual(graph.nb_edges, 24*4//2)
+        table = DistanceTable.for_shape(2, 2)
+        for node in range(24):
+            self.assertEqual(graph.bfs(node, 0)[0], table.distances[node])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import random
+from grid import Grid
+from solver import Solver
+from divide import best_path, divide_solve
+from distance_table import DistanceTable
+
+class Test_Divide(unittest.TestCase):
+    def test_sorts(self):
+        rng = random.Random(2)
+        for m, n in [(1, 1), (1, 5), (4, 1), (2, 2), (2, 6), (3, 3), (4, 4), (3, 5), (8, 8)]:
+            values = list(range(1, m*n + 1))
+            rng.shuffle(values)
+            g = Grid(m, n, [values[i*n:(i+1)*n] for i in range(m)])
+            swaps, stats = Solver(m, n, g.state).get_solution_divide()
+            self.assertEqual(sum(stage["swaps"] for stage in stats["stages"]), len(swaps))
+            self.assertTrue(stats["stages"][-1]["stage"].startswith("block"))
+            g.swap_seq(swaps)
+            self.assertEqual(g.is_sorted(), True)
+
+    def test_quality(self):
+        rng = random.Random(0)
+        total_divide, total_greedy = 0, 0
+        for _ in range(5):
+            values = list(range(1, 65))
+            rng.shuffle(values)
+            state = [values[i*8:(i+1)*8] for i in range(8)]
+            total_divide += len(Solver(8, 8, [row[:] for row in state]).get_solution_divide()[0])
+            total_greedy += len(Solver(8, 8, state).get_solution())
+        self.assertLess(total_divide, total_greedy)
+
+    def test_block_optimal(self):
+        # on a 3x3 grid, the whole grid is the block
+        table = DistanceTable.for_shape(3, 3)
+        flat = (9, 8, 7, 6, 5, 4, 3, 2, 1)
+        swaps, stages = divide_solve(flat, 3, 3)
+        self.assertEqual(len(swaps), table.distance(flat))
+        self.assertEqual([stage["stage"] for stage in stages], ["block 3x3"])
+
+    def test_best_path(self):
+        flat = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        fixed = [False] * 9
+        # from (2, 2) to (0, 0), every shortest path has 4 steps
+        path = best_path(flat, 3, 8, 0, fixed)
+        self.assertEqual(len(path), 5)
+        self.assertEqual((path[0], path[-1]), (8, 0))
+        fixed[1] = fixed[2] = True
+        self.assertEqual(best_path(flat, 3, 8, 0, fixed), [8, 7, 6, 3, 0])
+        fixed[3] = True
+        self.assertEqual(best_path(flat, 3, 8, 0, fixed), None)
+
+if __name__ == '__main__':
+    unittest.main()
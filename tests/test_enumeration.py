@@ -0,0 +1,52 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import itertools
+import numpy as np
+from grid import Grid
+from states import rank, FACTORIALS
+from enumeration import next_permutation, iter_states, iter_chunks, split_ranges
+
+class Test_Enumeration(unittest.TestCase):
+    def test_iter_states(self):
+        states = list(iter_states(5))
+        self.assertEqual(states, list(itertools.permutations(range(1, 6))))
+        self.assertEqual([rank(s) for s in states], list(range(FACTORIALS[5])))
+        self.assertEqual(list(iter_states(5, 17, 40)), states[17:40])
+        self.assertEqual(list(iter_states(3, 6)), [])
+        values = [3, 2, 1]
+        self.assertFalse(next_permutation(values))
+        self.assertEqual(values, [3, 2, 1])
+
+    def test_chunks(self):
+        states = list(iter_states(6))
+        chunks = list(iter_chunks(6, chunk_size=100, start_rank=50, stop_rank=425))
+        self.assertEqual([len(chunk) for chunk in chunks], [100, 100, 100, 75])
+        self.assertEqual(chunks[0].dtype, np.uint8)
+        self.assertEqual([tuple(line) for line in np.concatenate(chunks).tolist()], states[50:425])
+        self.assertRaises(Exception, lambda: next(iter_chunks(21)))
+
+    def test_split_ranges(self):
+        ranges = split_ranges(6, 4)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], FACTORIALS[6])
+        resumed = [s for start, stop in ranges for s in iter_states(6, start, stop)]
+        self.assertEqual(resumed, list(iter_states(6)))
+
+    def test_grid(self):
+        g = Grid(2, 2)
+        self.assertEqual(list(g.permutation(["a", "b", "c"])),
+                         [list(p) for p in itertools.permutations(["a", "b", "c"])])
+        self.assertEqual(list(g.permutation([])), [])
+        grids = list(g.gridlist_from_permlist())
+        self.assertEqual(len(grids), 24)
+        self.assertEqual(grids[0], [[1, 2], [3, 4]])
+        self.assertEqual(grids[-1], [[4, 3], [2, 1]])
+        # lazy: the first grids of a huge space come at once
+        self.assertEqual(next(Grid(5, 5).gridlist_from_permlist(start_rank=1)), [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10],
+                         [11, 12, 13, 14, 15], [16, 17, 18, 19, 20], [21, 22, 23, 25, 24]])
+
+if __name__ == '__main__':
+    unittest.main()
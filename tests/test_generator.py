@@ -0,0 +1,69 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import random
+import itertools
+import os
+import tempfile
+from grid import Grid
+from distance_table import DistanceTable
+from heuristics import kendall_tau
+from generator import (Fenwick, count_inversions, permutation_with_inversions, permutation_from_inversions,
+                       difficulty_band, max_inversions, generate_puzzles, write_grids)
+
+class Test_Generator(unittest.TestCase):
+    def test_count_inversions(self):
+        for flat in itertools.permutations(range(1, 6)):
+            naive = sum(1 for a in range(5) for b in range(a+1, 5) if flat[a] > flat[b])
+            self.assertEqual(count_inversions(flat), naive)
+        g = Grid(3, 3, [[9, 8, 7], [6, 5, 4], [3, 2, 1]])
+        self.assertEqual(g.kendall_tau(), g.kendall_tau_naif())
+        self.assertEqual(g.kendall_tau(), max_inversions(3, 3))
+
+    def test_fenwick(self):
+        tree = Fenwick(10)
+        for position in [1, 4, 5, 9]:
+            tree.add(position, 1)
+        self.assertEqual(tree.prefix_sum(5), 2)
+        self.assertEqual([tree.find(k) for k in range(4)], [1, 4, 5, 9])
+
+    def test_exact_inversions(self):
+        rng = random.Random(0)
+        for size in [1, 2, 5, 16, 100]:
+            for k in [0, size * (size - 1) // 4, size * (size - 1) // 2]:
+                flat = permutation_with_inversions(size, k, rng)
+                self.assertEqual(sorted(flat), list(range(1, size + 1)))
+                self.assertEqual(count_inversions(flat), k)
+        self.assertEqual(permutation_from_inversions([2, 0, 0]), (3, 1, 2))
+        self.assertRaises(Exception, permutation_with_inversions, 4, 7)
+
+    def test_level_starter(self):
+        g = Grid.grid_from_file("input/grid1.in")
+        rng = random.Random(1)
+        for difficulty in range(1, 5):
+            low, high = difficulty_band(g.m, g.n, difficulty)
+            for _ in range(10):
+                starter = g.level_starter(difficulty, rng)
+                self.assertEqual((starter.m, starter.n), (4, 2))
+                self.assertTrue(low <= starter.kendall_tau() <= high)
+        self.assertEqual(difficulty_band(4, 2, 4), (22, 28))
+        self.assertRaises(Exception, g.level_starter, 5)
+
+    def test_generate_puzzles(self):
+        puzzles = list(generate_puzzles(2, 3, 2, 20, seed=3))
+        self.assertEqual(puzzles, list(generate_puzzles(2, 3, 2, 20, seed=3)))
+        low, high = difficulty_band(2, 3, 2)
+        for flat in puzzles:
+            self.assertTrue(low <= kendall_tau(flat, 2, 3) <= high)
+        table = DistanceTable.for_shape(2, 3)
+        for flat in generate_puzzles(2, 3, 2, 10, seed=3, distance=4):
+            self.assertEqual(table.distance(flat), 4)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "puzzles.in")
+            write_grids(file_name, puzzles, 2, 3)
+            self.assertEqual([tuple(v for line in g.state for v in line) for g in Grid.grids_from_file(file_name)], puzzles)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,50 @@
 # This will work if ran from the root folder ensae-prog24
 import sys 
-sys.path.append("../swap_puzzle/")
+sys.path.append("swap_puzzle/")
 
 import unittest 
-from swap_puzzle import Grid
-from swap_puzzle import Solver
+import random
+from grid import Grid
+from solver import Solver
 
 class Test_get_solution(unittest.TestCase):
     def test_grid1(self):
-        g = Grid.grid_from_file("../input/grid1.in")
-        s = Solver()
-        s.get_solution(g)
+        g = Grid.grid_from_file("input/grid1.in")
+        s = Solver.grid_from_file("input/grid1.in")
+        swaps = s.get_solution()
+        self.assertEqual(s.is_sorted(), True)
+        g.swap_seq(swaps)
         self.assertEqual(g.is_sorted(), True)
 
+    def test_all_grids(self):
+        for name in ["grid0", "grid1", "grid2", "grid3", "grid4"]:
+            for method in ["get_solution", "get_solution2"]:
+                g = Grid.grid_from_file("input/" + name + ".in")
+                s = Solver.grid_from_file("input/" + name + ".in")
+                swaps = getattr(s, method)()
+                self.assertEqual(s.is_sorted(), True)
+                g.swap_seq(swaps)
+                self.assertEqual(g.is_sorted(), True)
+
+    def test_large_grid(self):
+        rng = random.Random(7)
+        m, n = 30, 40
+        values = list(range(1, m*n + 1))
+        rng.shuffle(values)
+        state = [values[i*n:(i+1)*n] for i in range(m)]
+        g = Grid(m, n, [line[:] for line in state])
+        s = Solver(m, n, state)
+        swaps = s.get_solution()
+        self.assertEqual(s.is_sorted(), True)
+        self.assertLessEqual(len(swaps), m*n*(m + n - 2))
+        g.swap_seq(swaps)
+        self.assertEqual(g.is_sorted(), True)
+
+    def test_get_solution2_stuck(self):
+        s = Solver(2, 2, [[1, 3], [2, 4]])
+        swaps = s.get_solution2()
+        self.assertEqual(s.is_sorted(), True)
+        self.assertEqual(len(swaps), 3)
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,41 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import random
+from grid import Grid
+from states import flatten, neighbors
+from heuristics import ManhattanHeuristic, InversionHeuristic, half_manhattan, kendall_tau
+
+class Test_Heuristics(unittest.TestCase):
+    def test_values(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        flat = flatten(g.state)
+        self.assertEqual(ManhattanHeuristic(3, 3)(flat), half_manhattan(flat, 3, 3))
+        self.assertEqual(InversionHeuristic(3, 3)(flat), kendall_tau(flat, 3, 3) / 5)
+        self.assertEqual(kendall_tau(flat, 3, 3), g.kendall_tau_naif())
+
+    def test_kendall_tau_naif(self):
+        g = Grid.grid_from_file("input/grid1.in")
+        self.assertEqual(g.kendall_tau_naif(), 1)
+        self.assertEqual(Grid(2, 3, [[6, 5, 4], [3, 2, 1]]).kendall_tau_naif(), 15)
+
+    def test_delta(self):
+        rng = random.Random(1)
+        for m, n in [(3, 3), (2, 4), (4, 4), (1, 5)]:
+            heuristics = [ManhattanHeuristic(m, n), InversionHeuristic(m, n)]
+            flat = list(range(1, m*n + 1))
+            rng.shuffle(flat)
+            flat = tuple(flat)
+            for h in heuristics:
+                value = h(flat)
+                node = flat
+                for _ in range(50):
+                    (a, b), child = rng.choice(list(neighbors(node, m, n)))
+                    value = h.delta(node, value, a, b)
+                    self.assertEqual(value, h(child))
+                    node = child
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import random
+from grid import Grid
+from solver import Solver
+
+class Test_IDAstar(unittest.TestCase):
+    def test_transposition_table(self):
+        # the transposition table prunes the states already reached by a shorter path: same solution length,
+        # never more expansions
+        rng = random.Random(3)
+        for _ in range(5):
+            values = list(range(1, 10))
+            rng.shuffle(values)
+            s = Solver(3, 3, [values[i*3:(i+1)*3] for i in range(3)])
+            swaps0, stats0 = s.get_solution_idastar(tt_size=0)
+            swaps, stats = s.get_solution_idastar(tt_size=100000)
+            self.assertEqual(len(swaps), len(swaps0))
+            self.assertLessEqual(stats["expanded"], stats0["expanded"])
+
+    def test_grid4(self):
+        g = Grid.grid_from_file("input/grid4.in")
+        s = Solver(g.m, g.n, g.state)
+        swaps, stats = s.get_solution_idastar()
+        self.assertEqual(len(swaps), 14)
+        self.assertEqual(stats["threshold"], 14)
+        g.swap_seq(swaps)
+        self.assertEqual(g.is_sorted(), True)
+
+    def test_budget(self):
+        g = Grid.grid_from_file("input/grid4.in")
+        swaps, stats = Solver(g.m, g.n, g.state).get_solution_idastar(max_nodes=10)
+        self.assertEqual(swaps, None)
+        self.assertEqual(stats["expanded"], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from grid import Grid
+from states import rank, unrank, pack, unpack
+
+class Test_Key(unittest.TestCase):
+    def test_rank_unrank(self):
+        self.assertEqual(rank((1, 2, 3, 4)), 0)
+        self.assertEqual(rank((4, 3, 2, 1)), 23)
+        for r in range(120):
+            self.assertEqual(rank(unrank(r, 5)), r)
+
+    def test_pack_unpack(self):
+        flat = tuple(range(300, 0, -1))
+        self.assertEqual(unpack(pack(flat)), flat)
+        self.assertEqual(unpack(pack((2, 1, 3))), (2, 1, 3))
+
+    def test_grid1(self):
+        g = Grid.grid_from_file("input/grid1.in")
+        self.assertEqual(g.key(), 1)
+        self.assertEqual(Grid.from_key(4, 2, g.key()).state, g.state)
+        self.assertEqual(Grid(4, 2).key(), 0)
+
+    def test_large_grid(self):
+        g = Grid(5, 5)
+        g.swap((0, 0), (0, 1))
+        self.assertEqual(g.key(), bytes([2, 1] + list(range(3, 26))))
+        self.assertEqual(Grid.from_key(5, 5, g.key()).state, g.state)
+
+    def test_compact_search(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        path = g.bfs_path(Grid(3, 3), compact=True)
+        self.assertEqual(path, g.bfs_path(Grid(3, 3)))
+        path, _ = g.astar_path(Grid(3, 3), compact=True)
+        self.assertEqual(len(path), 5)
+        self.assertEqual(path[-1], tuple(range(1, 10)))
+
+if __name__ == '__main__':
+    unittest.main()
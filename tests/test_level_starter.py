@@ -1,7 +1,21 @@
 import sys 
 sys.path.append("swap_puzzle/")
 
+import unittest 
 from grid import Grid
-grid = Grid.grid_from_file("input/grid1.in")
+from generator import difficulty_band
 
-print(grid.level_starter(4))
\ No newline at end of file
+class Test_LevelStarter(unittest.TestCase):
+    def test_level_starter(self):
+        grid = Grid.grid_from_file("input/grid1.in")
+        for difficulty in range(1, 5):
+            starter = grid.level_starter(difficulty)
+            self.assertIsInstance(starter, Grid)
+            self.assertEqual((starter.m, starter.n), (grid.m, grid.n))
+            values = sorted(value for line in starter.state for value in line)
+            self.assertEqual(values, list(range(1, grid.m * grid.n + 1)))
+            low, high = difficulty_band(grid.m, grid.n, difficulty)
+            self.assertTrue(low <= starter.kendall_tau_naif() <= high)
+
+if __name__ == '__main__':
+    unittest.main()
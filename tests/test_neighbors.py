@@ -0,0 +1,29 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from grid import Grid
+from states import swap_table, neighbors
+
+class Test_Neighbors(unittest.TestCase):
+    def test_swap_table(self):
+        self.assertEqual(swap_table(2, 2), ((0, 1), (2, 3), (0, 2), (1, 3)))
+        self.assertEqual(len(swap_table(4, 3)), 4*2 + 3*3)
+
+    def test_neighbors(self):
+        flat = (1, 2, 3, 4)
+        children = list(neighbors(flat, 2, 2))
+        self.assertEqual(children[0], ((0, 1), (2, 1, 3, 4)))
+        self.assertEqual(children[3], ((1, 3), (1, 4, 3, 2)))
+        self.assertEqual([child for _, child in neighbors(bytes(flat), 2, 2)], [bytes(child) for _, child in children])
+
+    def test_grilles_voisines(self):
+        g = Grid.grid_from_file("input/grid1.in")
+        voisines = g.grilles_voisines()
+        self.assertEqual(len(voisines), 4*1 + 2*3)
+        self.assertIn([[1, 2], [3, 4], [5, 6], [7, 8]], voisines)
+        self.assertEqual(g.state, [[1, 2], [3, 4], [5, 6], [8, 7]])
+
+if __name__ == '__main__':
+    unittest.main()
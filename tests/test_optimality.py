@@ -0,0 +1,46 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import random
+from grid import Grid
+from solver import Solver
+
+# the optimal solvers, as functions returning the swaps of a Solver (the grid must not be modified)
+OPTIMAL_SOLVERS = {
+    "astar manhattan": lambda s: s.get_solution_astar("manhattan")[0],
+    "astar kendall": lambda s: s.get_solution_astar("kendall")[0],
+    "astar manhattan, no closed set": lambda s: s.get_solution_astar("manhattan", closed=False)[0],
+    "astar kendall, no closed set": lambda s: s.get_solution_astar("kendall", closed=False)[0],
+    "bidirectional": lambda s: s.get_solution_bidirectional(),
+    "idastar": lambda s: s.get_solution_idastar()[0],
+    "idastar, no transposition table": lambda s: s.get_solution_idastar(tt_size=0)[0],
+    "parallel bfs": lambda s: s.get_solution_parallel_bfs(workers=1),
+    "anytime": lambda s: s.get_solution_anytime()[0],
+}
+
+# (m, n, number of random grids)
+SHAPES = [(2, 2, 5), (2, 3, 10), (3, 2, 10), (3, 3, 2)]
+
+class Test_Optimality(unittest.TestCase):
+    def test_optimality(self):
+        # every optimal solver finds legal swaps that sort the grid, as many as the BFS
+        rng = random.Random(0)
+        for m, n, count in SHAPES:
+            for _ in range(count):
+                values = list(range(1, m*n + 1))
+                rng.shuffle(values)
+                state = [values[i*n:(i+1)*n] for i in range(m)]
+                optimum = len(Solver(m, n, [line[:] for line in state]).get_solution_bfs())
+                for name, solve in OPTIMAL_SOLVERS.items():
+                    with self.subTest(solver=name, state=state):
+                        s = Solver(m, n, [line[:] for line in state])
+                        swaps = solve(s)
+                        self.assertEqual(s.state, state)
+                        self.assertEqual(len(swaps), optimum)
+                        s.swap_seq(swaps)
+                        self.assertEqual(s.is_sorted(), True)
+
+if __name__ == '__main__':
+    unittest.main()
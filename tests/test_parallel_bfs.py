@@ -0,0 +1,40 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import numpy as np
+from grid import Grid
+from states import flatten, rank, neighbors, FACTORIALS
+from parallel_bfs import bfs_distances, UNSEEN
+
+class Test_ParallelBFS(unittest.TestCase):
+    def test_distances(self):
+        # the distances of the 2x3 grids, compared with a plain BFS on the flat states
+        distances = bfs_distances(2, 3, workers=1)
+        expected = {flatten(Grid(2, 3).state): 0}
+        frontier = list(expected)
+        while frontier:
+            layer = []
+            for state in frontier:
+                for _, child in neighbors(state, 2, 3):
+                    if child not in expected:
+                        expected[child] = expected[state] + 1
+                        layer.append(child)
+            frontier = layer
+        self.assertEqual(len(expected), FACTORIALS[6])
+        for state, distance in expected.items():
+            self.assertEqual(distances[rank(state)], distance)
+
+    def test_workers(self):
+        # a small chunk size sends the large layers to the worker processes
+        self.assertTrue(np.array_equal(bfs_distances(2, 3, workers=2, chunk_size=50), bfs_distances(2, 3, workers=1)))
+
+    def test_target(self):
+        g = Grid.grid_from_file("input/grid1.in")
+        distances = bfs_distances(g.m, g.n, target=rank(flatten(g.state)), workers=1)
+        self.assertEqual(distances[rank(flatten(g.state))], 1)
+        self.assertTrue((distances == UNSEEN).any())
+
+if __name__ == '__main__':
+    unittest.main()
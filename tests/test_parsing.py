@@ -0,0 +1,68 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import os
+import shutil
+import tempfile
+import numpy as np
+from grid import Grid
+from array_grid import ArrayGrid
+from graph import Graph
+from parsing import read_grid, read_graph, iter_grids, sidecar_name
+
+class Test_Parsing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        file_name = os.path.join(self.directory, name)
+        with open(file_name, "w") as file:
+            file.write(text)
+        return file_name
+
+    def test_read_grid(self):
+        state = read_grid("input/grid1.in")
+        self.assertEqual(state.tolist(), [[1, 2], [3, 4], [5, 6], [8, 7]])
+        self.assertEqual(ArrayGrid.grid_from_file("input/grid1.in").state.tolist(), state.tolist())
+        self.assertEqual(read_grid(self.write("one.in", "1 1\n1\n")).tolist(), [[1]])
+
+    def test_format(self):
+        for text in ["2 2\n1 2\n3\n", "2 2\n1 2\n", "2 2\n1 a\n3 4\n", "2\n1 2\n"]:
+            self.assertRaises(Exception, Grid.grid_from_file, self.write("bad.in", text))
+        self.assertRaises(Exception, Graph.graph_from_file, self.write("bad.in", "3 2\n1 2\n2 3 1\n"))
+
+    def test_sidecar(self):
+        file_name = self.write("grid.in", "2 2\n4 3\n2 1\n")
+        g = Grid.grid_from_file(file_name, cache=True)
+        self.assertTrue(os.path.exists(sidecar_name(file_name)))
+        self.assertIsInstance(read_grid(file_name, cache=True), np.memmap)
+        self.assertEqual(Grid.grid_from_file(file_name, cache=True).state, g.state)
+        # the memory-mapped state is copied, so the array grid can be swapped
+        a = ArrayGrid.grid_from_file(file_name, cache=True)
+        a.swap((0, 0), (0, 1))
+        self.assertEqual(a.state.tolist(), [[3, 4], [2, 1]])
+
+    def test_graph_sidecar(self):
+        file_name = os.path.join(self.directory, "graph1.in")
+        shutil.copy("input/graph1.in", file_name)
+        n, edges = read_graph(file_name, cache=True)
+        cached = Graph.graph_from_file(file_name, cache=True)
+        original = Graph.graph_from_file("input/graph1.in")
+        self.assertEqual((n, len(edges)), (20, 100))
+        self.assertEqual(cached.graph, original.graph)
+        self.assertEqual(cached.bfs(2, 17), (2, [2, 14, 17]))
+
+    def test_iter_grids(self):
+        file_name = self.write("grids.in", "2 2\n1 2\n3 4\n\n1 3\n3 1 2\n2 1\n2\n1\n")
+        grids = list(Grid.grids_from_file(file_name))
+        self.assertEqual([(g.m, g.n) for g in grids], [(2, 2), (1, 3), (2, 1)])
+        self.assertEqual(grids[1].state, [[3, 1, 2]])
+        self.assertEqual(len(list(iter_grids("input/grid2.in"))), 1)
+
+if __name__ == '__main__':
+    unittest.main()
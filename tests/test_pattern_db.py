@@ -0,0 +1,63 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+import random
+import tempfile
+import numpy as np
+from solver import Solver
+from states import flatten, neighbors
+from pattern_db import PatternDatabase, default_groups
+
+class Test_PatternDatabase(unittest.TestCase):
+    def random_solver(self, rng, m, n):
+        values = list(range(1, m*n + 1))
+        rng.shuffle(values)
+        return Solver(m, n, [values[i*n:(i+1)*n] for i in range(m)])
+
+    def test_default_groups(self):
+        self.assertEqual(default_groups(3, 3), [tuple(range(1, 10))])
+        self.assertEqual(default_groups(4, 4), [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15, 16)])
+
+    def test_single_group_is_exact(self):
+        pdb = PatternDatabase.build(2, 3)
+        rng = random.Random(4)
+        for _ in range(10):
+            s = self.random_solver(rng, 2, 3)
+            self.assertEqual(pdb(flatten(s.state)), len(s.get_solution_bfs()))
+
+    def test_admissible_and_optimal(self):
+        pdb = PatternDatabase.build(3, 3, [(1, 2, 3), (4, 5, 6), (7, 8, 9)])
+        rng = random.Random(5)
+        for _ in range(2):
+            s = self.random_solver(rng, 3, 3)
+            optimum = len(s.get_solution_bfs())
+            self.assertLessEqual(pdb(flatten(s.state)), optimum)
+            swaps, _ = s.get_solution_astar(pdb)
+            self.assertEqual(len(swaps), optimum)
+            swaps, _ = s.get_solution_idastar(pdb)
+            self.assertEqual(len(swaps), optimum)
+
+    def test_delta(self):
+        pdb = PatternDatabase.build(2, 4, [(1, 2, 3), (4, 5, 6), (7, 8)])
+        rng = random.Random(6)
+        flat = flatten(self.random_solver(rng, 2, 4).state)
+        value = pdb(flat)
+        for _ in range(30):
+            (a, b), child = rng.choice(list(neighbors(flat, 2, 4)))
+            value = pdb.delta(flat, value, a, b)
+            self.assertEqual(value, pdb(child))
+            flat = child
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pdb = PatternDatabase.load_or_build(directory, 2, 3, [(1, 2, 3), (4, 5, 6)])
+            self.assertIsInstance(pdb.tables[0], np.memmap)
+            self.assertEqual(pdb.tables[0].dtype, np.uint8)
+            built = PatternDatabase.build(2, 3, [(1, 2, 3), (4, 5, 6)])
+            for loaded, table in zip(pdb.tables, built.tables):
+                self.assertEqual(np.array_equal(loaded, table), True)
+
+if __name__ == '__main__':
+    unittest.main()
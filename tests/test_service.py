@@ -0,0 +1,101 @@
+# This will work if ran from the root folder ensae-prog24
+import sys
+sys.path.append("swap_puzzle/")
+
+import unittest
+import asyncio
+import os
+import tempfile
+from grid import Grid
+from service import SolveService, Client, percentiles
+
+GRID4 = [[5, 14, 7, 16], [1, 10, 15, 4], [13, 2, 3, 12], [9, 6, 11, 8]]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class Test_Service(unittest.TestCase):
+    def test_percentiles(self):
+        self.assertEqual(percentiles(range(1, 101)), {"p50": 50, "p90": 90, "p99": 99, "max": 100})
+        self.assertEqual(percentiles([]), {"p50": None, "p90": None, "p99": None, "max": None})
+
+    def test_tcp(self):
+        async def scenario():
+            service = SolveService(workers=2)
+            host, port = await service.listen(port=0)
+            client = await Client.connect(host, port)
+            try:
+                grids = [Grid.grid_from_file("input/grid%d.in" % k).state for k in range(4)]
+                responses = await asyncio.gather(*[client.solve(grid) for grid in grids])
+                invalid = await client.solve([[1, 1], [2, 3]])
+                malformed = await asyncio.gather(client.solve(grids[0], timeout="5"), client.solve(grids[0], timeout=-1),
+                                                 client.solve(grids[0], heuristic=["x"]),
+                                                 client.solve(grids[0], options=[1]))
+                stats = await client.stats()
+            finally:
+                await client.close()
+                await service.close()
+            return grids, responses, invalid, malformed, stats
+
+        grids, responses, invalid, malformed, stats = run(scenario())
+        for grid, response in zip(grids, responses):
+            self.assertEqual(response["error"], None)
+            g = Grid(len(grid), len(grid[0]), grid)
+            g.swap_seq([tuple(map(tuple, swap)) for swap in response["swaps"]])
+            self.assertEqual(g.is_sorted(), True)
+        self.assertNotEqual(invalid["error"], None)
+        for response in malformed:
+            self.assertNotEqual(response["error"], None)
+            self.assertEqual(response["swaps"], None)
+        self.assertEqual(stats["completed"], 4)
+        self.assertEqual(stats["errors"], 5)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertNotEqual(stats["latency"]["p99"], None)
+
+    def test_coalescing(self):
+        async def scenario():
+            service = SolveService(workers=1)
+            path = os.path.join(tempfile.mkdtemp(), "service.sock")
+            await service.listen(path=path)
+            client = await Client.connect(path=path)
+            try:
+                responses = await asyncio.gather(*[client.solve(GRID4, solver="idastar") for _ in range(5)])
+            finally:
+                await client.close()
+                await service.close()
+            return responses, service.stats()
+
+        responses, stats = run(scenario())
+        self.assertEqual([response["length"] for response in responses], [14] * 5)
+        self.assertEqual(sum(response["coalesced"] for response in responses), 4)
+        self.assertEqual(stats["coalesced"], 4)
+
+    def test_timeout_and_backpressure(self):
+        async def scenario():
+            service = SolveService(workers=1, queue_size=1)
+            await service.start()
+            try:
+                # the first search occupies the worker, the second fills the queue, the third is rejected
+                first = asyncio.ensure_future(service.solve(GRID4, solver="bfs", timeout=0.3))
+                await asyncio.sleep(0.05)
+                grids = [[line[::-1] for line in GRID4], GRID4[::-1]]
+                others = [service.solve(grid, solver="bfs", timeout=0.3) for grid in grids]
+                responses = await asyncio.gather(first, *others)
+                await asyncio.sleep(0.5)
+                stats = service.stats()
+            finally:
+                await service.close()
+            return responses, stats
+
+        responses, stats = run(scenario())
+        self.assertEqual([response["error"] for response in responses], ["timeout", "timeout", "busy"])
+        self.assertEqual(stats["timeouts"], 2)
+        self.assertEqual(stats["rejected"], 1)
+        # the abandoned computations are dropped from the queue or stopped in the worker
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["queue_depth"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
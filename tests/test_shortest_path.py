@@ -0,0 +1,49 @@
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from graph import Graph
+
+class Test_ShortestPath(unittest.TestCase):
+    def read_path_out(self, name):
+        with open("input/" + name + ".path.out", "r") as file:
+            for line in file:
+                fields = line.split()
+                yield int(fields[0]), int(fields[1]), None if fields[2] == "None" else int(fields[2])
+
+    def test_path_out(self):
+        for name in ["graph1", "graph2"]:
+            g = Graph.graph_from_file("input/" + name + ".in")
+            for src, dst, length in self.read_path_out(name):
+                result = g.shortest_path(src, dst)
+                if length is None:
+                    self.assertEqual(result, None)
+                    continue
+                self.assertEqual(result[0], length)
+                path = result[1]
+                self.assertEqual((path[0], path[-1]), (src, dst))
+                for k in range(len(path)-1):
+                    self.assertIn(path[k+1], g.graph[path[k]])
+
+    def test_all_pairs(self):
+        for name in ["graph1", "graph2"]:
+            g = Graph.graph_from_file("input/" + name + ".in")
+            distances = g.all_pairs_bfs()
+            self.assertEqual(distances.shape, (g.nb_nodes, g.nb_nodes))
+            for src, dst, length in self.read_path_out(name):
+                self.assertEqual(distances[src-1, dst-1], -1 if length is None else length)
+
+    def test_cache(self):
+        g = Graph.graph_from_file("input/graph1.in")
+        tree = g.bfs_tree(2)
+        self.assertIs(g.bfs_tree(2), tree)
+        g.tree_cache_bytes = 0
+        g.bfs_tree(3)
+        # the cache keeps at least the last tree
+        self.assertEqual(list(g._trees), [3])
+        g.add_edge(2, 3)
+        self.assertEqual(g.shortest_path(2, 3), (1, [2, 3]))
+        self.assertRaises(Exception, g.shortest_path, 21, 2)
+
+if __name__ == '__main__':
+    unittest.main()
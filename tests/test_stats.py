@@ -0,0 +1,64 @@
+# This will work if ran from the root folder ensae-prog24
+import sys 
+sys.path.append("swap_puzzle/")
+
+import unittest 
+from grid import Grid
+from graph import Graph
+from solver import Solver
+from stats import SearchStats, sampling_profiler
+
+class Test_Stats(unittest.TestCase):
+    def test_bfs(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        stats = SearchStats(sample_every=10)
+        swaps = s.get_solution_bfs(stats=stats)
+        self.assertEqual(swaps, s.get_solution_bfs())
+        self.assertGreater(stats.expanded, 0)
+        self.assertGreaterEqual(stats.generated, stats.expanded)
+        self.assertGreater(stats.duplicates, 0)
+        self.assertEqual(len(stats.samples), stats.expanded // 10)
+        self.assertGreaterEqual(stats.times["total"], stats.times["expand"])
+        self.assertAlmostEqual(stats.times["bookkeeping"], stats.times["total"] - stats.times["expand"])
+
+    def test_searches(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        stats = SearchStats()
+        swaps, summary = s.get_solution_astar(stats=stats)
+        self.assertEqual(stats.expanded, summary["expanded"])
+        self.assertGreater(stats.times["heuristic"], 0)
+        stats = SearchStats()
+        swaps, summary = s.get_solution_idastar(stats=stats)
+        self.assertEqual(stats.expanded, summary["expanded"])
+        stats = SearchStats()
+        self.assertEqual(len(s.get_solution_bidirectional(stats=stats)), len(swaps))
+        self.assertGreater(stats.max_closed, 0)
+        stats = SearchStats()
+        Graph.graph_from_file("input/graph1.in").bfs(2, 17, stats=stats)
+        self.assertGreater(stats.generated, 0)
+
+    def test_callback(self):
+        calls = []
+
+        def stop(stats):
+            calls.append(stats.expanded)
+            raise KeyboardInterrupt
+
+        g = Grid.grid_from_file("input/grid2.in")
+        stats = SearchStats(sample_every=5, callback=stop)
+        self.assertRaises(KeyboardInterrupt, Solver(g.m, g.n, g.state).get_solution_bfs, stats=stats)
+        self.assertEqual(calls, [5])
+
+    def test_profiler(self):
+        g = Grid.grid_from_file("input/grid2.in")
+        s = Solver(g.m, g.n, g.state)
+        with sampling_profiler(interval=0.0005) as profile:
+            for _ in range(20):
+                s.get_solution_bfs()
+        self.assertGreater(profile.samples, 0)
+        self.assertIn("samples", profile.report())
+
+if __name__ == '__main__':
+    unittest.main()